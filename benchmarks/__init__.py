@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Benchmarks for senf, not part of the installed package.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks.batch
+    python -m benchmarks.fastpath
+    python -m benchmarks.wtf
+    python -m benchmarks.array
+    python -m benchmarks.stream
+    python -m benchmarks.uri
+    python -m benchmarks.importtime
+    python -m benchmarks.unchecked
+    python -m benchmarks.converter
+    python -m benchmarks.walk
+    python -m benchmarks.intern
+    python -m benchmarks.trie
+    python -m benchmarks.sortkey
+    python -m benchmarks.fsnkey
+    python -m benchmarks.join
+    python -m benchmarks.replay recording.bin
+"""
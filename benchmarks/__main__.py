@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Runs the benchmark suite and writes the results as JSON.
+
+    python -m benchmarks [--output results.json] [--count 1000]
+"""
+
+import sys
+import json
+import argparse
+
+from .suite import run, BENCHMARKS
+from .corpora import CORPORA
+
+
+def _print_result(result):
+    if "error" in result:
+        status = result["error"]
+    else:
+        status = "%12.1f ns %12.0f/s" % (
+            result["seconds_per_item"] * 1e9, result["items_per_second"])
+    print("%-12s %-16s %s" % (result["function"], result["corpus"], status))
+    sys.stdout.flush()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "--output", "-o", help="write JSON results to this file")
+    parser.add_argument(
+        "--count", type=int, default=1000, help="items per corpus")
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed for the corpora")
+    parser.add_argument(
+        "--function", action="append", dest="names",
+        choices=[n for n, f in BENCHMARKS], help="only run these benchmarks")
+    parser.add_argument(
+        "--corpus", action="append", dest="corpora",
+        choices=[n for n, f in CORPORA], help="only use these corpora")
+    args = parser.parse_args(argv[1:])
+
+    data = run(args.count, args.seed, args.names, args.corpora,
+               progress=_print_result)
+
+    if args.output is not None:
+        with open(args.output, "w") as h:
+            json.dump(data, h, indent=2, sort_keys=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
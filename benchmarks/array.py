@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Compares FsnArray with a list of fsnative paths.
+
+    python -m benchmarks.array
+"""
+
+import sys
+
+from senf import FsnArray, fsn2text, fsn2uri, fsnative
+
+from ._util import measure
+from .corpora import get_corpus
+
+
+def _list_size(paths):
+    return sys.getsizeof(paths) + sum(sys.getsizeof(p) for p in paths)
+
+
+def main():
+    for corpus in ["ascii", "surrogateescape"]:
+        paths = get_corpus(corpus, count=100000)
+        array = FsnArray(paths)
+        prefix = paths[0][:len(paths[0]) // 2]
+        suffix = fsnative(u".flac")
+
+        print("%s: %d paths, list %d bytes, array %d bytes" % (
+            corpus, len(paths), _list_size(paths), array.nbytes))
+
+        cases = [
+            ("prefix",
+             lambda: [p for p in paths if p.startswith(prefix)],
+             lambda: array.filter_prefix(prefix)),
+            ("suffix",
+             lambda: [p for p in paths if p.endswith(suffix)],
+             lambda: array.filter_suffix(suffix)),
+            ("fsn2text",
+             lambda: [fsn2text(p) for p in paths],
+             lambda: array.to_text()),
+            ("fsn2uri",
+             lambda: [fsn2uri(p) for p in paths],
+             lambda: array.to_uri()),
+        ]
+
+        print("%-12s %14s %14s %8s" % (
+            "operation", "list (ns)", "array (ns)", "speedup"))
+        for name, loop, batch in cases:
+            loop_time = measure(loop, number=2) / len(paths) * 1e9
+            batch_time = measure(batch, number=2) / len(paths) * 1e9
+            print("%-12s %14.1f %14.1f %7.2fx" % (
+                name, loop_time, batch_time, loop_time / batch_time))
+        print()
+
+
+if __name__ == "__main__":
+    main()
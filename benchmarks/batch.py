@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Compares the batch conversion functions against a per-item loop.
+
+    python -m benchmarks.batch
+"""
+
+from senf import path2fsn, fsn2bytes, bytes2fsn, fsn2text, paths2fsn, \
+    fsns2bytes, bytes2fsns, fsns2text, fsnative
+
+from ._util import measure
+
+
+def _get_paths(count=10000):
+    return [fsnative(u"/mnt/music/Artist %d/Album/%02d Track.flac" % (i, i))
+            for i in range(count)]
+
+
+def main():
+    paths = _get_paths()
+    datas = fsns2bytes(paths)
+
+    cases = [
+        ("path2fsn",
+         lambda: [path2fsn(p) for p in paths],
+         lambda: paths2fsn(paths)),
+        ("fsn2bytes",
+         lambda: [fsn2bytes(p) for p in paths],
+         lambda: fsns2bytes(paths)),
+        ("bytes2fsn",
+         lambda: [bytes2fsn(d) for d in datas],
+         lambda: bytes2fsns(datas)),
+        ("fsn2text",
+         lambda: [fsn2text(p) for p in paths],
+         lambda: fsns2text(paths)),
+    ]
+
+    print("%-12s %14s %14s %8s" % ("function", "loop (ns)", "batch (ns)",
+                                   "speedup"))
+    for name, loop, batch in cases:
+        loop_time = measure(loop) / len(paths) * 1e9
+        batch_time = measure(batch) / len(paths) * 1e9
+        print("%-12s %14.1f %14.1f %7.2fx" % (
+            name, loop_time, batch_time, loop_time / batch_time))
+
+
+if __name__ == "__main__":
+    main()
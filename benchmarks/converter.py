@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Compares the Converter methods with the functions, for a non-default
+encoding.
+
+    python -m benchmarks.converter
+"""
+
+from senf import Converter, fsn2bytes, bytes2fsn, fsn2text, fsn2uri
+
+from ._util import measure
+from .corpora import get_corpus
+
+
+def main():
+    encoding = "utf-16-le"
+    conv = Converter(encoding)
+
+    for corpus in ["ascii", "non-bmp", "surrogateescape"]:
+        paths = get_corpus(corpus, count=10000)
+        datas = [fsn2bytes(p, encoding) for p in paths]
+
+        print("%s" % corpus)
+        print("%-12s %14s %14s %8s" % (
+            "function", "function (ns)", "method (ns)", "speedup"))
+        cases = [
+            ("to_bytes", lambda p: fsn2bytes(p, encoding), conv.to_bytes,
+             paths),
+            ("from_bytes", lambda d: bytes2fsn(d, encoding), conv.from_bytes,
+             datas),
+            ("to_text", fsn2text, conv.to_text, paths),
+            ("to_uri", fsn2uri, conv.to_uri, paths),
+        ]
+        for name, func, method, args in cases:
+            assert [func(a) for a in args] == [method(a) for a in args]
+            func_time = measure(
+                lambda: [func(a) for a in args]) / len(args) * 1e9
+            method_time = measure(
+                lambda: [method(a) for a in args]) / len(args) * 1e9
+            print("%-12s %14.1f %14.1f %7.2fx" % (
+                name, func_time, method_time, func_time / method_time))
+        print()
+
+
+if __name__ == "__main__":
+    main()
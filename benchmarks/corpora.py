@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Reproducible synthetic path corpora for the benchmarks"""
+
+import os
+import random
+import string
+
+from senf import fsnative, bytes2fsn, sep
+from senf._compat import PY3
+
+if PY3:
+    unichr_ = chr
+else:
+    unichr_ = unichr  # noqa
+
+
+def _word(r, alphabet, min_size=3, max_size=12):
+    return fsnative(u"".join(
+        r.choice(alphabet) for i in range(r.randint(min_size, max_size))))
+
+
+def _ascii_alphabet():
+    return string.ascii_letters + string.digits + u" -_."
+
+
+def _non_bmp_alphabet():
+    chars = [unichr_(i) for i in range(0x1F300, 0x1F350)]
+    chars += [unichr_(i) for i in range(0x20000, 0x20050)]
+    return u"abc " + u"".join(chars)
+
+
+def _join(parts):
+    root = fsnative(u"C:\\") if os.name == "nt" else sep
+    return root + sep.join(parts)
+
+
+def _ascii(r, count):
+    alphabet = _ascii_alphabet()
+    return [_join([fsnative(u"Music"), _word(r, alphabet),
+                   _word(r, alphabet) + fsnative(u".ogg")])
+            for i in range(count)]
+
+
+def _deep(r, count):
+    alphabet = _ascii_alphabet()
+    return [_join([_word(r, alphabet) for j in range(40)])
+            for i in range(count)]
+
+
+def _non_bmp(r, count):
+    alphabet = _non_bmp_alphabet()
+    return [_join([_word(r, alphabet), _word(r, alphabet)])
+            for i in range(count)]
+
+
+def _surrogateescape(r, count):
+    paths = []
+    for i in range(count):
+        if os.name == "nt":
+            name = u"".join(unichr_(r.randint(0xD800, 0xDFFF)) + u"a"
+                            for j in range(r.randint(3, 12)))
+            paths.append(_join([fsnative(name)]))
+        else:
+            name = bytes(bytearray(
+                r.choice([r.randint(0x80, 0xFF), 0x61])
+                for j in range(r.randint(3, 24))))
+            paths.append(_join([bytes2fsn(name, None)]))
+    return paths
+
+
+def _nul(r, count):
+    alphabet = _ascii_alphabet() + u"\x00"
+    return [u"/" + u"".join(r.choice(alphabet) for j in range(20)) + u"\x00"
+            for i in range(count)]
+
+
+CORPORA = [
+    ("ascii", _ascii),
+    ("deep", _deep),
+    ("non-bmp", _non_bmp),
+    ("surrogateescape", _surrogateescape),
+    ("nul", _nul),
+]
+"""List[Tuple[str, callable]]: Corpus names and their generator functions.
+
+All corpora except "nul" contain absolute fsnative paths, "nul" contains
+text with embedded null characters, which only text2fsn() and fsnative()
+accept.
+"""
+
+
+def get_corpus(name, count=1000, seed=0):
+    """Returns *count* items of the named corpus, the same ones for the same
+    seed.
+    """
+
+    r = random.Random(seed)
+    return dict(CORPORA)[name](r, count)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Compares fsn2norm(), path2fsn() and fsn2text() with the encode/decode
+round trip they did before the fast paths were added.
+
+The "win" cases run the Windows string handling, which is the same on all
+platforms.
+
+    python -m benchmarks.fastpath
+"""
+
+from senf import fsn2norm, path2fsn, fsn2text, bytes2fsn, fsnative
+from senf._fsnative import _fsn2native, _encoding, _merge_surrogates, \
+    _wide2text
+
+from ._util import measure
+
+
+def _fsn2norm_roundtrip(path):
+    return bytes2fsn(_fsn2native(path), None)
+
+
+def _path2fsn_roundtrip(path):
+    path.encode("utf-8", "surrogateescape")
+    return _fsn2norm_roundtrip(path)
+
+
+def _fsn2text_roundtrip(path):
+    return _fsn2native(path).decode(_encoding, "replace")
+
+
+def _wide2text_roundtrip(path):
+    return path.encode("utf-16-le", "surrogatepass").decode(
+        "utf-16-le", "replace")
+
+
+def _merge_roundtrip(path):
+    return path.encode("utf-16-le", "surrogatepass").decode(
+        "utf-16-le", "surrogatepass")
+
+
+def _get_corpora(count=10000):
+    ascii_ = [fsnative(u"/home/user/Music/Artist %d/%02d Track.ogg" % (i, i))
+              for i in range(count)]
+    cjk = [fsnative(u"/home/user/音楽/歌手 %d/%02d "
+                    u"曲.ogg" % (i, i))
+           for i in range(count)]
+    escaped = [bytes2fsn(b"/home/user/\xe4\xf6\xfc/%d/%02d \xff.ogg" % (i, i))
+               for i in range(count)]
+    return [("ascii", ascii_), ("cjk", cjk), ("surrogateescape", escaped)]
+
+
+def main():
+    print("%-16s %-10s %12s %12s %8s" % (
+        "corpus", "function", "before (ns)", "after (ns)", "speedup"))
+    for name, paths in _get_corpora():
+        cases = [
+            ("fsn2norm", _fsn2norm_roundtrip, fsn2norm),
+            ("path2fsn", _path2fsn_roundtrip, path2fsn),
+            ("fsn2text", _fsn2text_roundtrip, fsn2text),
+            ("text (win)", _wide2text_roundtrip,
+             lambda p: _wide2text(p, "replace")),
+            ("norm (win)", _merge_roundtrip, _merge_surrogates),
+        ]
+        for func_name, before, after in cases:
+            assert [before(p) for p in paths] == [after(p) for p in paths]
+            before_time = measure(
+                lambda: [before(p) for p in paths]) / len(paths) * 1e9
+            after_time = measure(
+                lambda: [after(p) for p in paths]) / len(paths) * 1e9
+            print("%-16s %-10s %12.1f %12.1f %7.2fx" % (
+                name, func_name, before_time, after_time,
+                before_time / after_time))
+
+
+if __name__ == "__main__":
+    main()
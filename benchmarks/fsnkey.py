@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Deduplicating paths which only differ in their Unicode normalization,
+normalizing on each comparison compared to fsn2key().
+
+    python -m benchmarks.fsnkey
+"""
+
+import unicodedata
+
+from senf import fsn2text, fsnative, dedupe_paths
+
+from ._util import measure
+from .corpora import get_corpus
+
+
+def _naive_dedupe(paths):
+    seen = set()
+    result = []
+    for path in paths:
+        key = unicodedata.normalize("NFC", fsn2text(path))
+        if key not in seen:
+            seen.add(key)
+            result.append(path)
+    return result
+
+
+def _mixed(count):
+    """A library of mostly ASCII paths, with a few of them both as NFC and
+    NFD, like after merging a macOS and a Linux collection.
+    """
+
+    paths = get_corpus("ascii", count=count)
+    for i in range(0, count, 10):
+        name = u"/music/Bj\xf6rk/Post/%02d - Hyperballad.flac" % (i % 100)
+        paths.append(fsnative(name))
+        paths.append(fsnative(unicodedata.normalize("NFD", name)))
+    return paths
+
+
+def _accented(count):
+    """Non-ASCII but BMP only paths, half of them in NFD"""
+
+    paths = []
+    for i, path in enumerate(get_corpus("ascii", count=count)):
+        name = path.replace(u"a", u"\xe4").replace(u"e", u"\xe9")
+        if i % 2:
+            name = unicodedata.normalize("NFD", name)
+        paths.append(fsnative(name))
+    return paths
+
+
+def main():
+    print("%-16s %12s %12s" % ("", "naive (ms)", "fsn2key (ms)"))
+    for name, paths in [("ascii", get_corpus("ascii", count=100000)),
+                        ("non-bmp", get_corpus("non-bmp", count=100000)),
+                        ("accented", _accented(100000)),
+                        ("mixed", _mixed(100000))]:
+        assert _naive_dedupe(paths) == dedupe_paths(paths)
+        naive = measure(lambda: _naive_dedupe(paths), number=1, repeat=3)
+        keyed = measure(lambda: dedupe_paths(paths), number=1, repeat=3)
+        print("%-16s %12.1f %12.1f" % (name, naive * 1e3, keyed * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Measures the time needed for importing senf and for the first access of
+some of its attributes, using "python -X importtime".
+
+    python -m benchmarks.importtime
+"""
+
+import os
+import subprocess
+import sys
+
+
+_CASES = [
+    "import senf",
+    "import senf; senf.fsn2text",
+    "import senf; senf.fsn2uri",
+    "import senf; senf.print_",
+    "import senf; senf.environ",
+    "import senf; senf.mkstemp",
+]
+
+
+def _import_time(code, repeat=5):
+    """Returns the best time in microseconds spent in importing senf and
+    the modules imported afterwards.
+    """
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def measure():
+        output = subprocess.check_output(
+            [sys.executable, "-X", "importtime", "-c", code],
+            stderr=subprocess.STDOUT, cwd=root)
+        total = 0
+        found = False
+        for line in output.decode("utf-8").splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            self_time, cumulative, name = line[12:].split("|")
+            # nested imports are included in the cumulative time
+            if not self_time.strip().isdigit() or name.startswith("  "):
+                continue
+            found = found or name.strip() == "senf"
+            if found:
+                total += int(cumulative)
+        return total
+
+    return min(measure() for i in range(repeat))
+
+
+def main():
+    print("%-40s %12s" % ("code", "import (us)"))
+    for code in _CASES:
+        print("%-40s %12d" % (code, _import_time(code)))
+
+
+if __name__ == "__main__":
+    main()
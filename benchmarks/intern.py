@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Memory used by paths loaded several times, with and without
+PathInterner.
+
+    python -m benchmarks.intern
+"""
+
+import tracemalloc
+
+from senf import PathInterner, bytes2fsn, fsn2bytes
+
+from ._util import measure
+from .corpora import get_corpus
+
+
+def _load(datas, interner=None):
+    """Decodes each path three times, like a library, playlist and history
+    loaded from disk would.
+    """
+
+    result = []
+    for i in range(3):
+        for data in datas:
+            path = bytes2fsn(data)
+            if interner is not None:
+                path = interner.intern(path)
+            result.append(path)
+    return result
+
+
+def _get_memory(func):
+    tracemalloc.start()
+    try:
+        keep = func()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del keep
+    return size
+
+
+def main():
+    datas = [fsn2bytes(p) for p in get_corpus("ascii", count=100000)]
+
+    print("%-16s %12s %12s %12s" % (
+        "", "memory (MB)", "time (ms)", "saved (MB)"))
+    cases = [
+        ("no interner", lambda: None),
+        ("unbounded", lambda: PathInterner()),
+        ("maxsize=10000", lambda: PathInterner(maxsize=10000)),
+    ]
+    for name, new_interner in cases:
+        size = _get_memory(lambda: _load(datas, new_interner()))
+        duration = measure(lambda: _load(datas, new_interner()), number=1)
+        interner = new_interner()
+        _load(datas, interner)
+        saved = interner.info().bytes_saved if interner else 0
+        print("%-16s %12.1f %12.1f %12.1f" % (
+            name, size / 1e6, duration * 1e3, saved / 1e6))
+
+
+if __name__ == "__main__":
+    main()
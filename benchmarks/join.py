@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Joining paths with fsn_join() compared to normalizing the result of
+os.path.join().
+
+    python -m benchmarks.join
+"""
+
+import os
+
+from senf import fsn2norm, fsn_join
+
+from ._util import measure
+from .corpora import get_corpus
+
+
+def main():
+    print("%-16s %12s %12s" % ("", "norm (ms)", "fsn_join (ms)"))
+    for name in ["ascii", "deep", "non-bmp", "surrogateescape"]:
+        paths = get_corpus(name, count=10000)
+        pairs = [os.path.split(p) for p in paths]
+        norm = measure(lambda: [
+            fsn2norm(os.path.join(h, t)) for h, t in pairs], repeat=3)
+        joined = measure(lambda: [fsn_join(h, t) for h, t in pairs], repeat=3)
+        print("%-16s %12.2f %12.2f" % (name, norm * 1e3, joined * 1e3))
+
+
+if __name__ == "__main__":
+    main()
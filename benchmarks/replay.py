@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Replays a recording made with senf.start_recording() and reports the
+throughput per function.
+
+    python -m benchmarks.replay recording.bin
+
+Without a recording a small one gets created from the synthetic corpora.
+"""
+
+import sys
+import argparse
+
+import senf
+from senf import start_recording, stop_recording, read_recording, \
+    fsn2bytes, fsn2text, fsn2uri, uri2fsn, path2fsn, fsnative
+from senf._compat import BytesIO, text_type
+
+from ._util import measure
+from .corpora import get_corpus
+
+
+class _NullFile(object):
+
+    def write(self, data):
+        pass
+
+    def flush(self):
+        pass
+
+
+def _get_function(name):
+    """Returns a function taking the recorded arguments or None if the
+    function shouldn't be replayed.
+    """
+
+    if name in ("input_", "putenv", "unsetenv"):
+        # reads from stdin or changes the environment
+        return None
+    elif name == "print_":
+        null = _NullFile()
+
+        def print_(*args, **kwargs):
+            kwargs["file"] = null
+            senf.print_(*args, **kwargs)
+        return print_
+    return getattr(senf, name, None)
+
+
+def _get_size(args):
+    size = 0
+    for arg in args:
+        if isinstance(arg, fsnative):
+            size += len(fsn2bytes(arg, "utf-8"))
+        elif isinstance(arg, (bytes, text_type)):
+            size += len(arg)
+    return size
+
+
+def _record_sample():
+    paths = []
+    for corpus in ["ascii", "surrogateescape", "ascii"]:
+        paths.extend(get_corpus(corpus, count=2000))
+
+    f = BytesIO()
+    start_recording(f)
+    try:
+        for path in paths:
+            path2fsn(path)
+            fsn2text(path)
+            uri2fsn(fsn2uri(path))
+            fsn2bytes(path)
+            fsn2text(path, strict=False)
+            fsn2bytes(path, "utf-8")
+    finally:
+        stop_recording()
+    f.seek(0)
+    return f
+
+
+def replay(fileobj):
+    calls = {}
+    for name, args, kwargs in read_recording(fileobj):
+        calls.setdefault(name, []).append((args, kwargs))
+
+    print("%-14s %8s %8s %14s %10s" % (
+        "function", "calls", "errors", "calls/s", "MB/s"))
+    for name, args in sorted(calls.items()):
+        func = _get_function(name)
+        if func is None:
+            print("%-14s %8d %8s" % (name, len(args), "skipped"))
+            continue
+
+        def run():
+            errors = 0
+            for func_args, func_kwargs in args:
+                try:
+                    func(*func_args, **func_kwargs)
+                except (TypeError, ValueError):
+                    errors += 1
+            return errors
+
+        errors = run()
+        duration = measure(run, number=3, repeat=3)
+        size = sum(_get_size(func_args) for func_args, _ in args)
+        print("%-14s %8d %8d %14.0f %10.1f" % (
+            name, len(args), errors, len(args) / duration,
+            size / duration / 1e6))
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.replay")
+    parser.add_argument("recording", nargs="?")
+    args = parser.parse_args(argv[1:])
+
+    if args.recording is None:
+        replay(_record_sample())
+    else:
+        with open(args.recording, "rb") as f:
+            replay(f)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Sorting paths naturally, computing the keys on each sort compared to
+reusing them with SortKeyCache.
+
+    python -m benchmarks.sortkey
+"""
+
+import re
+
+from senf import fsn2text, fsn2sortkey, sort_paths, SortKeyCache
+
+from ._util import measure
+from .corpora import get_corpus
+
+
+_DIGITS = re.compile(u"(\\d+)")
+
+
+def _naive_key(path):
+    """What callers did before: convert and split on every sort"""
+
+    parts = _DIGITS.split(fsn2text(path).casefold())
+    return [int(p) if i % 2 else p for i, p in enumerate(parts)]
+
+
+def main():
+    print("%-16s %12s %12s %12s" % (
+        "", "naive (ms)", "sort (ms)", "cached (ms)"))
+    for name in ["ascii", "deep", "surrogateescape"]:
+        paths = get_corpus(name, count=100000)
+        cache = SortKeyCache()
+        cache.sort(paths)
+        naive = measure(
+            lambda: sorted(paths, key=_naive_key), number=1, repeat=3)
+        sort = measure(lambda: sort_paths(paths), number=1, repeat=3)
+        cached = measure(lambda: cache.sort(paths), number=1, repeat=3)
+        print("%-16s %12.1f %12.1f %12.1f" % (
+            name, naive * 1e3, sort * 1e3, cached * 1e3))
+
+    paths = get_corpus("ascii", count=100000)
+    key = measure(
+        lambda: [fsn2sortkey(p) for p in paths], number=1, repeat=3)
+    print("fsn2sortkey: %.2f us per path" % (key / len(paths) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
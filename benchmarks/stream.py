@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Compares iter_paths() with reading everything and splitting.
+
+    python -m benchmarks.stream
+"""
+
+import io
+
+from senf import iter_paths, bytes2fsn, fsn2bytes
+
+from ._util import measure
+from .corpora import get_corpus
+
+
+def _read_split(data):
+    return [bytes2fsn(p) for p in io.BytesIO(data).read().split(b"\x00")]
+
+
+def main():
+    print("%-16s %14s %14s %8s" % (
+        "corpus", "split (ns)", "stream (ns)", "speedup"))
+    for corpus in ["ascii", "deep", "surrogateescape"]:
+        paths = get_corpus(corpus, count=100000)
+        data = b"\x00".join(fsn2bytes(p, "utf-8") for p in paths)
+        assert _read_split(data) == list(iter_paths(io.BytesIO(data)))
+        split_time = measure(
+            lambda: _read_split(data), number=2) / len(paths) * 1e9
+        stream_time = measure(
+            lambda: list(iter_paths(io.BytesIO(data))),
+            number=2) / len(paths) * 1e9
+        print("%-16s %14.1f %14.1f %7.2fx" % (
+            corpus, split_time, stream_time, split_time / stream_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Benchmarks for all public converters, run against every corpus"""
+
+import os
+import sys
+import shutil
+import tempfile
+import platform
+
+import senf
+from senf import fsnative, path2fsn, fsn2norm, fsn2text, text2fsn, \
+    fsn2bytes, bytes2fsn, fsn2uri, uri2fsn, print_, expandvars, expanduser, \
+    mkstemp, environ, sep
+from senf._compat import BytesIO
+from senf._fsnative import _encoding
+
+from ._util import measure
+from .corpora import CORPORA, get_corpus
+
+
+def _texts(paths):
+    return [p if not isinstance(p, fsnative) else fsn2text(p) for p in paths]
+
+
+def _bench_fsnative(paths):
+    texts = _texts(paths)
+    return lambda: [fsnative(t) for t in texts]
+
+
+def _bench_text2fsn(paths):
+    texts = _texts(paths)
+    return lambda: [text2fsn(t) for t in texts]
+
+
+def _bench_path2fsn(paths):
+    return lambda: [path2fsn(p) for p in paths]
+
+
+def _bench_fsn2norm(paths):
+    return lambda: [fsn2norm(p) for p in paths]
+
+
+def _bench_fsn2text(paths):
+    return lambda: [fsn2text(p) for p in paths]
+
+
+def _bench_fsn2bytes(paths):
+    return lambda: [fsn2bytes(p, "utf-8") for p in paths]
+
+
+def _bench_bytes2fsn(paths):
+    datas = [fsn2bytes(p, "utf-8") for p in paths]
+    return lambda: [bytes2fsn(d, "utf-8") for d in datas]
+
+
+def _bench_fsn2uri(paths):
+    return lambda: [fsn2uri(p) for p in paths]
+
+
+def _bench_uri2fsn(paths):
+    uris = [fsn2uri(p) for p in paths]
+    return lambda: [uri2fsn(u) for u in uris]
+
+
+def _bench_print_(paths):
+    def func():
+        file = BytesIO()
+        for p in paths:
+            print_(p, file=file)
+    return func
+
+
+def _bench_expandvars(paths):
+    environ["SENF_BENCH"] = fsnative(u"bench")
+    paths = [fsnative(u"${SENF_BENCH}") + p for p in paths]
+
+    def func():
+        return [expandvars(p) for p in paths]
+    func.cleanup = lambda: environ.pop("SENF_BENCH", None)
+    return func
+
+
+def _bench_expanduser(paths):
+    paths = [fsnative(u"~") + p for p in paths]
+    return lambda: [expanduser(p) for p in paths]
+
+
+def _bench_mkstemp(paths):
+    suffixes = [os.path.basename(p) for p in paths]
+    dir_ = tempfile.mkdtemp()
+
+    def func():
+        for suffix in suffixes:
+            fd, path = mkstemp(suffix=suffix, dir=dir_)
+            os.close(fd)
+    func.cleanup = lambda: shutil.rmtree(dir_)
+    return func
+
+
+BENCHMARKS = [
+    ("fsnative", _bench_fsnative),
+    ("text2fsn", _bench_text2fsn),
+    ("path2fsn", _bench_path2fsn),
+    ("fsn2norm", _bench_fsn2norm),
+    ("fsn2text", _bench_fsn2text),
+    ("fsn2bytes", _bench_fsn2bytes),
+    ("bytes2fsn", _bench_bytes2fsn),
+    ("fsn2uri", _bench_fsn2uri),
+    ("uri2fsn", _bench_uri2fsn),
+    ("print_", _bench_print_),
+    ("expandvars", _bench_expandvars),
+    ("expanduser", _bench_expanduser),
+    ("mkstemp", _bench_mkstemp),
+]
+"""List[Tuple[str, callable]]: Benchmark names and setup functions.
+
+The setup functions take a corpus and return a function converting all of
+its items once.
+"""
+
+# Only these accept the text with embedded nulls of the "nul" corpus
+_NUL_BENCHMARKS = ("fsnative", "text2fsn")
+
+# Creating files is slow, so use fewer of them
+_SLOW_BENCHMARKS = ("mkstemp",)
+
+
+def run(count=1000, seed=0, names=None, corpora=None, progress=None):
+    """Runs the benchmarks and returns the results as a JSON serializable
+    dict.
+
+    Args:
+        count (int): Number of items per corpus
+        seed (int): Seed used for generating the corpora
+        names (List[str] or None): Benchmarks to run, or None for all
+        corpora (List[str] or None): Corpora to use, or None for all
+        progress (callable or None): Gets called with each result
+    """
+
+    results = []
+    for corpus_name, gen in CORPORA:
+        if corpora is not None and corpus_name not in corpora:
+            continue
+        items = get_corpus(corpus_name, count, seed)
+        for name, setup in BENCHMARKS:
+            if names is not None and name not in names:
+                continue
+            if corpus_name == "nul" and name not in _NUL_BENCHMARKS:
+                continue
+            corpus = items
+            if name in _SLOW_BENCHMARKS:
+                corpus = items[:max(1, count // 10)]
+
+            result = {
+                "function": name,
+                "corpus": corpus_name,
+                "items": len(corpus),
+            }
+            func = setup(corpus)
+            try:
+                seconds = measure(func, number=3)
+            except (ValueError, TypeError, EnvironmentError) as e:
+                result["error"] = repr(e)
+            else:
+                result["seconds_per_item"] = seconds / len(corpus)
+                result["items_per_second"] = len(corpus) / seconds
+            finally:
+                getattr(func, "cleanup", lambda: None)()
+
+            results.append(result)
+            if progress is not None:
+                progress(result)
+
+    return {
+        "senf_version": senf.version_string,
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "platform": sys.platform,
+        "path_encoding": _encoding,
+        "sep": fsn2text(sep),
+        "count": count,
+        "seed": seed,
+        "results": results,
+    }
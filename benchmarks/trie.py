@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Compares the memory use and speed of PathTrie with a set.
+
+    python -m benchmarks.trie
+"""
+
+import random
+import tracemalloc
+
+from senf import PathTrie, fsnative, sep
+
+from ._util import measure
+
+
+def _library(count, seed=0):
+    """Paths like a music library, with albums of ten tracks"""
+
+    r = random.Random(seed)
+    root = sep.join([fsnative(u""), fsnative(u"mnt"), fsnative(u"music")])
+    paths = []
+    while len(paths) < count:
+        artist = fsnative(u"Artist Name %d" % r.randint(0, count // 50))
+        album = fsnative(u"Some Album Title %d" % len(paths))
+        for i in range(10):
+            name = fsnative(u"%02d - Track Title Number %d.flac" % (i, i))
+            paths.append(sep.join([root, artist, album, name]))
+    return paths
+
+
+def _get_memory(func):
+    tracemalloc.start()
+    try:
+        keep = func()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del keep
+    return size
+
+
+def main():
+    paths = _library(200000)
+    # not shared with the list above
+    copies = [p.encode("utf-8", "surrogateescape").decode(
+        "utf-8", "surrogateescape") for p in paths]
+
+    set_size = _get_memory(lambda: set(
+        p.encode("utf-8", "surrogateescape").decode(
+            "utf-8", "surrogateescape") for p in paths))
+    trie_size = _get_memory(lambda: PathTrie(paths))
+    print("%d paths" % len(paths))
+    print("%-24s %10s %10s" % ("", "set", "PathTrie"))
+    print("%-24s %10.1f %10.1f" % (
+        "memory (MB)", set_size / 1e6, trie_size / 1e6))
+
+    path_set = set(paths)
+    trie = PathTrie(paths)
+    cases = [
+        ("build (ms)", lambda: set(paths), lambda: PathTrie(paths)),
+        ("contains (ms)",
+         lambda: [p in path_set for p in copies],
+         lambda: [p in trie for p in copies]),
+        ("iterate (ms)", lambda: list(path_set), lambda: list(trie)),
+    ]
+    for name, set_func, trie_func in cases:
+        print("%-24s %10.1f %10.1f" % (
+            name, measure(set_func, number=1) * 1e3,
+            measure(trie_func, number=1) * 1e3))
+
+    artist = sep.join(paths[0].split(sep)[:4])
+    set_time = measure(lambda: [p for p in path_set
+                                if p.startswith(artist + sep)], number=1)
+    trie_time = measure(lambda: list(trie.iter_subtree(artist)), number=1)
+    print("%-24s %10.1f %10.1f" % (
+        "subtree (ms)", set_time * 1e3, trie_time * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Compares the functions in senf.unchecked with the normal ones, for paths
+as returned by os.listdir().
+
+    python -m benchmarks.unchecked
+"""
+
+import senf
+from senf import unchecked, fsn2bytes
+
+from ._util import measure
+from .corpora import get_corpus
+
+
+_FUNCTIONS = ["path2fsn", "fsn2norm", "fsn2text", "fsn2bytes", "fsn2uri"]
+
+
+def main():
+    for corpus in ["ascii", "non-bmp", "surrogateescape"]:
+        paths = get_corpus(corpus, count=10000)
+        datas = [fsn2bytes(p, "utf-8") for p in paths]
+
+        print("%s" % corpus)
+        print("%-12s %14s %14s %8s" % (
+            "function", "checked (ns)", "unchecked (ns)", "speedup"))
+        cases = [(name, getattr(senf, name), getattr(unchecked, name), paths)
+                 for name in _FUNCTIONS]
+        cases.append(("bytes2fsn", senf.bytes2fsn, unchecked.bytes2fsn, datas))
+        for name, checked_func, unchecked_func, args in cases:
+            assert [checked_func(a) for a in args] == \
+                [unchecked_func(a) for a in args]
+            checked_time = measure(
+                lambda: [checked_func(a) for a in args]) / len(args) * 1e9
+            unchecked_time = measure(
+                lambda: [unchecked_func(a) for a in args]) / len(args) * 1e9
+            print("%-12s %14.1f %14.1f %7.2fx" % (
+                name, checked_time, unchecked_time,
+                checked_time / unchecked_time))
+        print()
+
+
+if __name__ == "__main__":
+    main()
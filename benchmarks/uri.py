@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Compares UriEncoder/UriDecoder with calling fsn2uri()/uri2fsn() for
+each path of a music library like path set.
+
+    python -m benchmarks.uri
+"""
+
+import os
+import random
+
+from senf import fsn2uri, uri2fsn, UriEncoder, UriDecoder, fsnative, sep
+
+from ._util import measure
+
+
+_ARTISTS = [u"The Beatles", u"Björk", u"Sigur Rós", u"坂本龍一",
+            u"Мумий Тролль", u"AC/DC", u"Guns N' Roses", u"Café Tacvba"]
+
+
+def _get_library(count=20000, seed=0):
+    """Returns paths sorted like a directory walk would return them:
+    artist/album/track with about 12 tracks per album.
+    """
+
+    r = random.Random(seed)
+    root = fsnative(u"C:\\\\Music") if os.name == "nt" else \
+        fsnative(u"/home/user/Music")
+    paths = []
+    album = 0
+    while len(paths) < count:
+        artist = r.choice(_ARTISTS).replace(u"/", u"_")
+        album += 1
+        directory = sep.join(
+            [root, fsnative(artist), fsnative(u"Album #%d (%d)" % (
+                album, r.randint(1960, 2020)))])
+        for track in range(r.randint(8, 16)):
+            name = fsnative(u"%02d - Track & Title %d.flac" % (track, track))
+            paths.append(directory + sep + name)
+    return paths[:count]
+
+
+def main():
+    paths = _get_library()
+    uris = [fsn2uri(p) for p in paths]
+
+    cases = [
+        ("fsn2uri",
+         lambda: [fsn2uri(p) for p in paths],
+         lambda: list(map(UriEncoder().encode, paths))),
+        ("uri2fsn",
+         lambda: [uri2fsn(u) for u in uris],
+         lambda: list(map(UriDecoder().decode, uris))),
+    ]
+
+    assert cases[0][2]() == uris
+    assert cases[1][2]() == paths
+
+    print("%-12s %14s %14s %8s" % (
+        "function", "function (ns)", "object (ns)", "speedup"))
+    for name, function, reused in cases:
+        function_time = measure(function) / len(paths) * 1e9
+        reused_time = measure(reused) / len(paths) * 1e9
+        print("%-12s %14.1f %14.1f %7.2fx" % (
+            name, function_time, reused_time, function_time / reused_time))
+
+
+if __name__ == "__main__":
+    main()
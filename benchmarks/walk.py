@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Compares os.walk() with senf.walk(), with and without worker threads.
+
+    python -m benchmarks.walk [directory]
+
+Without a directory a tree with about 2000 directories gets created in a
+temporary directory and walked, then a smaller one gets walked with an
+artificial latency of 1 ms per directory listing. Pass a directory on a
+network file system to see the effect of the workers there.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import contextlib
+
+from senf import walk
+
+from ._util import measure
+
+
+def _create_tree(root, depth=3, width=12, files=10):
+    if depth == 0:
+        return
+    for i in range(files):
+        with open(os.path.join(root, "file%d" % i), "wb"):
+            pass
+    for i in range(width):
+        path = os.path.join(root, "dir%d" % i)
+        os.mkdir(path)
+        _create_tree(path, depth - 1, width, files)
+
+
+def _count_os(top):
+    return sum(len(dirs) + len(files) for _, dirs, files in os.walk(top))
+
+
+def _count_senf(top, **kwargs):
+    return sum(len(dirs) + len(files)
+               for _, dirs, files in walk(top, **kwargs))
+
+
+@contextlib.contextmanager
+def _latency(seconds):
+    """Makes os.scandir() sleep before listing, like a network file system
+    would.
+    """
+
+    orig_scandir = os.scandir
+
+    def scandir(*args, **kwargs):
+        time.sleep(seconds)
+        return orig_scandir(*args, **kwargs)
+
+    os.scandir = scandir
+    try:
+        yield
+    finally:
+        os.scandir = orig_scandir
+
+
+def run(top):
+    count = _count_os(top)
+    print("%d entries" % count)
+    print("%-24s %10s %8s" % ("", "time (ms)", "speedup"))
+
+    os_time = measure(lambda: _count_os(top), number=1, repeat=3)
+    print("%-24s %10.1f" % ("os.walk", os_time * 1000))
+
+    cases = [("senf.walk", {})]
+    for workers in [2, 4, 8]:
+        cases.append(("workers=%d" % workers, {"workers": workers}))
+        cases.append(("workers=%d unordered" % workers,
+                      {"workers": workers, "ordered": False}))
+
+    for name, kwargs in cases:
+        assert _count_senf(top, **kwargs) == count
+        senf_time = measure(
+            lambda: _count_senf(top, **kwargs), number=1, repeat=3)
+        print("%-24s %10.1f %7.2fx" % (
+            name, senf_time * 1000, os_time / senf_time))
+
+
+def main(argv):
+    if len(argv) > 1:
+        run(argv[1])
+        return
+
+    top = tempfile.mkdtemp()
+    try:
+        _create_tree(top)
+        run(top)
+    finally:
+        shutil.rmtree(top)
+
+    print()
+    print("with 1 ms latency per directory")
+    top = tempfile.mkdtemp()
+    try:
+        _create_tree(top, width=6)
+        with _latency(0.001):
+            run(top)
+    finally:
+        shutil.rmtree(top)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Compares the WTF-8 codec with the utf-16 round trip used before for
+merging surrogate pairs.
+
+    python -m benchmarks.wtf
+"""
+
+from senf._compat import PY2
+from senf._wtf import merge_surrogates
+
+from ._util import measure
+
+
+def _merge_roundtrip(text):
+    return text.encode("utf-16-le", "surrogatepass").decode(
+        "utf-16-le", "surrogatepass")
+
+
+def _wtf8_roundtrip(text):
+    return _merge_roundtrip(text).encode("utf-8", "surrogatepass")
+
+
+def _get_corpora(count=10000):
+    ascii_ = [u"C:\\Music\\Artist %d\\%02d Track.ogg" % (i, i)
+              for i in range(count)]
+    bmp = [u"C:\\音楽\\歌手 %d\\%02d 曲.ogg" % (i, i) for i in range(count)]
+    pairs = [u"C:\\Music\\%d \ud83d\udca9\\%02d.ogg" % (i, i)
+             for i in range(count)]
+    lone = [u"C:\\Music\\%d \udca9\\%02d.ogg" % (i, i) for i in range(count)]
+    return [("ascii", ascii_), ("bmp", bmp), ("pairs", pairs), ("lone", lone)]
+
+
+def main():
+    print("%-16s %-10s %12s %12s %8s" % (
+        "corpus", "function", "before (ns)", "after (ns)", "speedup"))
+    for name, texts in _get_corpora():
+        cases = [
+            ("merge", _merge_roundtrip, merge_surrogates),
+            ("encode", _wtf8_roundtrip, lambda t: t.encode("wtf-8")),
+        ]
+        for func_name, before, after in cases:
+            assert [before(t) for t in texts] == [after(t) for t in texts]
+            before_time = measure(
+                lambda: [before(t) for t in texts]) / len(texts) * 1e9
+            after_time = measure(
+                lambda: [after(t) for t in texts]) / len(texts) * 1e9
+            print("%-16s %-10s %12.1f %12.1f %7.2fx" % (
+                name, func_name, before_time, after_time,
+                before_time / after_time))
+
+
+if __name__ == "__main__":
+    if PY2:
+        raise SystemExit("Python 3 only")
+    main()
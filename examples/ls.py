@@ -21,16 +21,17 @@ import senf
 
 def main(argv):
     dir_ = argv[1]
-    for entry in sorted(os.listdir(dir_)):
-        path = os.path.join(dir_, entry)
-        size = os.path.getsize(path)
-        mtime = os.path.getmtime(path)
-        mtime_format = time.strftime("%b %d %H:%M", time.localtime(mtime))
+    entries = senf.scandir(dir_)
+    for entry in sorted(entries, key=lambda e: senf.fsn2sortkey(e.name)):
+        stat = entry.stat()
+        size = stat.st_size
+        mtime_format = time.strftime(
+            "%b %d %H:%M", time.localtime(stat.st_mtime))
 
         reset = '\033[0m'
-        if os.path.isdir(path):
+        if entry.is_dir():
             color = '\033[1;94m'
-        elif os.access(path, os.X_OK):
+        elif os.access(entry.path, os.X_OK):
             color = '\033[1;92m'
         else:
             color = ''
@@ -39,7 +40,7 @@ def main(argv):
             reset = color = ''
 
         senf.print_("%6d %13s %s%s%s" % (size, mtime_format, color,
-                                         entry, reset))
+                                         entry.name, reset))
 
 
 if __name__ == "__main__":
@@ -20,20 +20,7 @@
 # TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
-from ._fsnative import fsnative, path2fsn, fsn2text, fsn2bytes, \
-    bytes2fsn, uri2fsn, fsn2uri, text2fsn, fsn2norm
-from ._print import print_, input_, supports_ansi_escape_codes
-from ._stdlib import sep, pathsep, curdir, pardir, altsep, extsep, devnull, \
-    defpath, getcwd, expanduser, expandvars
-from ._argv import argv
-from ._environ import environ, getenv, unsetenv, putenv
-from ._temp import mkstemp, gettempdir, gettempprefix, mkdtemp
-
-
-fsnative, print_, getcwd, getenv, unsetenv, putenv, environ, expandvars, \
-    path2fsn, fsn2text, fsn2bytes, bytes2fsn, uri2fsn, fsn2uri, mkstemp, \
-    gettempdir, gettempprefix, mkdtemp, input_, expanduser, text2fsn, \
-    supports_ansi_escape_codes, fsn2norm
+import sys
 
 
 version = (1, 5, 2)
@@ -44,42 +31,105 @@ version_string = ".".join(map(str, version))
 """`str`: A version string"""
 
 
-argv = argv
-"""List[`fsnative`]: Like `sys.argv` but contains unicode under
-Windows + Python 2
-"""
-
-
-sep = sep
-"""`fsnative`: Like `os.sep` but a `fsnative`"""
-
-
-pathsep = pathsep
-"""`fsnative`: Like `os.pathsep` but a `fsnative`"""
-
-
-curdir = curdir
-"""`fsnative`: Like `os.curdir` but a `fsnative`"""
-
-
-pardir = pardir
-"""`fsnative`: Like `os.pardir` but a fsnative"""
-
-
-altsep = altsep
-"""`fsnative` or `None`: Like `os.altsep` but a `fsnative` or `None`"""
-
-
-extsep = extsep
-"""`fsnative`: Like `os.extsep` but a `fsnative`"""
-
-
-devnull = devnull
-"""`fsnative`: Like `os.devnull` but a `fsnative`"""
-
-
-defpath = defpath
-"""`fsnative`: Like `os.defpath` but a `fsnative`"""
+# The public API and the modules providing it. Modules get imported on first
+# access (PEP 562), so "import senf" only pays for what is used.
+_LAZY = {
+    "fsnative": "_fsnative",
+    "path2fsn": "_fsnative",
+    "fsn2text": "_fsnative",
+    "fsn2bytes": "_fsnative",
+    "bytes2fsn": "_fsnative",
+    "uri2fsn": "_fsnative",
+    "fsn2uri": "_fsnative",
+    "text2fsn": "_fsnative",
+    "fsn2norm": "_fsnative",
+    "buffer2fsn": "_fsnative",
+    "fsn2buffer": "_fsnative",
+    "print_": "_print",
+    "input_": "_print",
+    "supports_ansi_escape_codes": "_print",
+    "sep": "_stdlib",
+    "pathsep": "_stdlib",
+    "curdir": "_stdlib",
+    "pardir": "_stdlib",
+    "altsep": "_stdlib",
+    "extsep": "_stdlib",
+    "devnull": "_stdlib",
+    "defpath": "_stdlib",
+    "getcwd": "_stdlib",
+    "expanduser": "_stdlib",
+    "expandvars": "_stdlib",
+    "argv": "_argv",
+    "environ": "_environ",
+    "getenv": "_environ",
+    "unsetenv": "_environ",
+    "putenv": "_environ",
+    "mkstemp": "_temp",
+    "gettempdir": "_temp",
+    "gettempprefix": "_temp",
+    "mkdtemp": "_temp",
+    "paths2fsn": "_batch",
+    "fsns2bytes": "_batch",
+    "bytes2fsns": "_batch",
+    "fsns2text": "_batch",
+    "enable_cache": "_cache",
+    "disable_cache": "_cache",
+    "cache_info": "_cache",
+    "enable_stats": "_instrument",
+    "disable_stats": "_instrument",
+    "reset_stats": "_instrument",
+    "stats": "_instrument",
+    "set_trace_hook": "_instrument",
+    "start_recording": "_recording",
+    "stop_recording": "_recording",
+    "read_recording": "_recording",
+    "FsnArray": "_array",
+    "iter_paths": "_stream",
+    "parse_uri_list": "_uri",
+    "format_uri_list": "_uri",
+    "UriEncoder": "_uri",
+    "UriDecoder": "_uri",
+    "Converter": "_converter",
+    "scandir": "_scandir",
+    "walk": "_scandir",
+    "DirEntry": "_scandir",
+    "PathInterner": "_intern",
+    "PathTrie": "_trie",
+    "fsn2sortkey": "_keys",
+    "sort_paths": "_keys",
+    "SortKeyCache": "_keys",
+    "fsn2key": "_keys",
+    "dedupe_paths": "_keys",
+    "fsn_join": "_join",
+    "fsn_split": "_join",
+    # submodules
+    "unchecked": "unchecked",
+}
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(
+            "module %r has no attribute %r" % (__name__, name))
+
+    module = __import__(module_name, globals(), None, [name], 1)
+    value = module if module_name == name else getattr(module, name)
+    # only look it up once
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+if sys.version_info[:2] < (3, 7):
+    # no support for module __getattr__, import everything
+    for _name in _LAZY:
+        __getattr__(_name)
+    del _name
 
 
 __all__ = []
@@ -1,7 +1,8 @@
 import sys
 import os
 
-from typing import Text, Union, Any, Optional, Tuple, List, Dict
+from typing import Text, Union, Any, Optional, Tuple, List, Dict, Iterable, \
+    NamedTuple, Iterator, Callable, overload
 
 if sys.version_info[0] == 2:
     _pathlike = Union[Text, bytes]
@@ -40,7 +41,7 @@ def text2fsn(text: Text) -> _fsnative:
 def fsn2bytes(path: _fsnative, encoding: _bytes_default_encoding="utf-8") -> bytes:
     ...
 
-def bytes2fsn(data: bytes, encoding: _bytes_default_encoding="utf-8") -> _fsnative:
+def bytes2fsn(data: Union[bytes, bytearray, memoryview], encoding: _bytes_default_encoding="utf-8") -> _fsnative:
     ...
 
 def uri2fsn(uri: _uri) -> _fsnative:
@@ -52,6 +53,324 @@ def fsn2uri(path: _fsnative) -> Text:
 def fsn2norm(path: _fsnative) -> _fsnative:
     ...
 
+def buffer2fsn(buffer: Union[bytes, bytearray, memoryview], encoding: _bytes_default_encoding="utf-8", start: int=0, end: Optional[int]=None) -> _fsnative:
+    ...
+
+def fsn2buffer(path: _fsnative, buffer: bytearray, encoding: _bytes_default_encoding="utf-8") -> int:
+    ...
+
+def paths2fsn(paths: Iterable[_pathlike]) -> List[_fsnative]:
+    ...
+
+def fsns2bytes(paths: Iterable[_fsnative], encoding: _bytes_default_encoding="utf-8") -> List[bytes]:
+    ...
+
+def bytes2fsns(datas: Iterable[Union[bytes, bytearray, memoryview]], encoding: _bytes_default_encoding="utf-8") -> List[_fsnative]:
+    ...
+
+def fsns2text(paths: Iterable[_fsnative], strict: bool=False) -> List[Text]:
+    ...
+
+@overload
+def iter_paths(fileobj: Any, sep: bytes=b"\x00", encoding: str="utf-8",
+               chunk_size: int=65536,
+               batch_size: None=None) -> Iterator[_fsnative]:
+    ...
+
+@overload
+def iter_paths(fileobj: Any, sep: bytes=b"\x00", encoding: str="utf-8",
+               chunk_size: int=65536, *,
+               batch_size: int) -> Iterator[List[_fsnative]]:
+    ...
+
+def parse_uri_list(data: Union[bytes, Text, Any], strict: bool=False) -> Iterator[_fsnative]:
+    ...
+
+@overload
+def format_uri_list(paths: Iterable[_fsnative]) -> Text:
+    ...
+
+@overload
+def format_uri_list(paths: Iterable[_fsnative], fileobj: Any) -> None:
+    ...
+
+class UriEncoder(object):
+    def __init__(self, maxsize: int=256) -> None:
+        ...
+
+    def cache_info(self) -> _CacheInfo:
+        ...
+
+    def encode(self, path: _fsnative) -> Text:
+        ...
+
+class UriDecoder(object):
+    def __init__(self, maxsize: int=256) -> None:
+        ...
+
+    def cache_info(self) -> _CacheInfo:
+        ...
+
+    def decode(self, uri: _uri) -> _fsnative:
+        ...
+
+class Converter(object):
+    encoding: str
+
+    def __init__(self, encoding: str="utf-8") -> None:
+        ...
+
+    def to_bytes(self, path: _fsnative) -> bytes:
+        ...
+
+    def from_bytes(self, data: bytes) -> _fsnative:
+        ...
+
+    def to_text(self, path: _fsnative, strict: bool=False) -> Text:
+        ...
+
+    def to_uri(self, path: _fsnative) -> Text:
+        ...
+
+class DirEntry(object):
+    @property
+    def name(self) -> _fsnative:
+        ...
+
+    @property
+    def path(self) -> _fsnative:
+        ...
+
+    @property
+    def text(self) -> Text:
+        ...
+
+    @property
+    def uri(self) -> Text:
+        ...
+
+    def stat(self, follow_symlinks: bool=True) -> os.stat_result:
+        ...
+
+    def inode(self) -> int:
+        ...
+
+    def is_dir(self, follow_symlinks: bool=True) -> bool:
+        ...
+
+    def is_file(self, follow_symlinks: bool=True) -> bool:
+        ...
+
+    def is_symlink(self) -> bool:
+        ...
+
+    def __fspath__(self) -> _fsnative:
+        ...
+
+def scandir(path: Optional[_pathlike]=None) -> Iterator[DirEntry]:
+    ...
+
+def walk(top: _pathlike, topdown: bool=True, onerror: Optional[Callable[[EnvironmentError], None]]=None, followlinks: bool=False, workers: int=0, ordered: bool=True, max_pending: Optional[int]=None) -> Iterator[Tuple[_fsnative, List[DirEntry], List[DirEntry]]]:
+    ...
+
+class _InternInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+    bytes_saved: int
+
+class PathInterner(object):
+    def __init__(self, maxsize: Optional[int]=None) -> None:
+        ...
+
+    def intern(self, path: _fsnative) -> _fsnative:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def info(self) -> _InternInfo:
+        ...
+
+class PathTrie(object):
+    def __init__(self, paths: Iterable[_fsnative]=()) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def __contains__(self, path: _fsnative) -> bool:
+        ...
+
+    def __iter__(self) -> Iterator[_fsnative]:
+        ...
+
+    def add(self, path: _fsnative) -> None:
+        ...
+
+    def discard(self, path: _fsnative) -> None:
+        ...
+
+    def remove(self, path: _fsnative) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def iter_subtree(self, path: _fsnative) -> Iterator[_fsnative]:
+        ...
+
+    def remove_subtree(self, path: _fsnative) -> int:
+        ...
+
+def fsn2sortkey(path: _fsnative, natural: bool=True,
+                casefold: bool=True) -> Any:
+    ...
+
+def sort_paths(paths: Iterable[_fsnative], natural: bool=True,
+               casefold: bool=True, reverse: bool=False) -> List[_fsnative]:
+    ...
+
+class SortKeyCache(object):
+    def __init__(self, natural: bool=True, casefold: bool=True,
+                 maxsize: Optional[int]=None) -> None:
+        ...
+
+    def key(self, path: _fsnative) -> Any:
+        ...
+
+    def sort(self, paths: Iterable[_fsnative],
+             reverse: bool=False) -> List[_fsnative]:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+def fsn2key(path: _fsnative, form: str="NFC", casefold: bool=False) -> Any:
+    ...
+
+def dedupe_paths(paths: Iterable[_fsnative], form: str="NFC",
+                 casefold: bool=False) -> List[_fsnative]:
+    ...
+
+def fsn_join(*parts: _fsnative) -> _fsnative:
+    ...
+
+def fsn_split(path: _fsnative) -> Tuple[_fsnative, _fsnative]:
+    ...
+
+from . import unchecked as unchecked
+
+class FsnArray(object):
+    def __init__(self, paths: Iterable[_pathlike]=()) -> None:
+        ...
+
+    @classmethod
+    def from_bytes(cls, datas: Iterable[bytes]) -> FsnArray:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    @overload
+    def __getitem__(self, index: int) -> _fsnative:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> FsnArray:
+        ...
+
+    def __iter__(self) -> Iterator[_fsnative]:
+        ...
+
+    @property
+    def nbytes(self) -> int:
+        ...
+
+    def get_bytes(self, index: int) -> bytes:
+        ...
+
+    def append(self, path: _pathlike) -> None:
+        ...
+
+    def extend(self, paths: Iterable[_pathlike]) -> None:
+        ...
+
+    def extend_bytes(self, datas: Iterable[bytes]) -> None:
+        ...
+
+    def to_list(self) -> List[_fsnative]:
+        ...
+
+    def to_text(self, strict: bool=False) -> List[Text]:
+        ...
+
+    def to_uri(self) -> List[_uri]:
+        ...
+
+    def filter_prefix(self, prefix: _pathlike) -> FsnArray:
+        ...
+
+    def filter_suffix(self, suffix: _pathlike) -> FsnArray:
+        ...
+
+class _CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+def enable_cache(maxsize: int=1024) -> None:
+    ...
+
+def disable_cache() -> None:
+    ...
+
+def cache_info() -> Dict[str, _CacheInfo]:
+    ...
+
+class _ConversionStats(NamedTuple):
+    calls: int
+    errors: int
+    fallbacks: int
+    bytes: int
+
+def enable_stats() -> None:
+    ...
+
+def disable_stats() -> None:
+    ...
+
+def reset_stats() -> None:
+    ...
+
+def stats() -> Dict[str, _ConversionStats]:
+    ...
+
+class _TraceEvent(NamedTuple):
+    function: str
+    length: Optional[int]
+    duration: float
+    error: Optional[Exception]
+    fallback: bool
+
+def set_trace_hook(hook: Optional[Callable[[_TraceEvent], None]], sample_rate: float=1.0, threshold: float=0.0) -> None:
+    ...
+
+def start_recording(fileobj: Any) -> None:
+    ...
+
+def stop_recording() -> None:
+    ...
+
+def read_recording(fileobj: Any) -> Iterator[Tuple[str, Tuple[Union[_fsnative, bytes, Text, bool, int, None], ...], Dict[str, Union[_fsnative, bytes, Text, bool, int, None]]]]:
+    ...
+
 sep: _fsnative
 pathsep: _fsnative
 curdir: _fsnative
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from array import array
+from bisect import bisect_left
+
+from ._compat import PY2, PY3, quote
+from ._fsnative import is_unix, _encoding, path2fsn, fsn2bytes, bytes2fsn, \
+    fsn2uri
+from ._batch import paths2fsn, fsns2bytes, bytes2fsns, fsns2text, \
+    _batch_error
+
+
+# "L" is only 32 bit on Windows, "Q" isn't available with Python 2
+_OFFSET_TYPE = "L" if PY2 else "Q"
+
+# Encodings for which decoding the NUL separated buffer as a whole gives the
+# same result as decoding each path on its own
+_SPLIT_ENCODINGS = ("utf-8", "ascii", "iso8859-1")
+
+
+class FsnArray(object):
+    """FsnArray(paths=())
+
+    Args:
+        paths (Iterable[pathlike]): The initial paths
+    Raises:
+        TypeError: In case a path can't be converted to a `fsnative`
+        ValueError: In case a conversion fails
+
+    A list-like container for many paths which stores the encoded paths in
+    one contiguous buffer instead of as separate `fsnative` objects. Items
+    are only converted to `fsnative` when accessed.
+
+    The paths are stored as returned by :func:`fsn2bytes` with ``utf-8``
+    (WTF-8 on Windows).
+    """
+
+    def __init__(self, paths=()):
+        # Each path is preceded and followed by a NUL byte, which can't be
+        # part of a path. offsets contains the positions of the NUL bytes.
+        self._data = bytearray(b"\x00")
+        self._offsets = array(_OFFSET_TYPE, [0])
+        self.extend(paths)
+
+    @classmethod
+    def from_bytes(cls, datas):
+        """
+        Args:
+            datas (Iterable[bytes]): The encoded paths
+        Returns:
+            FsnArray
+        Raises:
+            TypeError: If an item isn't `bytes`
+            ValueError: If an item isn't a valid encoded path
+
+        Creates a new array from paths encoded like :func:`fsn2bytes` does
+        with ``utf-8``.
+        """
+
+        paths = cls()
+        paths.extend_bytes(datas)
+        return paths
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __repr__(self):
+        return "<%s len=%d nbytes=%d>" % (
+            type(self).__name__, len(self), self.nbytes)
+
+    def __eq__(self, other):
+        if not isinstance(other, FsnArray):
+            return NotImplemented
+        return self._data == other._data
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    @property
+    def nbytes(self):
+        """`int`: The memory used by the path buffer and the offsets"""
+
+        return len(self._data) + \
+            len(self._offsets) * self._offsets.itemsize
+
+    def _get_bytes(self, index):
+        offsets = self._offsets
+        return bytes(self._data[offsets[index] + 1:offsets[index + 1]])
+
+    def _index(self, index):
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("index out of range")
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return FsnArray._from_encoded(
+                [self._get_bytes(i) for i in range(*index.indices(len(self)))])
+        return bytes2fsn(self._get_bytes(self._index(index)), "utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield bytes2fsn(self._get_bytes(i), "utf-8")
+
+    def get_bytes(self, index):
+        """
+        Args:
+            index (int): The index of the path
+        Returns:
+            `bytes`
+        Raises:
+            IndexError
+
+        Returns the encoded path without converting it to a `fsnative`
+        first.
+        """
+
+        return self._get_bytes(self._index(index))
+
+    @classmethod
+    def _from_encoded(cls, datas):
+        # no validation, only for data taken from another array
+        paths = cls()
+        paths._append_encoded(datas)
+        return paths
+
+    def _append_encoded(self, datas):
+        if not datas:
+            return
+        data = self._data
+        offsets = self._offsets
+        pos = len(data) - 1
+        for item in datas:
+            pos += len(item) + 1
+            offsets.append(pos)
+        data += b"\x00".join(datas)
+        data += b"\x00"
+
+    def append(self, path):
+        """
+        Args:
+            path (pathlike): The path to add
+        Raises:
+            TypeError: In case the path can't be converted to a `fsnative`
+            ValueError: In case the conversion fails
+        """
+
+        self._append_encoded([fsn2bytes(path2fsn(path), "utf-8")])
+
+    def extend(self, paths):
+        """
+        Args:
+            paths (Iterable[pathlike]): The paths to add
+        Raises:
+            TypeError: In case a path can't be converted to a `fsnative`
+            ValueError: In case a conversion fails
+
+        Nothing gets added in case of an error.
+        """
+
+        self._append_encoded(fsns2bytes(paths2fsn(paths), "utf-8"))
+
+    def extend_bytes(self, datas):
+        """
+        Args:
+            datas (Iterable[bytes]): The encoded paths to add
+        Raises:
+            TypeError: If an item isn't `bytes`
+            ValueError: If an item isn't a valid encoded path
+
+        Like :meth:`extend` but takes paths encoded like :func:`fsn2bytes`
+        does with ``utf-8``. Under Unix no decoding is needed and all paths
+        are checked for NUL bytes at once.
+
+        Nothing gets added in case of an error.
+        """
+
+        datas = list(datas)
+        if not datas:
+            return
+        if is_unix:
+            for index, data in enumerate(datas):
+                if not isinstance(data, bytes):
+                    # let bytes2fsn() create the error
+                    try:
+                        bytes2fsn(data)
+                    except (TypeError, ValueError) as e:
+                        raise _batch_error(index, e)
+            joined = b"\x00".join(datas)
+            if joined.count(b"\x00") != len(datas) - 1:
+                # find the offending one for the error message
+                for index, data in enumerate(datas):
+                    if b"\x00" in data:
+                        raise _batch_error(
+                            index, ValueError("contains nulls"))
+            self._data += joined
+            self._data += b"\x00"
+            pos = len(self._data) - len(joined) - 2
+            offsets = self._offsets
+            for data in datas:
+                pos += len(data) + 1
+                offsets.append(pos)
+        else:
+            # decode and encode again, so the content is normalized
+            self._append_encoded(
+                fsns2bytes(bytes2fsns(datas, "utf-8"), "utf-8"))
+
+    def _split(self, errors):
+        if not len(self):
+            return []
+        data = self._data
+        if is_unix and PY2:
+            return bytes(data[1:-1]).split(b"\x00")
+        elif not is_unix or _encoding in _SPLIT_ENCODINGS:
+            return data[1:-1].decode(
+                "utf-8" if not is_unix else _encoding,
+                errors).split(u"\x00")
+        else:
+            return None
+
+    def to_list(self):
+        """
+        Returns:
+            List[`fsnative`]
+
+        Converts all paths to `fsnative` at once.
+        """
+
+        if is_unix:
+            result = self._split("surrogateescape")
+        else:
+            result = self._split("surrogatepass")
+        if result is None:
+            result = list(self)
+        return result
+
+    def to_text(self, strict=False):
+        """
+        Args:
+            strict (bool): Fail in case a conversion is not reversible
+        Returns:
+            List[`text`]
+        Raises:
+            ValueError: In case ``strict`` was True and a conversion failed
+
+        Like :func:`fsn2text` for all paths at once.
+        """
+
+        result = None
+        if is_unix and PY3:
+            try:
+                result = self._split("strict" if strict else "replace")
+            except UnicodeDecodeError:
+                # let fsns2text() create the error
+                pass
+        if result is None:
+            result = fsns2text(self.to_list(), strict)
+        return result
+
+    def to_uri(self):
+        """
+        Returns:
+            List[`text`]
+        Raises:
+            ValueError: If a path can't be converted
+
+        Like :func:`fsn2uri` for all paths at once.
+        """
+
+        if not is_unix or not len(self):
+            return [fsn2uri(p) for p in self]
+
+        # NUL gets quoted to %00 and % to %25, so we can split afterwards
+        quoted = quote(bytes(self._data[1:-1]), "/:@&=+$,")
+        if PY2:
+            quoted = quoted.decode("ascii")
+        return [u"file://" + p for p in quoted.split(u"%00")]
+
+    def _find_all(self, needle):
+        data = self._data
+        find = data.find
+        pos = find(needle)
+        while pos != -1:
+            yield pos
+            pos = find(needle, pos + 1)
+
+    def _select(self, indices):
+        return FsnArray._from_encoded([self._get_bytes(i) for i in indices])
+
+    def filter_prefix(self, prefix):
+        """
+        Args:
+            prefix (pathlike): The path prefix
+        Returns:
+            FsnArray
+        Raises:
+            TypeError: In case the prefix can't be converted to a `fsnative`
+            ValueError: In case the conversion fails
+
+        Returns a new array with all paths starting with *prefix*. The prefix
+        is compared as encoded bytes, without looking at path boundaries.
+        The buffer is searched as a whole, so this is fast if only few paths
+        match.
+        """
+
+        needle = b"\x00" + fsn2bytes(path2fsn(prefix), "utf-8")
+        offsets = self._offsets
+        last = len(self)
+        indices = []
+        for pos in self._find_all(needle):
+            # the NUL before each path is at its offset
+            index = bisect_left(offsets, pos)
+            if index < last:
+                indices.append(index)
+        return self._select(indices)
+
+    def filter_suffix(self, suffix):
+        """
+        Args:
+            suffix (pathlike): The path suffix
+        Returns:
+            FsnArray
+        Raises:
+            TypeError: In case the suffix can't be converted to a `fsnative`
+            ValueError: In case the conversion fails
+
+        Like :meth:`filter_prefix` but for paths ending with *suffix*.
+        """
+
+        suffix = fsn2bytes(path2fsn(suffix), "utf-8")
+        needle = suffix + b"\x00"
+        offsets = self._offsets
+        indices = []
+        for pos in self._find_all(needle):
+            # the NUL after each path is at the offset of the next one
+            index = bisect_left(offsets, pos + len(suffix)) - 1
+            if index >= 0:
+                indices.append(index)
+        return self._select(indices)
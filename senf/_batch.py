@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from . import _instrument
+from ._compat import PY3
+from ._fsnative import is_unix, _encoding, path2fsn, fsn2bytes, bytes2fsn, \
+    fsn2text, _fspath, _is_normalized
+
+
+def _batch_error(index, error):
+    """Returns a new TypeError or ValueError for the item at *index*.
+
+    The error message of *error* gets prefixed with the index and the index
+    is available as ``index`` attribute.
+    """
+
+    if isinstance(error, TypeError):
+        new_error = TypeError("item %d: %s" % (index, error))
+    else:
+        new_error = ValueError("item %d: %s" % (index, error))
+    new_error.index = index
+    return new_error
+
+
+@_instrument.instrumented
+def paths2fsn(paths):
+    """
+    Args:
+        paths (Iterable[pathlike]): The paths to convert
+    Returns:
+        List[`fsnative`]
+    Raises:
+        TypeError: In case a path can't be converted to a `fsnative`
+        ValueError: In case a conversion fails
+
+    Like :func:`path2fsn` but for many paths at once.
+
+    In case of an error the message contains the index of the failing path,
+    which is also available as ``index`` attribute of the exception.
+    """
+
+    paths = iter(paths)
+    result = []
+    append = result.append
+    index = 0
+
+    if PY3 and is_unix:
+        fspath = _fspath
+        is_normalized = _is_normalized
+        encoding = _encoding
+        try:
+            for index, path in enumerate(paths):
+                path = fspath(path)
+                if isinstance(path, bytes):
+                    # "0 in" is a lot faster than 'b"\x00" in' on Python 3
+                    if 0 in path:
+                        raise ValueError("embedded null")
+                    append(path.decode(encoding, "surrogateescape"))
+                elif type(path) is str and is_normalized(path):
+                    append(path)
+                elif isinstance(path, str):
+                    data = path.encode(encoding, "surrogateescape")
+                    if 0 in data:
+                        raise ValueError("embedded null")
+                    append(data.decode(encoding, "surrogateescape"))
+                else:
+                    raise TypeError("path needs to be str")
+        except (TypeError, ValueError) as e:
+            raise _batch_error(index, e)
+    else:
+        try:
+            for index, path in enumerate(paths):
+                append(path2fsn(path))
+        except (TypeError, ValueError) as e:
+            raise _batch_error(index, e)
+
+    return result
+
+
+@_instrument.instrumented
+def fsns2bytes(paths, encoding="utf-8"):
+    """
+    Args:
+        paths (Iterable[fsnative]): The paths to convert
+        encoding (`str`): encoding used for Windows
+    Returns:
+        List[`bytes`]
+    Raises:
+        TypeError: If a path isn't a `fsnative`
+        ValueError: If encoding fails or the encoding is invalid
+
+    Like :func:`fsn2bytes` but for many paths at once.
+
+    In case of an error the message contains the index of the failing path,
+    which is also available as ``index`` attribute of the exception.
+    """
+
+    paths = iter(paths)
+    result = []
+    append = result.append
+    index = 0
+
+    if PY3 and is_unix:
+        encode = str.encode
+        fs_encoding = _encoding
+        try:
+            for index, path in enumerate(paths):
+                if not isinstance(path, str):
+                    raise TypeError(
+                        "path needs to be str, not %s" % type(path).__name__)
+                data = encode(path, fs_encoding, "surrogateescape")
+                if 0 in data:
+                    raise TypeError("fsnative can't contain nulls")
+                append(data)
+        except UnicodeEncodeError:
+            raise _batch_error(index, TypeError(
+                "path contained Unicode code points not valid in "
+                "the current path encoding"))
+        except (TypeError, ValueError) as e:
+            raise _batch_error(index, e)
+    else:
+        try:
+            for index, path in enumerate(paths):
+                append(fsn2bytes(path, encoding))
+        except (TypeError, ValueError) as e:
+            raise _batch_error(index, e)
+
+    return result
+
+
+@_instrument.instrumented
+def bytes2fsns(datas, encoding="utf-8"):
+    """
+    Args:
+        datas (Iterable[bytes]): The data to convert
+        encoding (`str`): encoding used for Windows
+    Returns:
+        List[`fsnative`]
+    Raises:
+        TypeError: If an item isn't `bytes` or a buffer
+        ValueError: If decoding fails or the encoding is invalid
+
+    Like :func:`bytes2fsn` but for many paths at once.
+
+    In case of an error the message contains the index of the failing item,
+    which is also available as ``index`` attribute of the exception.
+    """
+
+    datas = iter(datas)
+    result = []
+    append = result.append
+    index = 0
+
+    if PY3 and is_unix:
+        fs_encoding = _encoding
+        try:
+            for index, data in enumerate(datas):
+                if not isinstance(data, bytes):
+                    append(bytes2fsn(data, encoding))
+                    continue
+                if 0 in data:
+                    raise ValueError("contains nulls")
+                append(data.decode(fs_encoding, "surrogateescape"))
+        except (TypeError, ValueError) as e:
+            raise _batch_error(index, e)
+    else:
+        try:
+            for index, data in enumerate(datas):
+                append(bytes2fsn(data, encoding))
+        except (TypeError, ValueError) as e:
+            raise _batch_error(index, e)
+
+    return result
+
+
+@_instrument.instrumented
+def fsns2text(paths, strict=False):
+    """
+    Args:
+        paths (Iterable[fsnative]): The paths to convert
+        strict (bool): Fail in case a conversion is not reversible
+    Returns:
+        List[`text`]
+    Raises:
+        TypeError: If a path isn't a `fsnative`
+        ValueError: In case ``strict`` was True and a conversion failed
+
+    Like :func:`fsn2text` but for many paths at once.
+
+    In case of an error the message contains the index of the failing path,
+    which is also available as ``index`` attribute of the exception.
+    """
+
+    paths = iter(paths)
+    result = []
+    append = result.append
+    index = 0
+
+    if PY3 and is_unix:
+        encode = str.encode
+        is_normalized = _is_normalized
+        fs_encoding = _encoding
+        errors = "strict" if strict else "replace"
+        try:
+            for index, path in enumerate(paths):
+                if type(path) is str and is_normalized(path):
+                    # decoding would give back the same text
+                    append(path)
+                    continue
+                if not isinstance(path, str):
+                    raise TypeError(
+                        "path needs to be str, not %s" % type(path).__name__)
+                data = encode(path, fs_encoding, "surrogateescape")
+                if 0 in data:
+                    raise TypeError("fsnative can't contain nulls")
+                append(data.decode(fs_encoding, errors))
+        except UnicodeEncodeError:
+            raise _batch_error(index, TypeError(
+                "path contained Unicode code points not valid in "
+                "the current path encoding"))
+        except (TypeError, ValueError) as e:
+            raise _batch_error(index, e)
+    else:
+        try:
+            for index, path in enumerate(paths):
+                append(fsn2text(path, strict))
+        except (TypeError, ValueError) as e:
+            raise _batch_error(index, e)
+
+    return result
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import threading
+from collections import OrderedDict, namedtuple
+
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+class LRUCache(object):
+    """A thread-safe mapping which holds at most *maxsize* entries and
+    drops the least recently used one if full.
+    """
+
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError("maxsize needs to be at least 1")
+        self._maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                self._misses += 1
+                return default
+            self._data[key] = value
+            self._hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            data = self._data
+            data.pop(key, None)
+            data[key] = value
+            if len(data) > self._maxsize:
+                data.popitem(last=False)
+                self._evictions += 1
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions,
+                             self._maxsize, len(self._data))
+
+
+# The active caches, looked up by the converters on each call. None if
+# caching is disabled.
+norm_cache = None
+text_cache = None
+uri_cache = None
+
+
+def enable_cache(maxsize=1024):
+    """
+    Args:
+        maxsize (int): The maximum number of results to keep per function
+    Raises:
+        ValueError: In case maxsize is smaller than 1
+
+    Enables caching of the results of :func:`fsn2norm`, :func:`fsn2text` and
+    :func:`fsn2uri` for the current process.
+
+    Each function gets its own cache which holds the *maxsize* most recently
+    used results. Calling this again replaces the existing caches with new
+    empty ones. The caches are safe to use from multiple threads.
+
+    Only worth it if the same paths get converted over and over again.
+    """
+
+    global norm_cache, text_cache, uri_cache
+
+    norm_cache = LRUCache(maxsize)
+    text_cache = LRUCache(maxsize)
+    uri_cache = LRUCache(maxsize)
+
+
+def disable_cache():
+    """Disables and clears the caches enabled by :func:`enable_cache`"""
+
+    global norm_cache, text_cache, uri_cache
+
+    norm_cache = text_cache = uri_cache = None
+
+
+def cache_info():
+    """
+    Returns:
+        Dict[`str`, CacheInfo]: The cache statistics per function name or
+        an empty dict if caching is disabled.
+
+    Each ``CacheInfo`` is a named tuple containing ``hits``, ``misses``,
+    ``evictions``, ``maxsize`` and ``currsize``.
+    """
+
+    info = {}
+    for name, cache in [("fsn2norm", norm_cache), ("fsn2text", text_cache),
+                        ("fsn2uri", uri_cache)]:
+        if cache is not None:
+            info[name] = cache.info()
+    return info
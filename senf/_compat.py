@@ -32,6 +32,7 @@ if PY2:
     urlparse, urlunparse
     from urllib import quote, unquote
     quote, unquote
+    unquote_to_bytes = unquote
 
     from StringIO import StringIO
     BytesIO = StringIO
@@ -40,11 +41,16 @@ if PY2:
 
     string_types = (str, unicode)
     text_type = unicode
+    integer_types = (int, long)
 
     iteritems = lambda d: d.iteritems()
+
+    import Queue as queue
+    queue
 elif PY3:
-    from urllib.parse import urlparse, quote, unquote, urlunparse
-    urlparse, quote, unquote, urlunparse
+    from urllib.parse import urlparse, quote, unquote, urlunparse, \
+        unquote_to_bytes
+    urlparse, quote, unquote, urlunparse, unquote_to_bytes
 
     from io import StringIO
     StringIO = StringIO
@@ -54,5 +60,9 @@ elif PY3:
 
     string_types = (str,)
     text_type = str
+    integer_types = (int,)
 
     iteritems = lambda d: iter(d.items())
+
+    import queue
+    queue
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from ._compat import PY3, quote
+from ._fsnative import is_unix, is_win, _encoding, _normalize_codec, \
+    _fsn2native, _is_normalized, _merge_surrogates, _surrogatepass, \
+    fsn2bytes, bytes2fsn, fsn2text, fsn2uri
+
+if PY3:
+    from . import _wtf
+
+
+def _get_encoder(codec):
+    """Returns a function encoding a Windows path with the given codec, like
+    fsn2bytes() does.
+    """
+
+    if codec == "utf-8":
+        wtf_encode = _wtf.wtf8_encode
+        return lambda path: wtf_encode(path)[0]
+    elif codec == "utf-16-le":
+        wtf_encode = _wtf.wtf16le_encode
+        return lambda path: wtf_encode(path)[0]
+    elif codec.startswith("utf-16"):
+        # utf-16 merges surrogate pairs anyway
+        return lambda path: path.encode(codec, _surrogatepass)
+
+    def encode(path):
+        try:
+            return path.encode(codec)
+        except UnicodeEncodeError:
+            return _merge_surrogates(path).encode(codec, _surrogatepass)
+
+    return encode
+
+
+class Converter(object):
+    """Converter(encoding="utf-8")
+
+    Args:
+        encoding (`str`): encoding used for Windows
+    Raises:
+        ValueError: If the encoding is invalid
+
+    Converts paths like :func:`fsn2bytes`, :func:`bytes2fsn`,
+    :func:`fsn2text` and :func:`fsn2uri` with the same results, but looks
+    up *encoding* only once. Useful for converting many paths with the same
+    encoding.
+
+    Unlike the functions, the methods don't use the caches enabled by
+    :func:`enable_cache` and don't show up in :func:`stats`.
+    """
+
+    def __init__(self, encoding="utf-8"):
+        try:
+            codec = _normalize_codec(encoding)
+        except (LookupError, TypeError):
+            raise ValueError("invalid encoding %r" % encoding)
+
+        self.encoding = encoding
+        self._codec = codec
+        self._encode = _get_encoder(codec) if is_win and PY3 else None
+
+    if PY3 and is_unix:
+        def to_bytes(self, path):
+            """
+            Args:
+                path (fsnative): The path to convert
+            Returns:
+                `bytes`
+            Raises:
+                TypeError: If no `fsnative` path is passed
+                ValueError: If encoding fails
+
+            Like :func:`fsn2bytes`
+            """
+
+            if type(path) is str:
+                try:
+                    data = path.encode(_encoding, "surrogateescape")
+                except UnicodeEncodeError:
+                    pass
+                else:
+                    if 0 not in data:
+                        return data
+            # raises the right error, or handles str subclasses
+            return _fsn2native(path)
+
+        def from_bytes(self, data):
+            """
+            Args:
+                data (bytes): The data to convert
+            Returns:
+                `fsnative`
+            Raises:
+                TypeError: If no `bytes` path is passed
+                ValueError: If decoding fails
+
+            Like :func:`bytes2fsn`
+            """
+
+            if type(data) is bytes and 0 not in data:
+                return data.decode(_encoding, "surrogateescape")
+            return bytes2fsn(data, self.encoding)
+
+        def to_text(self, path, strict=False):
+            """
+            Args:
+                path (fsnative): The path to convert
+                strict (bool): Fail in case the conversion is not reversible
+            Returns:
+                `text`
+            Raises:
+                TypeError: In case no `fsnative` has been passed
+                ValueError: In case ``strict`` was True and the conversion
+                    failed
+
+            Like :func:`fsn2text`
+            """
+
+            # a normalized path decodes to itself
+            if type(path) is str and _is_normalized(path):
+                return path
+            return _fsn2native(path).decode(
+                _encoding, "strict" if strict else "replace")
+
+        def to_uri(self, path):
+            """
+            Args:
+                path (fsnative): The path to convert to an URI
+            Returns:
+                `text`: An ASCII only URI
+            Raises:
+                TypeError: If no `fsnative` was passed
+                ValueError: If the path can't be converted
+
+            Like :func:`fsn2uri`
+            """
+
+            return u"file://" + quote(self.to_bytes(path), "/:@&=+$,")
+    else:
+        # the same methods, mostly delegating to the functions
+
+        def to_bytes(self, path):
+            encode = self._encode
+            if encode is None:
+                return fsn2bytes(path, self.encoding)
+            return encode(_fsn2native(path))
+
+        def from_bytes(self, data):
+            if is_win and PY3 and type(data) is bytes:
+                path = data.decode(self._codec, _surrogatepass)
+                if u"\x00" in path:
+                    raise ValueError("contains nulls")
+                return path
+            return bytes2fsn(data, self.encoding)
+
+        def to_text(self, path, strict=False):
+            return fsn2text(path, strict)
+
+        def to_uri(self, path):
+            return fsn2uri(path)
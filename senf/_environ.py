@@ -30,6 +30,7 @@ except ImportError:
 from ._compat import text_type, PY2
 from ._fsnative import path2fsn, is_win, _fsn2legacy, fsnative
 from . import _winapi as winapi
+from . import _instrument
 
 
 def get_windows_env_var(key):
@@ -207,6 +208,7 @@ class Environ(abc.MutableMapping):
 environ = Environ()
 
 
+@_instrument.instrumented
 def getenv(key, value=None):
     """Like `os.getenv` but returns unicode under Windows + Python 2
 
@@ -224,6 +226,7 @@ def getenv(key, value=None):
     return os.getenv(key, value)
 
 
+@_instrument.instrumented
 def unsetenv(key):
     """Like `os.unsetenv` but takes unicode under Windows + Python 2
 
@@ -242,6 +245,7 @@ def unsetenv(key):
         os.unsetenv(key)
 
 
+@_instrument.instrumented
 def putenv(key, value):
     """Like `os.putenv` but takes unicode under Windows + Python 2
 
@@ -21,12 +21,19 @@
 # SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 
 import os
+import re
 import sys
 import ctypes
 import codecs
 
 from . import _winapi as winapi
-from ._compat import text_type, PY3, PY2, urlparse, quote, unquote, urlunparse
+from . import _cache
+from . import _instrument
+from ._compat import text_type, PY3, PY2, urlparse, quote, unquote, \
+    unquote_to_bytes
+
+if PY3:
+    from . import _wtf
 
 
 is_win = os.name == "nt"
@@ -35,6 +42,8 @@ is_darwin = sys.platform == "darwin"
 
 _surrogatepass = "strict" if PY2 else "surrogatepass"
 
+_search_surrogate = re.compile(u"[\ud800-\udfff]").search
+
 
 def _normalize_codec(codec, _cache={}):
     """Raises LookupError"""
@@ -87,11 +96,29 @@ def _decode_surrogatepass(data, codec):
 def _merge_surrogates(text):
     """Returns a copy of the text with all surrogate pairs merged"""
 
+    if _search_surrogate(text) is None:
+        return text
+
+    if PY3:
+        return _wtf.merge_surrogates(text)
+
     return _decode_surrogatepass(
         text.encode("utf-16-le", _surrogatepass),
         "utf-16-le")
 
 
+def _wide2text(text, errors):
+    """Returns the text with surrogate pairs merged and lone surrogates
+    handled according to *errors*, like a utf-16-le round trip.
+    """
+
+    if _search_surrogate(text) is None:
+        return text
+    return text.encode("utf-16-le", _surrogatepass).decode(
+        "utf-16-le", errors)
+
+
+@_instrument.instrumented
 def fsn2norm(path):
     """
     Args:
@@ -115,14 +142,27 @@ def fsn2norm(path):
     input.
     """
 
+    if PY3 and is_unix and type(path) is str and _is_normalized(path):
+        return path
+
+    cache = _cache.norm_cache
+    if cache is not None:
+        result = cache.get(path)
+        if result is not None:
+            return result
+
     native = _fsn2native(path)
 
     if is_win:
-        return _merge_surrogates(native)
+        result = _merge_surrogates(native)
     elif PY3:
-        return bytes2fsn(native, None)
+        result = native.decode(_encoding, "surrogateescape")
     else:
-        return path
+        result = path
+
+    if cache is not None:
+        cache.put(path, result)
+    return result
 
 
 def _fsn2legacy(path):
@@ -156,9 +196,11 @@ def _fsnative(text):
         try:
             path = text.encode(encoding, _surrogatepass)
         except UnicodeEncodeError:
+            _instrument.fallback()
             path = text.encode("utf-8", _surrogatepass)
 
         if b"\x00" in path:
+            _instrument.fallback()
             path = path.replace(b"\x00", fsn2bytes(_fsnative(u"\uFFFD"), None))
 
         if PY3:
@@ -166,11 +208,15 @@ def _fsnative(text):
         return path
     else:
         if u"\x00" in text:
+            _instrument.fallback()
             text = text.replace(u"\x00", u"\uFFFD")
         text = fsn2norm(text)
         return text
 
 
+_fsnative = _instrument.instrumented(_fsnative, "fsnative")
+
+
 def _create_fsnative(type_):
     # a bit of magic to make fsnative(u"foo") and isinstance(path, fsnative)
     # work
@@ -292,7 +338,10 @@ def _fsn2native(path):
                     "the current path encoding. To create a valid "
                     "path from Unicode use text2fsn()")
 
-        if b"\x00" in path:
+            # "0 in" is a lot faster than 'b"\x00" in' on Python 3
+            if 0 in path:
+                raise TypeError("fsnative can't contain nulls")
+        elif b"\x00" in path:
             raise TypeError("fsnative can't contain nulls")
     else:
         if u"\x00" in path:
@@ -301,6 +350,30 @@ def _fsn2native(path):
     return path
 
 
+def _is_normalized(path):
+    """
+    Args:
+        path (str)
+    Returns:
+        bool: if path is a normalized fsnative (Py3 + Unix only)
+
+    Only detects the common cases without encoding the path, so a False
+    result doesn't mean the path isn't normalized. Pure ASCII is normalized
+    with every ASCII compatible encoding and with utf-8 every text without
+    surrogates round trips unchanged.
+    """
+
+    if u"\x00" in path:
+        return False
+    if _isascii is not None and _ascii_compatible and _isascii(path):
+        return True
+    if _encoding == "utf-8":
+        # surrogates aren't printable, and checking is a lot cheaper than
+        # searching for them with a regex.
+        return path.isprintable()
+    return False
+
+
 def _get_encoding():
     """The encoding used for paths, argv, environ, stdout and stdin"""
 
@@ -318,7 +391,21 @@ def _get_encoding():
 
 _encoding = _get_encoding()
 
+if PY3:
+    _isascii = getattr(str, "isascii", None)
+    _ascii_compatible = bytes(bytearray(range(128))).decode(
+        _encoding, "replace") == u"".join(map(chr, range(128)))
+else:
+    _isascii = None
+    _ascii_compatible = False
 
+# if the path encoding is utf-8, checked in hot paths
+_utf8 = _encoding == "utf-8"
+
+_fspath = getattr(os, "fspath", lambda x: x)
+
+
+@_instrument.instrumented
 def path2fsn(path):
     """
     Args:
@@ -343,18 +430,20 @@ def path2fsn(path):
         if "\x00" in path:
             raise ValueError("embedded null")
     else:
-        path = getattr(os, "fspath", lambda x: x)(path)
+        path = _fspath(path)
         if isinstance(path, bytes):
-            if b"\x00" in path:
+            # "0 in" is a lot faster than 'b"\x00" in' on Python 3
+            if 0 in path:
                 raise ValueError("embedded null")
             path = path.decode(_encoding, "surrogateescape")
         elif is_unix and isinstance(path, str):
-            # make sure we can encode it and this is not just some random
-            # unicode string
-            data = path.encode(_encoding, "surrogateescape")
-            if b"\x00" in data:
-                raise ValueError("embedded null")
-            path = fsn2norm(path)
+            if type(path) is not str or not _is_normalized(path):
+                # make sure we can encode it and this is not just some random
+                # unicode string
+                data = path.encode(_encoding, "surrogateescape")
+                if 0 in data:
+                    raise ValueError("embedded null")
+                path = data.decode(_encoding, "surrogateescape")
         else:
             if u"\x00" in path:
                 raise ValueError("embedded null")
@@ -366,6 +455,7 @@ def path2fsn(path):
     return path
 
 
+@_instrument.instrumented
 def fsn2text(path, strict=False):
     """
     Args:
@@ -389,17 +479,53 @@ def fsn2text(path, strict=False):
     Encoding with a Unicode encoding will always succeed with the result.
     """
 
-    path = _fsn2native(path)
+    native = None
+    if PY3 and is_unix and type(path) is str:
+        # _is_normalized() inlined, so that paths which aren't normalized
+        # only get scanned up to the first surrogate before encoding
+        if _isascii is not None and _ascii_compatible and _isascii(path):
+            if u"\x00" not in path:
+                # decoding would give back the same text
+                return path
+        elif _utf8:
+            # NUL and surrogates aren't printable
+            if path.isprintable():
+                return path
+            try:
+                native = path.encode("utf-8", "surrogateescape")
+            except UnicodeEncodeError:
+                # let _fsn2native() raise
+                pass
+            else:
+                if 0 in native:
+                    native = None
+                elif _cache.text_cache is None:
+                    return native.decode(
+                        "utf-8", "strict" if strict else "replace")
+
+    cache = _cache.text_cache
+    if cache is not None:
+        key = (path, strict)
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+    if native is None:
+        native = _fsn2native(path)
 
     errors = "strict" if strict else "replace"
 
     if is_win:
-        return path.encode("utf-16-le", _surrogatepass).decode("utf-16-le",
-                                                               errors)
+        result = _wide2text(native, errors)
     else:
-        return path.decode(_encoding, errors)
+        result = native.decode(_encoding, errors)
+
+    if cache is not None:
+        cache.put(key, result)
+    return result
 
 
+@_instrument.instrumented
 def text2fsn(text):
     """
     Args:
@@ -417,6 +543,7 @@ def text2fsn(text):
     return fsnative(text)
 
 
+@_instrument.instrumented
 def fsn2bytes(path, encoding="utf-8"):
     """
     Args:
@@ -452,13 +579,24 @@ def fsn2bytes(path, encoding="utf-8"):
                 raise ValueError("invalid encoding %r" % encoding)
         else:
             try:
-                return path.encode(encoding)
+                codec = _normalize_codec(encoding)
             except LookupError:
                 raise ValueError("invalid encoding %r" % encoding)
+
+            if codec == "utf-8":
+                # WTF-8, merges surrogate pairs and encodes lone surrogates
+                # in one go
+                return _wtf.wtf8_encode(path)[0]
+            elif codec == "utf-16-le":
+                return _wtf.wtf16le_encode(path)[0]
+
+            try:
+                return path.encode(encoding)
             except UnicodeEncodeError:
                 # Fallback implementation for text including surrogates
                 # merge surrogate codepoints
-                if _normalize_codec(encoding).startswith("utf-16"):
+                _instrument.fallback()
+                if codec.startswith("utf-16"):
                     # fast path, utf-16 merges anyway
                     return path.encode(encoding, _surrogatepass)
                 return _merge_surrogates(path).encode(encoding, _surrogatepass)
@@ -466,6 +604,7 @@ def fsn2bytes(path, encoding="utf-8"):
         return path
 
 
+@_instrument.instrumented
 def bytes2fsn(data, encoding="utf-8"):
     """
     Args:
@@ -484,10 +623,13 @@ def bytes2fsn(data, encoding="utf-8"):
 
     For Windows paths ``WTF-8`` is accepted if ``utf-8`` is used and
     ``WTF-16`` accepted if ``utf-16-le`` is used.
+
+    Other objects supporting the buffer protocol, like `bytearray` or
+    `memoryview`, are passed to :func:`buffer2fsn`.
     """
 
     if not isinstance(data, bytes):
-        raise TypeError("data needs to be bytes")
+        return buffer2fsn(data, encoding)
 
     if is_win:
         if encoding is None:
@@ -508,6 +650,146 @@ def bytes2fsn(data, encoding="utf-8"):
             return data.decode(_encoding, "surrogateescape")
 
 
+@_instrument.instrumented
+def buffer2fsn(buffer, encoding="utf-8", start=0, end=None):
+    """
+    Args:
+        buffer (object): An object supporting the buffer protocol, like
+            `bytes`, `bytearray` or `memoryview`
+        encoding (`str`): encoding used for Windows
+        start (int): The offset of the path in the buffer
+        end (int or None): The end of the path in the buffer, or `None`
+    Returns:
+        `fsnative`
+    Raises:
+        TypeError: If *buffer* doesn't support the buffer protocol
+        ValueError: If decoding fails or the encoding is invalid
+
+    Like :func:`bytes2fsn` but decodes *buffer[start:end]* directly without
+    copying the data to `bytes` first (except under Python 2, where the
+    result is `bytes`).
+    """
+
+    try:
+        view = memoryview(buffer)
+    except TypeError:
+        raise TypeError("buffer needs to support the buffer protocol")
+
+    if PY2:
+        return bytes2fsn(view.tobytes()[start:end], encoding)
+
+    if view.itemsize != 1 or view.ndim != 1:
+        try:
+            view = view.cast("B")
+        except TypeError:
+            raise TypeError("buffer needs to be C-contiguous")
+    view = view[start:end]
+
+    if is_win:
+        if encoding is None:
+            raise ValueError("invalid encoding %r" % encoding)
+        try:
+            path = str(view, encoding, _surrogatepass)
+        except LookupError:
+            raise ValueError("invalid encoding %r" % encoding)
+    else:
+        path = str(view, _encoding, "surrogateescape")
+        if not _ascii_compatible:
+            # a decoded NUL doesn't have to come from a NUL byte
+            if 0 in view.tobytes():
+                raise ValueError("contains nulls")
+            return path
+
+    # checking the result saves a copy of the buffer
+    if u"\x00" in path:
+        raise ValueError("contains nulls")
+    return path
+
+
+@_instrument.instrumented
+def fsn2buffer(path, buffer, encoding="utf-8"):
+    """
+    Args:
+        path (fsnative): The path to convert
+        buffer (bytearray): The buffer to append to
+        encoding (`str`): encoding used for Windows
+    Returns:
+        `int`: The number of bytes appended
+    Raises:
+        TypeError: If no `fsnative` path or no `bytearray` is passed
+        ValueError: If encoding fails or the encoding is invalid
+
+    Like :func:`fsn2bytes` but appends the result to *buffer*. Useful for
+    building up a buffer of many paths without joining them afterwards.
+    """
+
+    if not isinstance(buffer, bytearray):
+        raise TypeError("buffer needs to be a bytearray")
+
+    data = fsn2bytes(path, encoding)
+    buffer += data
+    return len(data)
+
+
+# stripped from the start by urlsplit()
+_C0_CONTROL_OR_SPACE = "".join(map(chr, range(0x21)))
+
+
+def _split_file_uri(uri):
+    """Returns the part of a file URI following the scheme, the same as
+    ``urlunparse(urlparse(uri))[5:]`` with leading slashes of a relative
+    path removed and an empty authority dropped.
+
+    Raises ValueError in case it's not a file URI.
+    """
+
+    stripped = uri.lstrip(_C0_CONTROL_OR_SPACE)
+    if "\t" in stripped or "\r" in stripped or "\n" in stripped:
+        stripped = stripped.replace(
+            "\t", "").replace("\r", "").replace("\n", "")
+
+    # the scheme is case insensitive
+    if stripped[:5].lower() != "file:":
+        raise ValueError("Not a file URI: %r" % uri)
+    rest = stripped[5:]
+
+    netloc = ""
+    if rest[:2] == "//":
+        end = len(rest)
+        for c in "/?#":
+            pos = rest.find(c, 2)
+            if pos != -1 and pos < end:
+                end = pos
+        netloc = rest[2:end]
+        rest = rest[end:]
+        if netloc:
+            # let urlparse validate IPv6 and non-ASCII hosts
+            urlparse(stripped)
+
+    query = fragment = ""
+    if "#" in rest:
+        rest, fragment = rest.split("#", 1)
+    if "?" in rest:
+        rest, query = rest.split("?", 1)
+
+    if not rest:
+        raise ValueError("Invalid file URI: %r" % uri)
+
+    if netloc:
+        rest = "//" + netloc + rest
+    elif rest[:3] == "///":
+        rest = rest[2:]
+
+    # like urlunparse(), drop empty query and fragment delimiters
+    if query:
+        rest += "?" + query
+    if fragment:
+        rest += "#" + fragment
+
+    return rest
+
+
+@_instrument.instrumented
 def uri2fsn(uri):
     """
     Args:
@@ -530,22 +812,7 @@ def uri2fsn(uri):
         if not isinstance(uri, str):
             raise TypeError("uri needs to be str")
 
-    parsed = urlparse(uri)
-    scheme = parsed.scheme
-    netloc = parsed.netloc
-    parsed_path = parsed.path
-
-    if scheme != "file":
-        raise ValueError("Not a file URI: %r" % uri)
-
-    if not parsed_path:
-        raise ValueError("Invalid file URI: %r" % uri)
-
-    uri = urlunparse(parsed)[5:]
-    if not parsed_path.startswith("/") and uri.startswith("/"):
-        uri = uri.lstrip("/")
-    if not netloc and uri.startswith("///"):
-        uri = uri[2:]
+    uri = _split_file_uri(uri)
 
     if is_win:
         try:
@@ -568,6 +835,11 @@ def uri2fsn(uri):
     else:
         if PY2:
             path = unquote(uri)
+        elif "%" not in uri:
+            path = uri
+        elif _isascii is not None and _isascii(uri):
+            # same as unquote() for ASCII, but without splitting the text
+            path = unquote_to_bytes(uri).decode(_encoding, "surrogateescape")
         else:
             path = unquote(uri, encoding=_encoding, errors="surrogateescape")
         if "\x00" in path:
@@ -575,6 +847,7 @@ def uri2fsn(uri):
         return path
 
 
+@_instrument.instrumented
 def fsn2uri(path):
     """
     Args:
@@ -591,7 +864,13 @@ def fsn2uri(path):
     percent encoded.
     """
 
-    path = _fsn2native(path)
+    cache = _cache.uri_cache
+    if cache is not None:
+        uri = cache.get(path)
+        if uri is not None:
+            return uri
+
+    native = _fsn2native(path)
 
     def _quote_path(path):
         # RFC 2396
@@ -605,7 +884,8 @@ def fsn2uri(path):
         length = winapi.DWORD(winapi.INTERNET_MAX_URL_LENGTH)
         flags = 0
         try:
-            winapi.UrlCreateFromPathW(path, buf, ctypes.byref(length), flags)
+            winapi.UrlCreateFromPathW(
+                native, buf, ctypes.byref(length), flags)
         except WindowsError as e:
             raise ValueError(e)
         uri = buf[:length.value]
@@ -621,7 +901,10 @@ def fsn2uri(path):
             # Python 2 does what we want by default
             uri = unquote(uri)
 
-        return _quote_path(uri.encode("utf-8", _surrogatepass))
-
+        uri = _quote_path(uri.encode("utf-8", _surrogatepass))
     else:
-        return u"file://" + _quote_path(path)
+        uri = u"file://" + _quote_path(native)
+
+    if cache is not None:
+        cache.put(path, uri)
+    return uri
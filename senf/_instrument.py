@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import sys
+import time
+import random
+import inspect
+import threading
+import functools
+from collections import namedtuple
+
+from ._compat import text_type
+
+
+ConversionStats = namedtuple(
+    "ConversionStats", ["calls", "errors", "fallbacks", "bytes"])
+
+
+TraceEvent = namedtuple(
+    "TraceEvent", ["function", "length", "duration", "error", "fallback"])
+
+
+_timer = getattr(time, "perf_counter", time.time)
+
+
+class _Recorder(object):
+    """Collects statistics, trace events and recordings for the calls passed
+    to call().
+
+    Instrumented functions hand their call over to call() in case they are
+    the outermost instrumented call in the current thread, so calls nested in
+    other senf functions count towards the function called by the user.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Dict[str, List[int]] or None if stats are disabled
+        self.counters = None
+        # (hook, sample_rate, threshold) or None if tracing is disabled
+        self.trace = None
+        # Callable[[str, tuple, dict], None] or None if not recording
+        self.capture = None
+
+    def in_call(self):
+        return getattr(self._local, "fallbacks", None) is not None
+
+    def fallback(self):
+        local = self._local
+        if getattr(local, "fallbacks", None) is not None:
+            local.fallbacks += 1
+
+    def call(self, name, func, *args, **kwargs):
+        trace = self.trace
+        if trace is not None and random.random() >= trace[1]:
+            trace = None
+
+        local = self._local
+        local.fallbacks = 0
+        arg = args[0] if args else None
+        result = None
+        error = None
+        start = _timer() if trace is not None else 0
+        try:
+            capture = self.capture
+            if capture is not None:
+                try:
+                    capture(name, args, kwargs)
+                except Exception:
+                    self.stop_capture(capture)
+            result = func(*args, **kwargs)
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            # still marked as in a call so senf functions used by the hook
+            # don't get traced
+            try:
+                fallbacks = local.fallbacks
+                if trace is not None:
+                    duration = _timer() - start
+                    if duration >= trace[2]:
+                        trace[0](TraceEvent(
+                            name, _get_length(arg), duration, error,
+                            bool(fallbacks)))
+                counters = self.counters
+                if counters is not None:
+                    size = _get_size(arg, result)
+                    with self._lock:
+                        counter = counters.get(name)
+                        if counter is None:
+                            counter = counters[name] = [0, 0, 0, 0]
+                        counter[0] += 1
+                        counter[1] += error is not None
+                        counter[2] += fallbacks
+                        counter[3] += size
+            finally:
+                local.fallbacks = None
+
+    def stop_capture(self, capture):
+        """Stops recording in case *capture* is still the active one"""
+
+        with self._lock:
+            if self.capture is capture:
+                self.capture = None
+                _update_active()
+
+    def reset(self):
+        with self._lock:
+            if self.counters is not None:
+                self.counters.clear()
+
+    def stats(self):
+        with self._lock:
+            if self.counters is None:
+                return {}
+            return dict(
+                (name, ConversionStats(*counter))
+                for name, counter in self.counters.items())
+
+
+def _get_length(arg):
+    """The length of the passed in path or data, or None"""
+
+    if isinstance(arg, memoryview):
+        return arg.nbytes
+    try:
+        return len(arg)
+    except TypeError:
+        return None
+
+
+def _get_size(arg, result):
+    """The size of the bytes side of a conversion, or the length of the text
+    passed in if there is none.
+    """
+
+    if isinstance(result, list):
+        # batch conversions
+        return sum(_get_size(item, None) for item in result)
+
+    for obj in (arg, result):
+        if isinstance(obj, (bytes, bytearray)):
+            return len(obj)
+        elif isinstance(obj, memoryview):
+            return obj.nbytes
+    if isinstance(arg, text_type):
+        return len(arg)
+    return 0
+
+
+_recorder = _Recorder()
+
+# The active recorder, looked up by the instrumented functions on each call.
+# None if neither statistics, tracing nor recording are enabled.
+active = None
+
+
+def _update_active():
+    global active
+
+    if _recorder.counters is None and _recorder.trace is None and \
+            _recorder.capture is None:
+        active = None
+    else:
+        active = _recorder
+
+
+_getargspec = getattr(inspect, "getfullargspec", None) or inspect.getargspec
+
+_WRAPPER_TEMPLATE = """\
+def %(name)s(%(params)s):
+    recorder = _instrument.active
+    if recorder is None or recorder.in_call():
+        return _func(%(args)s)
+    return recorder.call(_name, _func, %(args)s)
+"""
+
+
+def instrumented(func, name=None):
+    """Decorator handing the calls of *func* over to the active recorder in
+    case they aren't nested in another instrumented call.
+
+    Args:
+        func (Callable): The function to wrap
+        name (str or None): The name used for statistics, tracing and
+            recordings, defaults to the name of *func*
+    Returns:
+        Callable: The wrapper
+
+    The wrapper gets generated with the same signature as *func*, so that
+    while instrumentation is disabled it costs one plain function call and
+    an attribute lookup, instead of packing the arguments.
+    """
+
+    if name is None:
+        name = func.__name__
+    args, varargs, varkw, defaults = _getargspec(func)[:4]
+    defaults = defaults or ()
+
+    namespace = {
+        "_instrument": sys.modules[__name__],
+        "_func": func,
+        "_name": name,
+    }
+    params = list(args)
+    for i, default in enumerate(defaults):
+        key = "_default%d" % i
+        namespace[key] = default
+        index = len(args) - len(defaults) + i
+        params[index] = "%s=%s" % (args[index], key)
+    call_args = list(args)
+    if varargs is not None:
+        params.append("*" + varargs)
+        call_args.append("*" + varargs)
+    if varkw is not None:
+        params.append("**" + varkw)
+        call_args.append("**" + varkw)
+
+    source = _WRAPPER_TEMPLATE % {
+        "name": func.__name__,
+        "params": ", ".join(params),
+        "args": ", ".join(call_args),
+    }
+    exec(compile(source, "<instrumented %s>" % name, "exec"), namespace)
+    wrapper = namespace[func.__name__]
+    functools.update_wrapper(wrapper, func)
+    return wrapper
+
+
+def fallback():
+    """Marks the current call as having taken a slow or lossy code path"""
+
+    recorder = active
+    if recorder is not None:
+        recorder.fallback()
+
+
+def enable_stats():
+    """Enables the collection of call statistics for the current process.
+
+    Once enabled, the senf conversion functions, :func:`print_` and the
+    stdlib replacement functions count how often they get called, fail, take
+    a slow or lossy fallback path (like replacing characters which can't be
+    encoded) and how much data they convert. The statistics can be retrieved
+    using :func:`stats`.
+
+    Calls made by senf functions internally count towards the function called
+    from the outside. Collecting is thread-safe. While disabled the overhead
+    is a single attribute lookup per call.
+    """
+
+    with _recorder._lock:
+        if _recorder.counters is None:
+            _recorder.counters = {}
+        _update_active()
+
+
+def disable_stats():
+    """Disables the collection of call statistics and drops the collected
+    ones.
+    """
+
+    with _recorder._lock:
+        _recorder.counters = None
+        _update_active()
+
+
+def reset_stats():
+    """Resets all statistics collected so far to zero"""
+
+    _recorder.reset()
+
+
+def stats():
+    """
+    Returns:
+        Dict[`str`, ConversionStats]: The collected statistics per function
+        name or an empty dict if collecting is disabled.
+
+    Each ``ConversionStats`` is a named tuple containing ``calls``,
+    ``errors``, ``fallbacks`` and ``bytes``. ``fallbacks`` counts how often a
+    slow or lossy fallback path was taken. ``bytes`` is the amount of data
+    converted, in bytes for conversions from or to `bytes` and in code points
+    otherwise.
+    """
+
+    return _recorder.stats()
+
+
+def set_trace_hook(hook, sample_rate=1.0, threshold=0.0):
+    """
+    Args:
+        hook (Callable[[TraceEvent], None] or None): The function to call
+            for each traced call, or `None` to disable tracing
+        sample_rate (float): The fraction of calls to trace, between 0
+            (exclusive) and 1
+        threshold (float): Only report calls taking at least this many
+            seconds
+    Raises:
+        ValueError: In case *sample_rate* or *threshold* is out of range
+
+    Calls *hook* after each call of a senf function with a ``TraceEvent``
+    describing the call. This includes the conversion functions,
+    :func:`print_`, :func:`input_` and the functions replacing stdlib ones,
+    like :func:`getenv` or :func:`expanduser`.
+
+    ``TraceEvent`` is a named tuple containing the ``function`` name, the
+    ``length`` of the first argument (`None` if it has none), the
+    ``duration`` in seconds, the exception raised as ``error`` (or `None`)
+    and if a slow or lossy fallback path was taken as ``fallback``.
+
+    Only the outermost call gets reported in case senf functions use each
+    other. The hook gets called in the thread making the call and should
+    not raise. A low *sample_rate* or a *threshold* keep the overhead low
+    enough to leave tracing enabled in production.
+    """
+
+    if not 0.0 < sample_rate <= 1.0:
+        raise ValueError("sample_rate needs to be in (0, 1]")
+    if threshold < 0:
+        raise ValueError("threshold needs to be positive")
+
+    with _recorder._lock:
+        if hook is None:
+            _recorder.trace = None
+        else:
+            _recorder.trace = (hook, float(sample_rate), float(threshold))
+        _update_active()
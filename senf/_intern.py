@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import sys
+import threading
+from collections import namedtuple
+
+from ._fsnative import fsnative_type
+from ._cache import LRUCache
+
+
+InternInfo = namedtuple(
+    "InternInfo", ["hits", "misses", "maxsize", "currsize", "bytes_saved"])
+
+
+class PathInterner(object):
+    """PathInterner(maxsize=None)
+
+    Args:
+        maxsize (int or None): The maximum number of paths to keep, or
+            `None` for no limit
+    Raises:
+        ValueError: In case maxsize is smaller than 1
+
+    Makes equal paths share one object, to save memory in case the same
+    paths are kept around many times, for example in a playlist and a
+    library. Passing a path to :meth:`intern` returns the first equal path
+    which was passed to it.
+
+    By default all paths are kept until :meth:`clear` is called. With
+    *maxsize* only the most recently used ones are kept, so paths no longer
+    used eventually get dropped in long running programs. Paths can't be
+    referenced weakly, as `str` and `bytes` don't support weak references.
+
+    Safe to use from multiple threads.
+    """
+
+    def __init__(self, maxsize=None):
+        self._maxsize = maxsize
+        self._cache = LRUCache(maxsize) if maxsize is not None else None
+        self._data = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+
+    def intern(self, path):
+        """
+        Args:
+            path (fsnative): The path to intern
+        Returns:
+            `fsnative`: An equal path, the same one for all equal paths
+        Raises:
+            TypeError: In case no `fsnative` was passed
+
+        The path isn't validated beyond its type, pass it through
+        :func:`path2fsn` or :func:`bytes2fsn` first if unsure.
+        """
+
+        if type(path) is not fsnative_type:
+            raise TypeError("path needs to be %s, not %s" % (
+                fsnative_type.__name__, type(path).__name__))
+
+        with self._lock:
+            cache = self._cache
+            if cache is not None:
+                existing = cache.get(path)
+                if existing is None:
+                    cache.put(path, path)
+                    existing = path
+            else:
+                existing = self._data.setdefault(path, path)
+
+            if existing is path:
+                # either new or the same object again
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._bytes_saved += sys.getsizeof(path)
+
+        return existing
+
+    def clear(self):
+        """Drops all paths and resets the statistics"""
+
+        with self._lock:
+            if self._cache is not None:
+                self._cache = LRUCache(self._maxsize)
+            self._data = {}
+            self._hits = self._misses = self._bytes_saved = 0
+
+    def info(self):
+        """
+        Returns:
+            InternInfo: A named tuple containing ``hits``, ``misses``,
+            ``maxsize``, ``currsize`` and ``bytes_saved``
+
+        ``bytes_saved`` is the memory used by the paths passed to
+        :meth:`intern` for which an equal path was returned instead, so
+        which can be freed.
+        """
+
+        with self._lock:
+            if self._cache is not None:
+                currsize = self._cache.info().currsize
+            else:
+                currsize = len(self._data)
+            return InternInfo(self._hits, self._misses, self._maxsize,
+                              currsize, self._bytes_saved)
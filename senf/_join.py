@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import os
+
+from ._compat import PY3
+from ._fsnative import is_unix, _fsn2native, _is_normalized
+
+
+_join = os.path.join
+_split = os.path.split
+
+
+def _check_fsnative(path):
+    """Raises TypeError like the other senf functions in case *path* isn't
+    a valid fsnative. Skips encoding the common normalized paths.
+    """
+
+    if PY3 and is_unix and type(path) is str and _is_normalized(path):
+        return
+    _fsn2native(path)
+
+
+def fsn_join(*parts):
+    """
+    Args:
+        parts (fsnative): The paths to join
+    Returns:
+        `fsnative`
+    Raises:
+        TypeError: In case a part isn't a valid `fsnative`
+
+    Like :func:`os.path.join` but makes sure all parts are valid `fsnative`
+    paths, so the result is one as well.
+
+    In case all parts are normalized, see :func:`fsn2norm`, the result is
+    normalized as well and doesn't have to be passed to :func:`fsn2norm`
+    again. Normalizing can only change the path where two parts meet, and
+    :func:`os.path.join` always puts an ASCII separator between them, which
+    can't be combined with surrogates or incomplete multibyte sequences. All
+    paths returned by senf and :func:`os.listdir` are normalized.
+    """
+
+    if PY3 and is_unix:
+        # str.join() rejects everything but str, and in case the
+        # concatenation is normalized all the parts are
+        try:
+            if _is_normalized(u"".join(parts)):
+                return _join(*parts)
+        except TypeError:
+            pass
+
+    for part in parts:
+        _fsn2native(part)
+    return _join(*parts)
+
+
+def fsn_split(path):
+    """
+    Args:
+        path (fsnative): The path to split
+    Returns:
+        Tuple[`fsnative`, `fsnative`]: The head and the tail
+    Raises:
+        TypeError: In case *path* isn't a valid `fsnative`
+
+    Like :func:`os.path.split` but makes sure *path* is a valid `fsnative`.
+
+    In case *path* is normalized both parts are normalized as well, as the
+    path only gets split at separators, see :func:`fsn_join`.
+    """
+
+    _check_fsnative(path)
+    return _split(path)
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+
+import re
+import threading
+import unicodedata
+
+from ._compat import PY3, text_type
+from ._fsnative import fsn2text, fsn2norm, is_win, is_unix, _encoding, \
+    _is_normalized
+from ._cache import LRUCache
+
+
+_DIGITS = re.compile(u"(\\d+)", re.UNICODE)
+
+if PY3:
+    _casefold = str.casefold
+else:
+    _casefold = text_type.lower
+
+_sep = u"\\" if is_win else u"/"
+
+_FORMS = ("NFC", "NFD", "NFKC", "NFKD")
+
+if PY3:
+    _isascii = getattr(str, "isascii", None)
+else:
+    _isascii = None
+
+
+def _is_ascii(text):
+    if _isascii is not None:
+        return _isascii(text)
+    try:
+        text.encode("ascii")
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def fsn2sortkey(path, natural=True, casefold=True):
+    """
+    Args:
+        path (fsnative): The path to create a key for
+        natural (bool): Compare runs of digits by their numeric value
+        casefold (bool): Ignore case differences
+    Returns:
+        object: A key which can be compared with other keys returned by this
+        function using the same arguments
+    Raises:
+        TypeError: In case no `fsnative` has been passed
+
+    Returns a sort key which orders paths the way users expect, for example
+    ``track2.ogg`` before ``track10.ogg`` and ``b`` after ``A``. Paths are
+    compared path component by path component so a directory sorts before
+    its siblings which only share a prefix.
+
+    Undecodable parts of the path are compared like the replacement
+    character :func:`fsn2text` shows in their place. Paths which end up
+    equal this way, like ``Track01`` and ``track1``, are ordered by the path
+    itself, so the result doesn't depend on the input order.
+
+    Characters are compared by code point and not according to the
+    collation rules of the current locale.
+    """
+
+    text = fsn2text(path)
+    if casefold:
+        text = _casefold(text)
+    # NUL can't be part of a path and sorts before everything else, so
+    # comparing the whole text compares the path components one by one
+    if is_win:
+        text = text.replace(u"/", u"\x00")
+    text = text.replace(_sep, u"\x00")
+    if not natural:
+        return (text, path)
+    # re.split() always starts and ends with a text chunk, so text and
+    # numbers alternate and never get compared with each other. The -1 at
+    # the end sorts a prefix before the longer key, then the path breaks ties
+    parts = _DIGITS.split(text)
+    parts[1::2] = map(int, parts[1::2])
+    parts.append(-1)
+    parts.append(path)
+    return tuple(parts)
+
+
+def sort_paths(paths, natural=True, casefold=True, reverse=False):
+    """
+    Args:
+        paths (Iterable[fsnative]): The paths to sort
+        natural (bool): see :func:`fsn2sortkey`
+        casefold (bool): see :func:`fsn2sortkey`
+        reverse (bool): Sort in descending order
+    Returns:
+        List[`fsnative`]: A new sorted list
+    Raises:
+        TypeError: In case a path isn't a `fsnative`
+
+    Sorts the paths using :func:`fsn2sortkey`.
+    """
+
+    return sorted(
+        paths, key=lambda p: fsn2sortkey(p, natural, casefold),
+        reverse=reverse)
+
+
+class SortKeyCache(object):
+    """SortKeyCache(natural=True, casefold=True, maxsize=None)
+
+    Args:
+        natural (bool): see :func:`fsn2sortkey`
+        casefold (bool): see :func:`fsn2sortkey`
+        maxsize (int or None): The maximum number of keys to keep, or `None`
+            for no limit
+    Raises:
+        ValueError: In case maxsize is smaller than 1
+
+    Keeps the keys returned by :func:`fsn2sortkey` around, so sorting the
+    same paths again, for example after sorting by a different column in
+    between, doesn't have to compute them again::
+
+        cache = SortKeyCache()
+        songs.sort(key=lambda s: cache.key(s.path))
+
+    Safe to use from multiple threads.
+    """
+
+    def __init__(self, natural=True, casefold=True, maxsize=None):
+        self._natural = natural
+        self._casefold = casefold
+        self._maxsize = maxsize
+        self._cache = LRUCache(maxsize) if maxsize is not None else None
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def key(self, path):
+        """
+        Args:
+            path (fsnative): The path to create a key for
+        Returns:
+            object: The same as :func:`fsn2sortkey` would return
+        Raises:
+            TypeError: In case no `fsnative` has been passed
+        """
+
+        cache = self._cache
+        if cache is not None:
+            key = cache.get(path)
+            if key is None:
+                key = fsn2sortkey(path, self._natural, self._casefold)
+                cache.put(path, key)
+            return key
+
+        try:
+            return self._data[path]
+        except KeyError:
+            key = fsn2sortkey(path, self._natural, self._casefold)
+            with self._lock:
+                return self._data.setdefault(path, key)
+
+    def sort(self, paths, reverse=False):
+        """
+        Args:
+            paths (Iterable[fsnative]): The paths to sort
+            reverse (bool): Sort in descending order
+        Returns:
+            List[`fsnative`]: A new sorted list
+        Raises:
+            TypeError: In case a path isn't a `fsnative`
+
+        Like :func:`sort_paths` but using the cached keys.
+        """
+
+        return sorted(paths, key=self.key, reverse=reverse)
+
+    def clear(self):
+        """Removes all cached keys"""
+
+        if self._cache is not None:
+            self._cache = LRUCache(self._maxsize)
+        self._data = {}
+
+    def __len__(self):
+        if self._cache is not None:
+            return self._cache.info().currsize
+        return len(self._data)
+
+
+def fsn2key(path, form="NFC", casefold=False):
+    """
+    Args:
+        path (fsnative): The path to create a key for
+        form (str): The Unicode normalization form, one of ``NFC``, ``NFD``,
+            ``NFKC`` or ``NFKD``
+        casefold (bool): Ignore case differences
+    Returns:
+        object: A hashable key
+    Raises:
+        TypeError: In case no `fsnative` has been passed
+        ValueError: In case *form* isn't valid
+
+    Returns a key which is the same for paths which only differ in their
+    Unicode normalization, for example a path listed on macOS (NFD) and the
+    same path typed on Linux (NFC). With *casefold* case differences are
+    ignored as well.
+
+    Unlike :func:`fsn2text` this doesn't lose information, undecodable parts
+    of the path are kept as is and only compare equal to themselves. Paths
+    with different keys are always different paths, paths with the same key
+    are different paths only for file systems which don't normalize.
+
+    Pure ASCII paths are returned without normalizing.
+    """
+
+    if form not in _FORMS:
+        raise ValueError("invalid normalization form: %r" % (form,))
+
+    return _fsn2key(path, form, casefold)
+
+
+def _fsn2key(path, form, casefold):
+    if PY3 and is_unix and type(path) is str and _is_normalized(path):
+        text = path
+    else:
+        text = fsn2norm(path)
+        if is_unix and not PY3:
+            try:
+                text = text.decode(_encoding)
+            except UnicodeDecodeError:
+                # no surrogateescape on Python 2, nothing to normalize
+                return text
+
+    if _is_ascii(text):
+        return text.lower() if casefold else text
+
+    key = unicodedata.normalize(form, text)
+    if casefold:
+        # casefolding can break the normalization, see "canonical caseless
+        # matching" in the Unicode standard
+        key = unicodedata.normalize(form, _casefold(key))
+    return key
+
+
+def dedupe_paths(paths, form="NFC", casefold=False):
+    """
+    Args:
+        paths (Iterable[fsnative]): The paths to deduplicate
+        form (str): see :func:`fsn2key`
+        casefold (bool): see :func:`fsn2key`
+    Returns:
+        List[`fsnative`]: The paths without duplicates
+    Raises:
+        TypeError: In case a path isn't a `fsnative`
+        ValueError: In case *form* isn't valid
+
+    Removes paths which have the same :func:`fsn2key` as an earlier path.
+    The first path of each group and the order are kept.
+    """
+
+    if form not in _FORMS:
+        raise ValueError("invalid normalization form: %r" % (form,))
+
+    seen = set()
+    add = seen.add
+    result = []
+    append = result.append
+    for path in paths:
+        key = _fsn2key(path, form, casefold)
+        if key not in seen:
+            add(key)
+            append(path)
+    return result
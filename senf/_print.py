@@ -29,8 +29,10 @@ from ._fsnative import _encoding, is_win, is_unix, _surrogatepass, bytes2fsn
 from ._compat import text_type, PY2, PY3
 from ._winansi import AnsiState, ansi_split
 from . import _winapi as winapi
+from . import _instrument
 
 
+@_instrument.instrumented
 def print_(*objects, **kwargs):
     """print_(*objects, sep=None, end=None, file=None, flush=False)
 
@@ -99,6 +101,7 @@ def _print_unix(objects, sep, end, file, flush):
                 try:
                     obj = obj.encode(encoding, "surrogateescape")
                 except UnicodeEncodeError:
+                    _instrument.fallback()
                     obj = obj.encode(encoding, "replace")
         assert isinstance(obj, bytes)
         parts.append(obj)
@@ -111,6 +114,7 @@ def _print_unix(objects, sep, end, file, flush):
     try:
         file.write(data)
     except TypeError:
+        _instrument.fallback()
         if PY3:
             # For StringIO, first try with surrogates
             surr_data = data.decode(encoding, "surrogateescape")
@@ -188,6 +192,7 @@ def _print_windows(objects, sep, end, file, flush):
         try:
             encoding = "utf-8"
             if winapi.SetConsoleOutputCP(65001) == 0:
+                _instrument.fallback()
                 encoding = None
 
             for is_ansi, part in ansi_split(text):
@@ -208,6 +213,7 @@ def _print_windows(objects, sep, end, file, flush):
         try:
             file.write(text.encode("utf-8", _surrogatepass))
         except (TypeError, ValueError):
+            _instrument.fallback()
             file.write(text)
 
         if flush:
@@ -340,6 +346,7 @@ def _readline():
         return _readline_default()
 
 
+@_instrument.instrumented
 def input_(prompt=None):
     """
     Args:
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import struct
+import threading
+
+from . import _instrument
+from ._compat import text_type, integer_types
+from ._fsnative import fsnative, fsn2bytes, bytes2fsn, _surrogatepass, \
+    _fspath
+
+
+# A recording starts with the magic and a format version, followed by
+# records consisting of a header (_RECORD) and the record data.
+# The header contains the function id, the number of arguments and the
+# length of the data. The data contains the arguments, each one a value
+# header (_VALUE) containing the kind of value, the length of the keyword
+# (zero for positional arguments) and the length of the value, followed
+# by the keyword and the value.
+# Function ids get defined by a _DEFINE record with the new id as argument
+# count and the function name as data before their first use.
+_MAGIC = b"SENFREC\x00"
+_VERSION = 2
+_RECORD = struct.Struct("<BBI")
+_VALUE = struct.Struct("<BBI")
+_DEFINE = 255
+
+# None
+_NONE = 0
+# A fsnative, stored as native bytes (WTF-8 on Windows)
+_PATH = 1
+# bytes, bytearray and memoryview
+_BYTES = 2
+# Text which isn't a valid fsnative, stored as UTF-8 including surrogates
+_TEXT = 3
+# A bool, stored as a single byte
+_BOOL = 4
+# An integer, stored as ASCII decimal
+_INT = 5
+
+
+def _encode_value(value):
+    """Returns a (kind, data) tuple or None if the value can't be stored"""
+
+    if value is None:
+        return _NONE, b""
+    elif isinstance(value, bool):
+        return _BOOL, b"\x01" if value else b"\x00"
+    elif isinstance(value, integer_types):
+        return _INT, str(value).encode("ascii")
+    if not isinstance(value, (bytes, text_type, bytearray, memoryview)):
+        try:
+            value = _fspath(value)
+        except TypeError:
+            return None
+    if isinstance(value, bytes):
+        return _BYTES, value
+    elif isinstance(value, (bytearray, memoryview)):
+        return _BYTES, bytes(value)
+    elif isinstance(value, fsnative):
+        return _PATH, fsn2bytes(value, "utf-8")
+    elif isinstance(value, text_type):
+        return _TEXT, value.encode("utf-8", _surrogatepass)
+    return None
+
+
+def _decode_value(kind, data):
+    if kind == _NONE:
+        return None
+    elif kind == _PATH:
+        return bytes2fsn(data, "utf-8")
+    elif kind == _BYTES:
+        return data
+    elif kind == _TEXT:
+        return data.decode("utf-8", _surrogatepass)
+    elif kind == _BOOL:
+        return data != b"\x00"
+    elif kind == _INT:
+        return int(data.decode("ascii"))
+    raise ValueError("unknown value kind %d" % kind)
+
+
+def _encode_args(args, kwargs):
+    """Returns the record data for a call or None if it can't be stored.
+
+    Keyword arguments which can't be stored get left out, so replaying
+    falls back to their default.
+    """
+
+    values = []
+    for arg in args:
+        encoded = _encode_value(arg)
+        if encoded is None:
+            return None
+        kind, data = encoded
+        values.append(_VALUE.pack(kind, 0, len(data)) + data)
+
+    for key, value in sorted(kwargs.items()):
+        encoded = _encode_value(value)
+        if encoded is None:
+            continue
+        kind, data = encoded
+        key_data = key.encode("ascii")
+        values.append(
+            _VALUE.pack(kind, len(key_data), len(data)) + key_data + data)
+
+    if len(values) >= _DEFINE:
+        return None
+    return len(values), b"".join(values)
+
+
+def _decode_args(count, data):
+    args = []
+    kwargs = {}
+    offset = 0
+    value_size = _VALUE.size
+    for i in range(count):
+        header = data[offset:offset + value_size]
+        if len(header) != value_size:
+            raise ValueError("truncated record")
+        kind, key_length, length = _VALUE.unpack(header)
+        offset += value_size
+        key_data = data[offset:offset + key_length]
+        offset += key_length
+        value_data = data[offset:offset + length]
+        offset += length
+        if len(key_data) != key_length or len(value_data) != length:
+            raise ValueError("truncated record")
+        value = _decode_value(kind, value_data)
+        if key_length:
+            kwargs[key_data.decode("ascii")] = value
+        elif kwargs:
+            raise ValueError("positional argument after keyword argument")
+        else:
+            args.append(value)
+    if offset != len(data):
+        raise ValueError("trailing record data")
+    return tuple(args), kwargs
+
+
+class _Writer(object):
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._lock = threading.Lock()
+        self._ids = {}
+        fileobj.write(_MAGIC + struct.pack("<B", _VERSION))
+
+    def __call__(self, name, args, kwargs):
+        encoded = _encode_args(args, kwargs)
+        if encoded is None:
+            return
+        count, data = encoded
+
+        with self._lock:
+            if self._fileobj is None:
+                return
+            write = self._fileobj.write
+            try:
+                func_id = self._ids.get(name)
+                if func_id is None:
+                    func_id = len(self._ids)
+                    if func_id >= _DEFINE:
+                        return
+                    self._ids[name] = func_id
+                    name_data = name.encode("ascii")
+                    write(_RECORD.pack(_DEFINE, func_id, len(name_data)) +
+                          name_data)
+                write(_RECORD.pack(func_id, count, len(data)) + data)
+            except Exception:
+                # don't write anything after a partial record
+                self._fileobj = None
+                raise
+
+
+def start_recording(fileobj):
+    """
+    Args:
+        fileobj (object): A file-like object opened for writing bytes
+    Raises:
+        EnvironmentError: In case writing the header fails
+
+    Starts recording the arguments passed to senf functions to *fileobj*,
+    for replaying them later on, for example to benchmark changes with
+    the paths a real program deals with. Replaces any recording in
+    progress.
+
+    The arguments of each call get written in a compact binary format,
+    paths are stored as `bytes` so they survive unchanged. Calls with
+    positional arguments which aren't paths, `text`, `bytes`, `bool`, `int`
+    or `None` are skipped, as are calls made by senf functions internally.
+    Keyword arguments of other types are left out. Use
+    :func:`read_recording` to read the recording back.
+
+    In case writing to *fileobj* fails the recording stops, the error doesn't
+    get passed on to the caller of the recorded function.
+
+    The caller is responsible for closing *fileobj* after calling
+    :func:`stop_recording`.
+    """
+
+    writer = _Writer(fileobj)
+    with _instrument._recorder._lock:
+        _instrument._recorder.capture = writer
+        _instrument._update_active()
+
+
+def stop_recording():
+    """Stops the recording started with :func:`start_recording`"""
+
+    with _instrument._recorder._lock:
+        _instrument._recorder.capture = None
+        _instrument._update_active()
+
+
+def _read_exact(fileobj, size):
+    data = fileobj.read(size)
+    if len(data) != size:
+        raise ValueError("truncated recording")
+    return data
+
+
+def read_recording(fileobj):
+    """
+    Args:
+        fileobj (object): A file-like object opened for reading bytes
+    Returns:
+        Iterator[Tuple[`str`, tuple, dict]]: The function name, the
+        positional arguments and the keyword arguments of each recorded call
+    Raises:
+        ValueError: In case the data isn't a valid recording
+        EnvironmentError: In case reading fails
+
+    Reads a recording written after calling :func:`start_recording`.
+
+    Each argument is a `fsnative`, `bytes`, `text`, `bool`, `int` or `None`,
+    depending on what was passed to the function.
+    """
+
+    header = fileobj.read(len(_MAGIC) + 1)
+    if header[:len(_MAGIC)] != _MAGIC:
+        raise ValueError("not a senf recording")
+    version = struct.unpack("<B", header[len(_MAGIC):])[0]
+    if version != _VERSION:
+        raise ValueError("unsupported recording version %d" % version)
+
+    names = {}
+    record_size = _RECORD.size
+    while True:
+        record = fileobj.read(record_size)
+        if not record:
+            break
+        if len(record) != record_size:
+            raise ValueError("truncated recording")
+        func_id, count, length = _RECORD.unpack(record)
+        data = _read_exact(fileobj, length)
+        if func_id == _DEFINE:
+            names[count] = data.decode("ascii")
+            continue
+        try:
+            name = names[func_id]
+        except KeyError:
+            raise ValueError("undefined function id %d" % func_id)
+        args, kwargs = _decode_args(count, data)
+        yield name, args, kwargs
@@ -0,0 +1,473 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+import os
+import stat as stat_
+import threading
+
+from ._compat import PY3, queue
+from ._fsnative import path2fsn, fsn2norm, fsn2text, fsn2uri, is_unix
+from ._stdlib import curdir
+
+
+class _ListdirEntry(object):
+    """A minimal os.DirEntry replacement for Pythons without os.scandir()"""
+
+    __slots__ = ("name", "path", "_stat", "_lstat")
+
+    def __init__(self, dir_, name):
+        self.name = name
+        self.path = os.path.join(dir_, name)
+        self._stat = None
+        self._lstat = None
+
+    def stat(self, follow_symlinks=True):
+        if follow_symlinks:
+            if self._stat is None:
+                if self.is_symlink():
+                    self._stat = os.stat(self.path)
+                else:
+                    self._stat = self.stat(follow_symlinks=False)
+            return self._stat
+        else:
+            if self._lstat is None:
+                self._lstat = os.lstat(self.path)
+            return self._lstat
+
+    def inode(self):
+        return self.stat(follow_symlinks=False).st_ino
+
+    def is_symlink(self):
+        try:
+            return stat_.S_ISLNK(self.stat(follow_symlinks=False).st_mode)
+        except OSError:
+            return False
+
+    def is_dir(self, follow_symlinks=True):
+        try:
+            return stat_.S_ISDIR(self.stat(follow_symlinks).st_mode)
+        except OSError:
+            return False
+
+    def is_file(self, follow_symlinks=True):
+        try:
+            return stat_.S_ISREG(self.stat(follow_symlinks).st_mode)
+        except OSError:
+            return False
+
+
+def _iter_os_entries(path):
+    scandir = getattr(os, "scandir", None)
+    if scandir is None:
+        for name in os.listdir(path):
+            yield _ListdirEntry(path, name)
+        return
+
+    iterator = scandir(path)
+    try:
+        for entry in iterator:
+            yield entry
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+class DirEntry(object):
+    """A directory entry as returned by :func:`scandir` and :func:`walk`.
+
+    Wraps a :class:`python3:os.DirEntry` and computes the different forms of
+    the path only when needed, once per entry.
+    """
+
+    __slots__ = ("_entry", "_name", "_path", "_text", "_uri")
+
+    def __init__(self, entry):
+        self._entry = entry
+        self._name = None
+        self._path = None
+        self._text = None
+        self._uri = None
+
+    @property
+    def name(self):
+        """`fsnative`: The file name, normalized like :func:`fsn2norm`"""
+
+        if self._name is None:
+            if PY3 and is_unix:
+                # decoded from bytes, so already normalized
+                self._name = self._entry.name
+            else:
+                self._name = fsn2norm(self._entry.name)
+        return self._name
+
+    @property
+    def path(self):
+        """`fsnative`: The path, normalized like :func:`fsn2norm`"""
+
+        if self._path is None:
+            if PY3 and is_unix:
+                self._path = self._entry.path
+            else:
+                self._path = fsn2norm(self._entry.path)
+        return self._path
+
+    @property
+    def text(self):
+        """`text`: The path converted with :func:`fsn2text`"""
+
+        if self._text is None:
+            self._text = fsn2text(self.path)
+        return self._text
+
+    @property
+    def uri(self):
+        """`text`: The path converted with :func:`fsn2uri`"""
+
+        if self._uri is None:
+            self._uri = fsn2uri(self.path)
+        return self._uri
+
+    def stat(self, follow_symlinks=True):
+        """
+        Args:
+            follow_symlinks (bool): If symlinks should be followed
+        Returns:
+            `os.stat_result`
+        Raises:
+            EnvironmentError
+
+        Like :meth:`python3:os.DirEntry.stat`, the result is cached.
+        """
+
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def inode(self):
+        """Returns the inode number of the entry"""
+
+        return self._entry.inode()
+
+    def is_dir(self, follow_symlinks=True):
+        """Returns if the entry is a directory"""
+
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, follow_symlinks=True):
+        """Returns if the entry is a file"""
+
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+    def is_symlink(self):
+        """Returns if the entry is a symbolic link"""
+
+        return self._entry.is_symlink()
+
+    def __fspath__(self):
+        return self.path
+
+    def __repr__(self):
+        return "<%s %r>" % (type(self).__name__, self.name)
+
+
+def scandir(path=None):
+    """
+    Args:
+        path (pathlike or None): The directory to list, defaults to the
+            current directory
+    Returns:
+        Iterator[DirEntry]
+    Raises:
+        EnvironmentError: In case listing the directory fails
+        TypeError: In case the path can't be converted to a `fsnative`
+        ValueError: In case the path can't be converted to a `fsnative`
+
+    Like :func:`python3:os.scandir` but the entries return `fsnative`
+    paths, also under Python 2 where :func:`python3:os.scandir` isn't
+    available.
+    """
+
+    path = curdir if path is None else path2fsn(path)
+    for entry in _iter_os_entries(path):
+        yield DirEntry(entry)
+
+
+def _list_dir(path):
+    """Returns a (dirs, files) tuple of DirEntry lists.
+
+    Raises OSError
+    """
+
+    dirs = []
+    files = []
+    for entry in scandir(path):
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            dirs.append(entry)
+        else:
+            files.append(entry)
+    return dirs, files
+
+
+class _Listing(object):
+    """A directory to list, possibly in a worker thread"""
+
+    __slots__ = ("path", "result", "error", "failure", "done", "parent",
+                 "remaining")
+
+    def __init__(self, path, parent=None):
+        self.path = path
+        self.result = None
+        self.error = None
+        # any other exception raised in a worker, re-raised by check()
+        self.failure = None
+        # a threading.Event once submitted to a pool
+        self.done = None
+        # for bottom up unordered walks: the parent listing and the number
+        # of subdirectories not returned yet
+        self.parent = parent
+        self.remaining = 0
+
+    def run(self):
+        try:
+            self.result = _list_dir(self.path)
+        except OSError as e:
+            self.error = e
+
+    def run_in_worker(self):
+        """Like run(), but keeps all exceptions for check()"""
+
+        try:
+            self.run()
+        except BaseException as e:
+            self.failure = e
+
+    def check(self):
+        if self.failure is not None:
+            raise self.failure
+
+    def submit(self, pool):
+        done = self.done = threading.Event()
+
+        def job():
+            try:
+                self.run_in_worker()
+            finally:
+                done.set()
+
+        pool.submit(job)
+
+    def wait(self):
+        if self.done is None:
+            self.run()
+        else:
+            self.done.wait()
+            self.check()
+
+
+class _Pool(object):
+    """A fixed number of daemon threads running the submitted functions"""
+
+    def __init__(self, workers):
+        self.closed = False
+        self._jobs = queue.Queue()
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._run)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def _run(self):
+        jobs = self._jobs
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            if not self.closed:
+                job()
+
+    def submit(self, job):
+        self._jobs.put(job)
+
+    def close(self):
+        """Stops the threads, skipping the jobs not started yet"""
+
+        self.closed = True
+        for thread in self._threads:
+            self._jobs.put(None)
+
+
+def _walk_ordered(top, topdown, onerror, followlinks, workers, max_pending):
+    pool = _Pool(workers) if workers else None
+    # directories to list, or, for bottom up, finished (path, dirs, files)
+    # results waiting for their subdirectories
+    stack = [_Listing(top)]
+
+    try:
+        while stack:
+            if pool is not None:
+                # make sure the listings needed next are in progress
+                count = 0
+                for item in reversed(stack):
+                    if isinstance(item, _Listing):
+                        if item.done is None:
+                            item.submit(pool)
+                        count += 1
+                        if count >= max_pending:
+                            break
+
+            item = stack.pop()
+            if not isinstance(item, _Listing):
+                yield item
+                continue
+
+            item.wait()
+            if item.error is not None:
+                if onerror is not None:
+                    onerror(item.error)
+                continue
+
+            dirs, files = item.result
+            if topdown:
+                yield item.path, dirs, files
+            else:
+                stack.append((item.path, dirs, files))
+
+            for entry in reversed(dirs):
+                if followlinks or not entry.is_symlink():
+                    stack.append(_Listing(entry.path))
+    finally:
+        if pool is not None:
+            pool.close()
+
+
+def _walk_unordered(top, topdown, onerror, followlinks, workers,
+                    max_pending):
+    pool = _Pool(workers)
+    # bounded, so the workers wait in case the results aren't consumed
+    results = queue.Queue(max_pending)
+
+    def submit(listing):
+        def job():
+            try:
+                listing.run_in_worker()
+            finally:
+                while not pool.closed:
+                    try:
+                        results.put(listing, timeout=0.1)
+                    except queue.Full:
+                        continue
+                    break
+
+        pool.submit(job)
+
+    submit(_Listing(top))
+    pending = 1
+
+    try:
+        while pending:
+            listing = results.get()
+            pending -= 1
+            listing.check()
+
+            if listing.error is not None:
+                if onerror is not None:
+                    onerror(listing.error)
+            else:
+                dirs, files = listing.result
+                if topdown:
+                    yield listing.path, dirs, files
+                for entry in dirs:
+                    if followlinks or not entry.is_symlink():
+                        submit(_Listing(entry.path, listing))
+                        listing.remaining += 1
+                        pending += 1
+
+            if not topdown:
+                # return the directories which have no subdirectories
+                # left to return, children first
+                node = listing
+                while node is not None and node.remaining == 0:
+                    if node.error is None:
+                        yield (node.path,) + node.result
+                    node = node.parent
+                    if node is not None:
+                        node.remaining -= 1
+    finally:
+        pool.close()
+
+
+def walk(top, topdown=True, onerror=None, followlinks=False, workers=0,
+         ordered=True, max_pending=None):
+    """
+    Args:
+        top (pathlike): The directory to walk
+        topdown (bool): If a directory should be returned before its
+            subdirectories
+        onerror (Callable[[EnvironmentError], None] or None): Gets called
+            with the error in case listing a directory fails
+        followlinks (bool): If symbolic links to directories should be
+            followed
+        workers (int): The number of threads listing directories in
+            parallel, or 0 to list them one after another
+        ordered (bool): If the directories should be returned in the same
+            order as without *workers*
+        max_pending (int or None): The number of directories listed ahead,
+            defaults to four per worker
+    Returns:
+        Iterator[Tuple[`fsnative`, List[DirEntry], List[DirEntry]]]
+    Raises:
+        TypeError: In case the path can't be converted to a `fsnative`
+        ValueError: In case the path can't be converted to a `fsnative`
+            or *workers* or *max_pending* are out of range
+
+    Like :func:`python3:os.walk`, but returns the directory path and lists
+    of :class:`DirEntry` for the subdirectories and the other files. With
+    *topdown* the subdirectory list can be changed in place to limit which
+    directories get walked.
+
+    With *workers* the directories get listed by a pool of threads, which
+    helps on file systems with a high latency per directory, like network
+    file systems. At most around *max_pending* directories are listed in
+    advance of the consumer. If *ordered* is False directories get returned
+    as soon as they are listed, which keeps all workers busy, but with
+    *topdown* a directory is still returned before its subdirectories and
+    without after them. Errors are passed to *onerror* from the thread
+    consuming the results and don't stop the walk.
+    """
+
+    top = path2fsn(top)
+    if workers < 0:
+        raise ValueError("workers needs to be positive")
+    if max_pending is None:
+        max_pending = max(workers, 1) * 4
+    elif max_pending < 1:
+        raise ValueError("max_pending needs to be at least 1")
+
+    if ordered or not workers:
+        return _walk_ordered(
+            top, topdown, onerror, followlinks, workers, max_pending)
+    return _walk_unordered(
+        top, topdown, onerror, followlinks, workers, max_pending)
@@ -26,6 +26,7 @@ import os
 from ._fsnative import path2fsn, fsnative, is_win
 from ._compat import PY2
 from ._environ import environ
+from . import _instrument
 
 
 sep = path2fsn(os.sep)
@@ -38,6 +39,7 @@ devnull = path2fsn(os.devnull)
 defpath = path2fsn(os.defpath)
 
 
+@_instrument.instrumented
 def getcwd():
     """Like `os.getcwd` but returns a `fsnative` path
 
@@ -88,6 +90,7 @@ def _get_userdir(user=None):
                 return
 
 
+@_instrument.instrumented
 def expanduser(path):
     """
     Args:
@@ -132,6 +135,7 @@ def expanduser(path):
         return path
 
 
+@_instrument.instrumented
 def expandvars(path):
     """
     Args:
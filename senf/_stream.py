@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from ._compat import PY3
+from ._fsnative import is_unix, _encoding, buffer2fsn
+
+
+def _get_decoder(encoding):
+    """Returns a function taking a memoryview and returning a `fsnative`"""
+
+    if PY3 and is_unix:
+        fs_encoding = _encoding
+
+        def decode(view):
+            return str(view, fs_encoding, "surrogateescape")
+    else:
+        def decode(view):
+            return buffer2fsn(view, encoding)
+
+    return decode
+
+
+def _iter_paths(fileobj, sep, encoding, chunk_size):
+    fileobj = getattr(fileobj, "buffer", fileobj)
+    readinto = getattr(fileobj, "readinto", None)
+    if readinto is None:
+        read = fileobj.read
+
+        def readinto(view):
+            data = read(len(view))
+            view[:len(data)] = data
+            return len(data)
+
+    decode = _get_decoder(encoding)
+    # with a NUL separator the paths can't contain NUL bytes
+    check_nul = PY3 and is_unix and sep != b"\x00"
+    sep_len = len(sep)
+
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    # buf[start:end] contains data not yet returned
+    start = end = 0
+    while True:
+        if end == len(buf):
+            if start:
+                # move the incomplete path to the front
+                buf[:end - start] = buf[start:end]
+                end -= start
+                start = 0
+            else:
+                # path larger than the buffer
+                new_buf = bytearray(len(buf) * 2)
+                new_buf[:end] = buf
+                buf = new_buf
+                view = memoryview(buf)
+
+        size = readinto(view[end:])
+        if not size:
+            break
+        pos = buf.find(sep, max(start, end - sep_len + 1), end + size)
+        end += size
+        while pos != -1:
+            if check_nul and buf.find(b"\x00", start, pos) != -1:
+                raise ValueError("contains nulls")
+            yield decode(view[start:pos])
+            start = pos + sep_len
+            pos = buf.find(sep, start, end)
+
+    if start != end:
+        if check_nul and buf.find(b"\x00", start, end) != -1:
+            raise ValueError("contains nulls")
+        yield decode(view[start:end])
+
+
+def _iter_batches(paths, batch_size):
+    batch = []
+    append = batch.append
+    for path in paths:
+        append(path)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+            append = batch.append
+    if batch:
+        yield batch
+
+
+def iter_paths(fileobj, sep=b"\x00", encoding="utf-8", chunk_size=65536,
+               batch_size=None):
+    """
+    Args:
+        fileobj (object): A file-like object opened in binary mode
+        sep (bytes): The separator between paths
+        encoding (`str`): encoding used for Windows
+        chunk_size (int): The number of bytes to read at once
+        batch_size (int or None): If not `None`, lists of up to this many
+            paths are returned instead of single paths
+    Returns:
+        Iterator[`fsnative`] or Iterator[List[`fsnative`]]
+    Raises:
+        TypeError: In case *sep* isn't `bytes` or the file returns no `bytes`
+        ValueError: In case a path contains a NUL byte, the encoding is
+            invalid or a path can't be decoded
+        EnvironmentError: In case reading fails
+
+    Reads separated paths from a file, like the output of ``find -print0``
+    or ``git ls-files -z``, and returns them as normalized `fsnative` paths.
+
+    The file is read in chunks of *chunk_size* bytes, so memory usage only
+    depends on the length of the longest path. A trailing separator is
+    optional. If the file object has a ``buffer`` attribute, like
+    `sys.stdin`, the underlying binary file is used.
+
+    The passed *encoding* is only used on platforms where paths are not
+    associated with an encoding, like for :func:`bytes2fsn`.
+    """
+
+    if not isinstance(sep, bytes):
+        raise TypeError("sep needs to be bytes")
+    if not sep:
+        raise ValueError("empty separator")
+    if chunk_size < 1:
+        raise ValueError("chunk_size needs to be positive")
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size needs to be positive")
+
+    paths = _iter_paths(fileobj, sep, encoding, chunk_size)
+    if batch_size is not None:
+        return _iter_batches(paths, batch_size)
+    return paths
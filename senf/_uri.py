@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+from ._compat import text_type, PY2, PY3, BytesIO, TextIO, quote, unquote, \
+    unquote_to_bytes
+from ._fsnative import uri2fsn, fsn2uri, is_unix, _encoding, _fsn2native, \
+    _isascii
+from ._cache import LRUCache
+
+
+def _get_quote_table():
+    table = {}
+    for i in range(256):
+        # what is safe depends on the Python version, "~" only is since 3.7
+        quoted = quote(bytes(bytearray([i])), "/:@&=+$,")
+        if len(quoted) != 1:
+            table[i] = text_type(quoted)
+    return table
+
+
+# Maps all bytes quote(data, "/:@&=+$,") escapes, decoded as latin-1, to
+# their escaped form, for use with str.translate()
+_QUOTE_TABLE = _get_quote_table()
+
+# Encodings where decoding a path in parts split at "/" gives the same result
+# as decoding it as a whole
+_SPLIT_ENCODINGS = ("utf-8", "ascii", "iso8859-1")
+
+
+class UriEncoder(object):
+    """UriEncoder(maxsize=256)
+
+    Args:
+        maxsize (int): The maximum number of cached directories
+    Raises:
+        ValueError: In case maxsize is smaller than 1
+
+    Converts many paths to URIs like :func:`fsn2uri`, with the same results.
+    The quoted form of the directory part of each path is cached, so for
+    paths sharing directories only the file names have to be quoted.
+
+    Under Windows this calls :func:`fsn2uri` for each path.
+    """
+
+    def __init__(self, maxsize=256):
+        self._cache = LRUCache(maxsize)
+
+    def cache_info(self):
+        """
+        Returns:
+            CacheInfo: Statistics for the directory cache
+        """
+
+        return self._cache.info()
+
+    def encode(self, path):
+        """
+        Args:
+            path (fsnative): The path to convert to an URI
+        Returns:
+            `text`: An ASCII only URI
+        Raises:
+            TypeError: If no `fsnative` was passed
+            ValueError: If the path can't be converted
+        """
+
+        if not (PY3 and is_unix) or not isinstance(path, str):
+            return fsn2uri(path)
+
+        index = path.rfind("/") + 1
+        prefix = path[:index]
+        cache = self._cache
+        quoted = cache.get(prefix)
+        if quoted is None:
+            quoted = fsn2uri(prefix)
+            cache.put(prefix, quoted)
+
+        # quoting works byte by byte, so the parts can be quoted on their own
+        tail = _fsn2native(path[index:]).decode("latin-1")
+        return quoted + tail.translate(_QUOTE_TABLE)
+
+
+class UriDecoder(object):
+    """UriDecoder(maxsize=256)
+
+    Args:
+        maxsize (int): The maximum number of cached directories
+    Raises:
+        ValueError: In case maxsize is smaller than 1
+
+    Converts many URIs to paths like :func:`uri2fsn`, with the same results.
+    The decoded directory part of each URI is cached, so for URIs sharing
+    directories only the file names have to be decoded.
+
+    Under Windows, or for URIs containing a query or fragment, this calls
+    :func:`uri2fsn`.
+    """
+
+    def __init__(self, maxsize=256):
+        self._cache = LRUCache(maxsize)
+        self._enabled = PY3 and is_unix and _encoding in _SPLIT_ENCODINGS
+
+    def cache_info(self):
+        """
+        Returns:
+            CacheInfo: Statistics for the directory cache
+        """
+
+        return self._cache.info()
+
+    def decode(self, uri):
+        """
+        Args:
+            uri (`text` or :obj:`python:str`): A file URI
+        Returns:
+            `fsnative`
+        Raises:
+            TypeError: In case an invalid type is passed
+            ValueError: In case the URI isn't a valid file URI
+        """
+
+        if not self._enabled or not isinstance(uri, str):
+            return uri2fsn(uri)
+
+        index = uri.rfind("/") + 1
+        tail = uri[index:]
+        if not index or "?" in tail or "#" in tail or "\t" in tail or \
+                "\r" in tail or "\n" in tail:
+            return uri2fsn(uri)
+
+        prefix = uri[:index]
+        cache = self._cache
+        path = cache.get(prefix)
+        if path is None:
+            # the prefix has to mean the same on its own as in the full URI
+            if not prefix.startswith("file:") or "?" in prefix or \
+                    "#" in prefix or "\t" in prefix or "\r" in prefix or \
+                    "\n" in prefix:
+                return uri2fsn(uri)
+            path = uri2fsn(prefix)
+            cache.put(prefix, path)
+
+        # like uri2fsn(), percent encoded sequences can't contain a "/"
+        if "%" in tail:
+            if _isascii is not None and _isascii(tail):
+                tail = unquote_to_bytes(tail).decode(
+                    _encoding, "surrogateescape")
+            else:
+                tail = unquote(
+                    tail, encoding=_encoding, errors="surrogateescape")
+        if "\x00" in tail:
+            raise ValueError("embedded null")
+
+        return path + tail
+
+
+def _iter_lines(data):
+    if isinstance(data, bytes):
+        return BytesIO(data)
+    elif isinstance(data, text_type):
+        # newline="" splits on "\r", "\n" and "\r\n" without translating
+        return TextIO(data, newline="")
+    elif hasattr(data, "read"):
+        return data
+    raise TypeError("data needs to be bytes, text or a file-like object")
+
+
+def parse_uri_list(data, strict=False):
+    """
+    Args:
+        data (`bytes`, `text` or `object`): A ``text/uri-list`` or a file-like
+            object returning one
+        strict (bool): Fail in case an URI isn't a valid file URI instead of
+            skipping it
+    Returns:
+        Iterator[`fsnative`]
+    Raises:
+        TypeError: In case an invalid type is passed
+        ValueError: In case ``strict`` was True and an URI couldn't be
+            converted
+
+    Parses a ``text/uri-list`` (:rfc:`2483`), as used for drag and drop,
+    and returns the file URIs as `fsnative` paths using :func:`uri2fsn`.
+
+    Comments and empty lines are skipped, lines can be separated by
+    ``"\\r\\n"`` or ``"\\n"``. A file-like object gets read line by line, so
+    the paths are returned while reading.
+    """
+
+    lines = _iter_lines(data)
+    return _parse_uri_list(lines, strict)
+
+
+def _parse_uri_list(lines, strict):
+    decode = UriDecoder().decode
+    for lineno, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.rstrip(b"\r\n")
+            if not line or line[:1] == b"#":
+                continue
+            if not PY2:
+                line = line.decode("utf-8", "surrogateescape")
+        else:
+            line = line.rstrip(u"\r\n")
+            if not line or line[:1] == u"#":
+                continue
+
+        try:
+            path = decode(line)
+        except ValueError as e:
+            if strict:
+                raise ValueError("line %d: %s" % (lineno, e))
+            continue
+        yield path
+
+
+def format_uri_list(paths, fileobj=None):
+    """
+    Args:
+        paths (Iterable[fsnative]): The paths to convert
+        fileobj (object): A file-like object to write to or `None`
+    Returns:
+        `text` or `None`: The ``text/uri-list`` in case no file was passed
+    Raises:
+        TypeError: If a path isn't a `fsnative`
+        ValueError: If a path can't be converted
+        EnvironmentError: In case writing fails
+
+    Creates a ``text/uri-list`` (:rfc:`2483`) using :func:`fsn2uri`.
+
+    If *fileobj* is passed the list gets written to it in chunks, as
+    `bytes` if it accepts them and as `text` otherwise.
+    """
+
+    encode = UriEncoder().encode
+    if fileobj is None:
+        return u"".join([encode(p) + u"\r\n" for p in paths])
+
+    write = fileobj.write
+    as_bytes = True
+    lines = (encode(p) + u"\r\n" for p in paths)
+    for chunk in _iter_chunks(lines):
+        if as_bytes:
+            try:
+                write(chunk.encode("ascii"))
+                continue
+            except TypeError:
+                as_bytes = False
+        write(chunk)
+
+
+def _iter_chunks(lines, size=2 ** 16):
+    """Joins lines to chunks of about *size* characters"""
+
+    chunk = []
+    length = 0
+    for line in lines:
+        chunk.append(line)
+        length += len(line)
+        if length >= size:
+            yield u"".join(chunk)
+            chunk = []
+            length = 0
+    if chunk:
+        yield u"".join(chunk)
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""WTF-8 and WTF-16 codecs, see https://simonsapin.github.io/wtf-8/
+
+Importing this module registers them as "wtf-8" and "wtf-16-le" with the
+codecs module. Both encode every code point, including lone surrogates, and
+surrogate pairs get merged into the code point they represent. Decoding
+accepts encoded surrogates, but doesn't merge pairs, like
+``data.decode("utf-8", "surrogatepass")``.
+
+Python 3 only.
+"""
+
+import re
+import codecs
+
+
+_search_pair = re.compile(u"[\ud800-\udbff][\udc00-\udfff]").search
+_sub_pairs = re.compile(u"[\ud800-\udbff][\udc00-\udfff]").sub
+
+
+def _merge_pair(match):
+    high, low = match.group()
+    return chr(0x10000 + ((ord(high) - 0xD800) << 10) + (ord(low) - 0xDC00))
+
+
+def merge_surrogates(text):
+    """Returns the text with all surrogate pairs merged"""
+
+    if _search_pair(text) is None:
+        return text
+    return _sub_pairs(_merge_pair, text)
+
+
+def wtf8_encode(text, errors="strict"):
+    """Encoding can't fail, so *errors* is ignored"""
+
+    return merge_surrogates(text).encode("utf-8", "surrogatepass"), len(text)
+
+
+def _is_partial_surrogate(data):
+    """If *data* is the start of an UTF-8 encoded surrogate"""
+
+    return 0 < len(data) < 3 and data[0] == 0xED and \
+        (len(data) == 1 or 0xA0 <= data[1] <= 0xBF)
+
+
+def _decode(decode, encoding, data, errors, final, partial=None):
+    """Decodes *data* using *decode* with surrogatepass and applies *errors*
+    to all other invalid input.
+
+    Only the input following an error gets decoded again, and the error
+    passed to the handler references the input instead of a copy of it.
+    *partial* tells if the rest of the input could become valid with more
+    data, for decoders which raise in that case when not *final*.
+    """
+
+    try:
+        return decode(data, "surrogatepass", final)
+    except UnicodeDecodeError:
+        pass
+
+    view = memoryview(data)
+    data = data if isinstance(data, bytes) else bytes(view)
+    handler = None
+    parts = []
+    pos = 0
+    while True:
+        try:
+            text, consumed = decode(view[pos:], "surrogatepass", final)
+        except UnicodeDecodeError as e:
+            start = pos + e.start
+            parts.append(decode(view[pos:start], "surrogatepass", True)[0])
+            if not final and partial is not None and partial(view[start:]):
+                return u"".join(parts), start
+            error = UnicodeDecodeError(
+                encoding, data, start, pos + e.end, e.reason)
+            if errors == "strict":
+                raise error
+            if handler is None:
+                handler = codecs.lookup_error(errors)
+            replacement, pos = handler(error)
+            if pos < 0:
+                pos += len(data)
+            parts.append(replacement)
+        else:
+            parts.append(text)
+            return u"".join(parts), pos + consumed
+
+
+def wtf8_decode(data, errors="strict", final=False):
+    """Like the utf-8 decoder, but passes through encoded surrogates.
+
+    *errors* is applied to all other invalid input.
+    """
+
+    # Python < 3.7 raises for a partial surrogate at the end, even if not
+    # final
+    return _decode(codecs.utf_8_decode, "wtf-8", data, errors, final,
+                   _is_partial_surrogate)
+
+
+def wtf16le_encode(text, errors="strict"):
+    """Encoding can't fail, so *errors* is ignored.
+
+    Surrogate pairs result in the same bytes as the code point they
+    represent, so no merging is needed.
+    """
+
+    return text.encode("utf-16-le", "surrogatepass"), len(text)
+
+
+def wtf16le_decode(data, errors="strict", final=False):
+    """Like the utf-16-le decoder, but passes through lone surrogates.
+
+    *errors* is applied to all other invalid input, like a trailing odd byte.
+    """
+
+    return _decode(codecs.utf_16_le_decode, "wtf-16-le", data, errors, final)
+
+
+class WTF8IncrementalEncoder(codecs.IncrementalEncoder):
+
+    def __init__(self, errors="strict"):
+        codecs.IncrementalEncoder.__init__(self, errors)
+        self._pending = u""
+
+    def encode(self, input, final=False):
+        text = self._pending + input
+        self._pending = u""
+        if not final and text and u"\ud800" <= text[-1] <= u"\udbff":
+            # could be the start of a pair, wait for the next chunk
+            self._pending = text[-1]
+            text = text[:-1]
+        return wtf8_encode(text, self.errors)[0]
+
+    def reset(self):
+        self._pending = u""
+
+    def getstate(self):
+        return ord(self._pending) if self._pending else 0
+
+    def setstate(self, state):
+        self._pending = chr(state) if state else u""
+
+
+class WTF8IncrementalDecoder(codecs.BufferedIncrementalDecoder):
+
+    _buffer_decode = staticmethod(wtf8_decode)
+
+
+class WTF8StreamWriter(codecs.StreamWriter):
+
+    def __init__(self, stream, errors="strict"):
+        codecs.StreamWriter.__init__(self, stream, errors)
+        self._encoder = WTF8IncrementalEncoder(errors)
+
+    def encode(self, input, errors="strict"):
+        return self._encoder.encode(input), len(input)
+
+    def reset(self):
+        codecs.StreamWriter.reset(self)
+        self._encoder.reset()
+
+
+class WTF8StreamReader(codecs.StreamReader):
+
+    decode = staticmethod(wtf8_decode)
+
+
+class WTF16LEIncrementalEncoder(codecs.IncrementalEncoder):
+
+    def encode(self, input, final=False):
+        return wtf16le_encode(input, self.errors)[0]
+
+
+class WTF16LEIncrementalDecoder(codecs.BufferedIncrementalDecoder):
+
+    _buffer_decode = staticmethod(wtf16le_decode)
+
+
+class WTF16LEStreamWriter(codecs.StreamWriter):
+
+    encode = staticmethod(wtf16le_encode)
+
+
+class WTF16LEStreamReader(codecs.StreamReader):
+
+    decode = staticmethod(wtf16le_decode)
+
+
+_codecs = {
+    "wtf_8": codecs.CodecInfo(
+        name="wtf-8",
+        encode=wtf8_encode,
+        decode=lambda data, errors="strict": wtf8_decode(data, errors, True),
+        incrementalencoder=WTF8IncrementalEncoder,
+        incrementaldecoder=WTF8IncrementalDecoder,
+        streamwriter=WTF8StreamWriter,
+        streamreader=WTF8StreamReader,
+    ),
+    "wtf_16_le": codecs.CodecInfo(
+        name="wtf-16-le",
+        encode=wtf16le_encode,
+        decode=lambda data, errors="strict": wtf16le_decode(
+            data, errors, True),
+        incrementalencoder=WTF16LEIncrementalEncoder,
+        incrementaldecoder=WTF16LEIncrementalDecoder,
+        streamwriter=WTF16LEStreamWriter,
+        streamreader=WTF16LEStreamReader,
+    ),
+}
+
+
+def _search_codec(name):
+    return _codecs.get(name.replace("-", "_"))
+
+
+codecs.register(_search_codec)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Christoph Reiter
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY
+# CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT,
+# TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE
+# SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+"""Variants of the conversion functions which trust their input to be valid.
+
+Under Python 3 + Unix they skip the type checks and the encoding which
+is done only for validating the input. Everywhere else they are the normal
+functions.
+"""
+
+from ._compat import PY3, quote
+from ._fsnative import is_unix, _encoding, _is_normalized, _fspath
+from . import _fsnative
+from . import _batch
+
+
+if PY3 and is_unix:
+
+    def path2fsn(path):
+        path = _fspath(path)
+        if type(path) is str:
+            return path
+        return _fsnative.path2fsn(path)
+
+    def fsn2norm(path):
+        return path
+
+    def fsn2text(path, strict=False):
+        if _is_normalized(path):
+            # decoding would give back the same text
+            return path
+        return path.encode(_encoding, "surrogateescape").decode(
+            _encoding, "strict" if strict else "replace")
+
+    def fsn2bytes(path, encoding="utf-8"):
+        return path.encode(_encoding, "surrogateescape")
+
+    def bytes2fsn(data, encoding="utf-8"):
+        return str(data, _encoding, "surrogateescape")
+
+    def fsn2uri(path):
+        return u"file://" + quote(
+            path.encode(_encoding, "surrogateescape"), "/:@&=+$,")
+
+    def paths2fsn(paths):
+        return [path2fsn(p) for p in paths]
+
+    def fsns2bytes(paths, encoding="utf-8"):
+        return [p.encode(_encoding, "surrogateescape") for p in paths]
+
+    def bytes2fsns(datas, encoding="utf-8"):
+        return [str(d, _encoding, "surrogateescape") for d in datas]
+
+    def fsns2text(paths, strict=False):
+        return [fsn2text(p, strict) for p in paths]
+else:
+    path2fsn = _fsnative.path2fsn
+    fsn2norm = _fsnative.fsn2norm
+    fsn2text = _fsnative.fsn2text
+    fsn2bytes = _fsnative.fsn2bytes
+    bytes2fsn = _fsnative.bytes2fsn
+    fsn2uri = _fsnative.fsn2uri
+    paths2fsn = _batch.paths2fsn
+    fsns2bytes = _batch.fsns2bytes
+    bytes2fsns = _batch.bytes2fsns
+    fsns2text = _batch.fsns2text
@@ -0,0 +1,56 @@
+import sys
+import os
+
+from typing import Text, Union, Any, Optional, List, Iterable
+
+from . import fsnative
+
+if sys.version_info[0] == 2:
+    _pathlike = Union[Text, bytes]
+else:
+    _pathlike = Union[Text, bytes, 'os.PathLike[Any]']
+
+if sys.version_info[0] == 2:
+    if sys.platform == "win32":
+        _base = Text
+    else:
+        _base = bytes
+else:
+    _base = Text
+
+_fsnative = Union[fsnative, _base]
+
+if sys.platform == "win32":
+    _bytes_default_encoding = str
+else:
+    _bytes_default_encoding = Optional[str]
+
+def path2fsn(path: _pathlike) -> _fsnative:
+    ...
+
+def fsn2norm(path: _fsnative) -> _fsnative:
+    ...
+
+def fsn2text(path: _fsnative, strict: bool=False) -> Text:
+    ...
+
+def fsn2bytes(path: _fsnative, encoding: _bytes_default_encoding="utf-8") -> bytes:
+    ...
+
+def bytes2fsn(data: Union[bytes, bytearray, memoryview], encoding: _bytes_default_encoding="utf-8") -> _fsnative:
+    ...
+
+def fsn2uri(path: _fsnative) -> Text:
+    ...
+
+def paths2fsn(paths: Iterable[_pathlike]) -> List[_fsnative]:
+    ...
+
+def fsns2bytes(paths: Iterable[_fsnative], encoding: _bytes_default_encoding="utf-8") -> List[bytes]:
+    ...
+
+def bytes2fsns(datas: Iterable[Union[bytes, bytearray, memoryview]], encoding: _bytes_default_encoding="utf-8") -> List[_fsnative]:
+    ...
+
+def fsns2text(paths: Iterable[_fsnative], strict: bool=False) -> List[Text]:
+    ...
@@ -108,6 +108,7 @@ if __name__ == "__main__":
         package_data={
             "senf": [
                 "__init__.pyi",
+                "unchecked.pyi",
                 "py.typed",
             ],
         },
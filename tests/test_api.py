@@ -25,7 +25,10 @@ import sys
 import contextlib
 import ctypes
 import shutil
+import subprocess
 import codecs
+import threading
+import random
 from typing import TYPE_CHECKING
 
 import pytest
@@ -35,15 +38,26 @@ from senf import fsnative, sep, pathsep, curdir, pardir, \
     altsep, extsep, devnull, defpath, argv, getcwd, environ, getenv, \
     unsetenv, putenv, uri2fsn, fsn2uri, path2fsn, mkstemp, mkdtemp, \
     fsn2text, fsn2bytes, bytes2fsn, print_, input_, \
-    expanduser, text2fsn, expandvars, supports_ansi_escape_codes, fsn2norm
+    expanduser, text2fsn, expandvars, supports_ansi_escape_codes, fsn2norm, \
+    paths2fsn, fsns2bytes, bytes2fsns, fsns2text, enable_cache, \
+    disable_cache, cache_info, FsnArray, iter_paths, buffer2fsn, fsn2buffer, \
+    parse_uri_list, format_uri_list, UriEncoder, UriDecoder, enable_stats, \
+    disable_stats, reset_stats, stats, set_trace_hook, start_recording, \
+    stop_recording, read_recording, Converter, scandir, walk, DirEntry, \
+    PathInterner, PathTrie, fsn2sortkey, sort_paths, SortKeyCache, \
+    fsn2key, dedupe_paths, fsn_join, fsn_split
 from senf._compat import iteritems, PY3, PY2, BytesIO, StringIO, text_type, \
     TextIO
 from senf._environ import set_windows_env_var, get_windows_env_var, \
     del_windows_env_var
 from senf._winansi import ansi_parse, ansi_split
 from senf._stdlib import _get_userdir
-from senf._fsnative import _encoding, is_unix, _surrogatepass, _get_encoding
+from senf._fsnative import _encoding, is_unix, _surrogatepass, _get_encoding, \
+    _is_normalized, is_win, _merge_surrogates, _wide2text
 from senf._print import _encode_codepage, _decode_codepage
+from senf._cache import LRUCache
+from senf._instrument import instrumented
+from senf._scandir import _ListdirEntry
 from senf import _winapi as winapi
 
 
@@ -166,6 +180,50 @@ def capture_output(data=None):
         sys.stdout = old_out
 
 
+def _get_imports(code):
+    """Returns the names of the modules imported by *code*, using
+    ``-X importtime``, excluding the ones imported on startup.
+    """
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    startup = subprocess.check_output(
+        [sys.executable, "-X", "importtime", "-c", "pass"],
+        stderr=subprocess.STDOUT, cwd=root)
+    output = subprocess.check_output(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stderr=subprocess.STDOUT, cwd=root)
+
+    def parse(output):
+        names = set()
+        for line in output.decode("utf-8").splitlines():
+            if line.startswith("import time:") and "|" in line:
+                name = line.rsplit("|", 1)[-1].strip()
+                if name != "imported package":
+                    names.add(name)
+        return names
+
+    return parse(output) - parse(startup)
+
+
+@pytest.mark.skipif(sys.version_info[:2] < (3, 7), reason="no lazy imports")
+def test_lazy_import():
+    # type: () -> None
+
+    assert _get_imports("import senf") == set(["senf"])
+
+    imports = _get_imports("import senf; senf.fsn2text")
+    assert "senf._fsnative" in imports
+    assert "senf._temp" not in imports
+    assert "tempfile" not in imports
+
+    for name in senf._LAZY:  # type: ignore
+        assert name in dir(senf)
+        getattr(senf, name)
+
+    with pytest.raises(AttributeError):
+        senf.nope  # type: ignore
+
+
 def test__get_encoding():
     # type: () -> None
 
@@ -736,6 +794,77 @@ def test_fsn2bytes_wtf8():
     assert cat(b"\xED\xB0\x80") == b"\xED\xB0\x80"
 
 
+@pytest.mark.skipif(PY2, reason="py3 only")
+def test_wtf_codecs():
+    # type: () -> None
+
+    import senf._wtf  # noqa
+
+    assert codecs.lookup("wtf-8").name == "wtf-8"
+    assert codecs.lookup("WTF_8").name == "wtf-8"
+    assert codecs.lookup("wtf-16-le").name == "wtf-16-le"
+
+    test_data = {
+        u"aé 💩": b"a\xC3\xA9 \xF0\x9F\x92\xA9",
+        u"\uD83D\uDCA9": b"\xF0\x9F\x92\xA9",
+        u"\uD83D\x20\uDCA9": b"\xED\xA0\xBD \xED\xB2\xA9",
+        u"\uDC00": b"\xED\xB0\x80",
+    }
+
+    for text, data in test_data.items():
+        assert text.encode("wtf-8") == data
+        assert data.decode("wtf-8") == senf._wtf.merge_surrogates(text)
+        assert text.encode("wtf-16-le") == text.encode(
+            "utf-16-le", "surrogatepass")
+        assert text.encode("wtf-16-le").decode("wtf-16-le") == \
+            senf._wtf.merge_surrogates(text)
+
+    with pytest.raises(UnicodeDecodeError):
+        b"a\xff".decode("wtf-8")
+    assert b"a\xff\xED\xB0\x80".decode("wtf-8", "replace") == \
+        u"a\ufffd\udc00"
+    assert b"a\xff".decode("wtf-8", "surrogateescape") == u"a\udcff"
+    with pytest.raises(UnicodeDecodeError) as excinfo:
+        b"\xED\xB0\x80a\xff".decode("wtf-8")
+    assert excinfo.value.start == 4
+    assert excinfo.value.object == b"\xED\xB0\x80a\xff"
+    assert (b"\xff" * 10000).decode("wtf-8", "replace") == u"\ufffd" * 10000
+    assert bytearray(b"\xffa").decode("wtf-8", "replace") == u"\ufffda"
+    with pytest.raises(UnicodeDecodeError):
+        b"a".decode("wtf-16-le")
+    assert b"a".decode("wtf-16-le", "replace") == u"\ufffd"
+    assert b"\x00\xd8a\x00b".decode("wtf-16-le", "replace") == \
+        u"\ud800a\ufffd"
+    assert b"\x00\xdcb".decode("wtf-16-le", "ignore") == u"\udc00"
+
+    # pairs split across writes get merged
+    encoder = codecs.getincrementalencoder("wtf-8")()
+    assert encoder.encode(u"a\uD83D") == b"a"
+    assert encoder.encode(u"\uDCA9") == b"\xF0\x9F\x92\xA9"
+    assert encoder.encode(u"\uD83D", final=True) == b"\xED\xA0\xBD"
+
+    data = u"a\uD83D\uDCA9\uDC00é".encode("wtf-8")
+    for i in range(len(data) + 1):
+        decoder = codecs.getincrementaldecoder("wtf-8")()
+        text = decoder.decode(data[:i]) + decoder.decode(data[i:], final=True)
+        assert text == u"a\U0001F4A9\udc00é"
+
+    data = u"a\uDC00é".encode("wtf-16-le")
+    for i in range(len(data) + 1):
+        decoder = codecs.getincrementaldecoder("wtf-16-le")()
+        text = decoder.decode(data[:i]) + decoder.decode(data[i:], final=True)
+        assert text == u"a\udc00é"
+
+    f = BytesIO()
+    writer = codecs.getwriter("wtf-8")(f)
+    writer.write(u"\uD83D")
+    writer.write(u"\uDCA9")
+    writer.reset()
+    assert f.getvalue() == b"\xF0\x9F\x92\xA9"
+    f.seek(0)
+    assert codecs.getreader("wtf-8")(f).read() == u"\U0001F4A9"
+
+
 @pytest.mark.skipif(os.name != "nt", reason="win only")
 def test_fsn2bytes_ill_formed_utf16():
     # type: () -> None
@@ -829,6 +958,1020 @@ def test_bytes2fsn():
     assert bytes2fsn(b"foo", "utf-8") == bytes2fsn(b"foo")
 
 
+def test_buffer2fsn():
+    # type: () -> None
+
+    data = fsn2bytes(fsnative(u"\u1234"), "utf-8")
+    path = bytes2fsn(data, "utf-8")
+    for buffer_ in [bytearray(data), memoryview(data)]:
+        assert buffer2fsn(buffer_, "utf-8") == path
+        assert isinstance(buffer2fsn(buffer_, "utf-8"), fsnative)
+        assert bytes2fsn(buffer_, "utf-8") == path
+        assert buffer2fsn(buffer_) == bytes2fsn(data)
+
+    assert buffer2fsn(b"xx" + data + b"yy", "utf-8", 2, -2) == path
+    assert buffer2fsn(bytearray(b"xxfoo"), "utf-8", 2) == fsnative(u"foo")
+    assert buffer2fsn(bytearray(), "utf-8") == fsnative(u"")
+
+    with pytest.raises(ValueError):
+        buffer2fsn(bytearray(b"a\x00"), "utf-8")
+    with pytest.raises(ValueError):
+        bytes2fsn(memoryview(b"\x00"), "utf-8")
+    assert buffer2fsn(b"a\x00", "utf-8", 0, 1) == fsnative(u"a")
+
+    with pytest.raises(TypeError):
+        buffer2fsn(u"data", "utf-8")  # type: ignore
+    with pytest.raises(TypeError):
+        buffer2fsn(object(), "utf-8")  # type: ignore
+
+    if sys.platform != "win32":
+        assert bytes2fsns([bytearray(b"\xff")]) == [bytes2fsn(b"\xff")]
+
+
+def test_fsn2buffer():
+    # type: () -> None
+
+    buffer_ = bytearray(b"x")
+    path = fsnative(u"\u1234")
+    size = fsn2buffer(path, buffer_, "utf-8")
+    assert size == len(fsn2bytes(path, "utf-8"))
+    assert buffer_ == b"x" + fsn2bytes(path, "utf-8")
+
+    with pytest.raises(TypeError):
+        fsn2buffer(path, b"", "utf-8")  # type: ignore
+    for notfsn in iternotfsn():
+        with pytest.raises(TypeError):
+            fsn2buffer(notfsn, bytearray(), "utf-8")
+
+
+def test_paths2fsn():
+    # type: () -> None
+
+    assert paths2fsn([]) == []
+    assert paths2fsn(iter([u"foo", b"bar"])) == \
+        [fsnative(u"foo"), fsnative(u"bar")]
+    paths = [senf.__path__[0], fsnative(u"\u1234"), b"\xff"]  # type: ignore
+    assert paths2fsn(paths) == [path2fsn(p) for p in paths]
+
+    with pytest.raises(ValueError) as excinfo:
+        paths2fsn([u"foo", b"bar", u"\x00"])
+    assert excinfo.value.index == 2  # type: ignore
+    assert "item 2" in str(excinfo.value)
+
+    with pytest.raises(TypeError) as excinfo:
+        paths2fsn([u"foo", object()])  # type: ignore
+    assert excinfo.value.index == 1  # type: ignore
+
+    with pytest.raises(TypeError):
+        paths2fsn(object())  # type: ignore
+
+
+def test_fsns2bytes():
+    # type: () -> None
+
+    paths = [fsnative(u"foo"), fsnative(u"\u1234"), fsnative(u"\ud83d")]
+    assert fsns2bytes(paths) == [fsn2bytes(p) for p in paths]
+    assert fsns2bytes(paths, "utf-8") == [fsn2bytes(p, "utf-8") for p in paths]
+
+    with pytest.raises(TypeError) as excinfo:
+        fsns2bytes([fsnative(u"foo"), notfsnative(u"foo")])
+    assert excinfo.value.index == 1  # type: ignore
+
+    for path in iternotfsn():
+        with pytest.raises(TypeError) as excinfo:
+            fsns2bytes([path])
+        assert excinfo.value.index == 0  # type: ignore
+
+
+def test_bytes2fsns():
+    # type: () -> None
+
+    datas = [b"foo", fsn2bytes(fsnative(u"\u1234"), "utf-8")]
+    if sys.platform != "win32":
+        datas.append(b"\xff")
+    assert bytes2fsns(datas) == [bytes2fsn(d) for d in datas]
+    assert bytes2fsns(datas, "utf-8") == [bytes2fsn(d, "utf-8") for d in datas]
+
+    with pytest.raises(ValueError) as excinfo:
+        bytes2fsns([b"foo", b"\x00"])
+    assert excinfo.value.index == 1  # type: ignore
+
+    with pytest.raises(TypeError) as excinfo:
+        bytes2fsns([u"data"])  # type: ignore
+    assert excinfo.value.index == 0  # type: ignore
+
+
+def test_fsns2text():
+    # type: () -> None
+
+    paths = [fsnative(u"foo"), fsnative(u"\u1234"), fsnative(u"\ud83d")]
+    assert fsns2text(paths) == [fsn2text(p) for p in paths]
+
+    for path in iternotfsn():
+        with pytest.raises(TypeError) as excinfo:
+            fsns2text([fsnative(u"foo"), path])
+        assert excinfo.value.index == 1  # type: ignore
+
+    if sys.platform != "win32":
+        path = bytes2fsn(b"\xff", None)
+    else:
+        path = u"\ud83d"
+
+    if text2fsn(fsn2text(path)) != path:
+        with pytest.raises(ValueError) as excinfo:
+            fsns2text([fsnative(u"foo"), path], strict=True)
+        assert excinfo.value.index == 1  # type: ignore
+
+
+def test_fsn_array():
+    # type: () -> None
+
+    if sys.platform != "win32":
+        odd = bytes2fsn(b"\xff", None)
+    else:
+        odd = u"\ud83d"
+
+    paths = [
+        fsnative(u"/foo/bar.ogg"), fsnative(u"/foo/\u1234.mp3"),
+        fsnative(u""), fsnative(u"/foo") + odd + fsnative(u".ogg"),
+        fsnative(u"rel.ogg")]
+
+    array = FsnArray(paths)
+    assert len(array) == len(paths)
+    assert list(array) == paths
+    assert array.to_list() == paths
+    assert [array[i] for i in range(-len(paths), len(paths))] == paths * 2
+    assert all(isinstance(p, fsnative) for p in array.to_list())
+    assert array[1:3].to_list() == paths[1:3]
+    assert array[::-2].to_list() == paths[::-2]
+    with pytest.raises(IndexError):
+        array[len(paths)]
+    assert array.get_bytes(1) == fsn2bytes(paths[1], "utf-8")
+    assert array.nbytes > 0
+
+    assert array.to_text() == [fsn2text(p) for p in paths]
+    assert array.to_uri()[:2] == [fsn2uri(p) for p in paths[:2]]
+    lossy = [i for i, p in enumerate(paths) if text2fsn(fsn2text(p)) != p]
+    if lossy:
+        with pytest.raises(ValueError) as excinfo:
+            array.to_text(strict=True)
+        assert excinfo.value.index == lossy[0]  # type: ignore
+
+    assert array.filter_prefix(fsnative(u"/foo/")).to_list() == paths[:2]
+    assert array.filter_prefix(fsnative(u"")) == array
+    assert array.filter_suffix(fsnative(u".ogg")).to_list() == \
+        [paths[0], paths[3], paths[4]]
+    assert array.filter_suffix(fsnative(u"")) == array
+    assert len(array.filter_suffix(fsnative(u"x"))) == 0
+
+    other = FsnArray.from_bytes([fsn2bytes(p, "utf-8") for p in paths])
+    assert other == array
+    assert other != FsnArray()
+    other.append(fsnative(u"foo"))
+    assert other.to_list() == paths + [fsnative(u"foo")]
+    other.extend([])
+    other.extend_bytes([])
+    assert len(other) == len(paths) + 1
+
+    empty = FsnArray()
+    assert len(empty) == 0
+    assert empty.to_list() == []
+    assert empty.to_text() == []
+    assert empty.to_uri() == []
+
+    with pytest.raises(ValueError) as excinfo:
+        array.extend_bytes([b"foo", b"f\x00o"])
+    assert excinfo.value.index == 1  # type: ignore
+    with pytest.raises(ValueError) as excinfo:
+        array.extend_bytes([b"foo", b"bar", b"\x00"])
+    assert excinfo.value.index == 2  # type: ignore
+    with pytest.raises(TypeError) as excinfo:
+        array.extend_bytes([b"foo", b"bar", object()])  # type: ignore
+    assert excinfo.value.index == 2  # type: ignore
+    with pytest.raises(TypeError):
+        array.extend([fsnative(u"foo"), object()])  # type: ignore
+    assert array.to_list() == paths
+
+
+def test_iter_paths():
+    # type: () -> None
+
+    if sys.platform != "win32":
+        odd = b"\xff"
+    else:
+        odd = b"\xed\xa0\xbd"
+
+    paths = [b"/foo/bar", odd, b"x" * 100, b"", b"last"]
+    expected = [bytes2fsn(p, "utf-8") for p in paths]
+
+    for chunk_size in range(1, 20):
+        for separator, trailing in [(b"\x00", b""), (b"\x00", b"\x00"),
+                                    (b"\r\n", b"\r\n"), (b"\n", b"")]:
+            f = BytesIO(separator.join(paths) + trailing)
+            result = list(iter_paths(f, separator, chunk_size=chunk_size))
+            assert result == expected
+            assert all(isinstance(p, fsnative) for p in result)
+
+    assert list(iter_paths(BytesIO(b""))) == []
+    assert list(iter_paths(BytesIO(b"\x00"))) == [fsnative(u"")]
+    assert list(iter_paths(BytesIO(b"a\x00b\x00c"), batch_size=2)) == \
+        [[fsnative(u"a"), fsnative(u"b")], [fsnative(u"c")]]
+
+    class Reader(object):
+
+        def __init__(self, data):
+            self._f = BytesIO(data)
+
+        def read(self, size):
+            return self._f.read(size)
+
+    assert list(iter_paths(Reader(b"a\x00b"), chunk_size=1)) == \
+        [fsnative(u"a"), fsnative(u"b")]
+
+    paths_iter = iter_paths(BytesIO(b"a\nb\x00\nc"), b"\n")
+    assert next(paths_iter) == fsnative(u"a")
+    with pytest.raises(ValueError):
+        next(paths_iter)
+
+    with pytest.raises(TypeError):
+        iter_paths(BytesIO(b""), u"\n")  # type: ignore
+    with pytest.raises(ValueError):
+        iter_paths(BytesIO(b""), b"")
+    with pytest.raises(ValueError):
+        iter_paths(BytesIO(b""), chunk_size=0)
+    with pytest.raises(ValueError):
+        iter_paths(BytesIO(b""), batch_size=0)
+
+
+def test_unchecked():
+    # type: () -> None
+
+    from senf import unchecked
+    import senf.unchecked
+    from senf.unchecked import fsn2text as unchecked_fsn2text
+
+    assert senf.unchecked is unchecked
+    assert unchecked_fsn2text is unchecked.fsn2text
+
+    paths = [fsnative(u"foo"), fsnative(u"/foo/\u1234"), fsnative(u"")]
+    if sys.platform != "win32":
+        paths.append(bytes2fsn(b"/\xff/\xc3\xa4", None))
+    else:
+        paths.append(fsnative(u"C:\\\ud83d"))
+
+    d = mkdtemp()
+    try:
+        for path in paths[1:]:
+            name = os.path.basename(path)
+            if name:
+                with open(os.path.join(d, name), "wb"):
+                    pass
+        paths.extend(os.path.join(d, n) for n in os.listdir(d))
+    finally:
+        shutil.rmtree(d)
+
+    for path in paths:
+        assert unchecked.path2fsn(path) == path2fsn(path)
+        assert unchecked.fsn2norm(path) == fsn2norm(path)
+        assert unchecked.fsn2text(path) == fsn2text(path)
+        data = fsn2bytes(path, "utf-8")
+        assert unchecked.fsn2bytes(path, "utf-8") == data
+        assert unchecked.bytes2fsn(data, "utf-8") == bytes2fsn(data, "utf-8")
+        assert unchecked.fsn2uri(path) == fsn2uri(path)
+        try:
+            text = fsn2text(path, strict=True)
+        except ValueError:
+            with pytest.raises(ValueError):
+                unchecked.fsn2text(path, strict=True)
+        else:
+            assert unchecked.fsn2text(path, strict=True) == text
+
+    datas = fsns2bytes(paths)
+    assert unchecked.paths2fsn(paths) == paths2fsn(paths)
+    assert unchecked.fsns2bytes(paths) == datas
+    assert unchecked.bytes2fsns(datas) == bytes2fsns(datas)
+    assert unchecked.fsns2text(paths) == fsns2text(paths)
+
+
+def test_converter():
+    # type: () -> None
+
+    with pytest.raises(ValueError):
+        Converter("nopenope")
+    with pytest.raises(ValueError):
+        Converter(None)
+
+    paths = [fsnative(u"foo"), fsnative(u"\xe4\u1234"),
+             fsnative(u"\ud83d"), fsnative(u"/a b/%c")]
+    if is_unix and PY3:
+        paths.append(bytes2fsn(b"\xff\xfe"))
+
+    for encoding in ["utf-8", "utf-16-le", "utf-16-be", "utf-32", "latin-1"]:
+        conv = Converter(encoding)
+        assert conv.encoding == encoding
+        for path in paths:
+            assert conv.to_text(path) == fsn2text(path)
+            assert conv.to_uri(path) == fsn2uri(path)
+            try:
+                data = fsn2bytes(path, encoding)
+            except ValueError:
+                with pytest.raises(ValueError):
+                    conv.to_bytes(path)
+                continue
+            assert conv.to_bytes(path) == data
+            assert conv.from_bytes(data) == bytes2fsn(data, encoding)
+            assert conv.from_bytes(bytearray(data)) == \
+                bytes2fsn(data, encoding)
+            try:
+                text = fsn2text(path, strict=True)
+            except ValueError:
+                with pytest.raises(ValueError):
+                    conv.to_text(path, strict=True)
+            else:
+                assert conv.to_text(path, strict=True) == text
+
+        for notfsn in iternotfsn():
+            with pytest.raises(TypeError):
+                conv.to_bytes(notfsn)
+            with pytest.raises(TypeError):
+                conv.to_text(notfsn)
+            with pytest.raises(TypeError):
+                conv.to_uri(notfsn)
+
+        with pytest.raises(TypeError):
+            conv.from_bytes(object())
+        with pytest.raises(ValueError):
+            conv.from_bytes(u"\x00".encode(encoding))
+
+
+def test_path_interner():
+    # type: () -> None
+
+    with pytest.raises(ValueError):
+        PathInterner(maxsize=0)
+
+    def new(text):
+        # equal, but not the same object
+        return fsnative(text + u"x")[:-1]
+
+    for kwargs in [{}, {"maxsize": 2}]:
+        interner = PathInterner(**kwargs)
+        first = new(u"/foo bar.ogg")
+        assert interner.intern(first) is first
+        second = new(u"/foo bar.ogg")
+        assert second is not first
+        assert interner.intern(second) is first
+        assert interner.intern(first) is first
+        info = interner.info()
+        assert info.hits == 1
+        assert info.misses == 2
+        assert info.maxsize == kwargs.get("maxsize")
+        assert info.bytes_saved == sys.getsizeof(second)
+        assert info.currsize == 1
+
+        for notfsn in iternotfsn():
+            if type(notfsn) is not type(first):
+                with pytest.raises(TypeError):
+                    interner.intern(notfsn)
+        with pytest.raises(TypeError):
+            interner.intern(object())
+
+        interner.clear()
+        assert interner.info()[:2] == (0, 0)
+
+    interner = PathInterner(maxsize=2)
+    a, b, c = new(u"/a.ogg"), new(u"/b.ogg"), new(u"/c.ogg")
+    for path in [a, b, c]:
+        interner.intern(path)
+    assert interner.info().currsize == 2
+    assert interner.intern(new(u"/a.ogg")) is not a
+    assert interner.intern(new(u"/c.ogg")) is c
+
+    # nothing shared between instances
+    other = PathInterner()
+    for path in [a, b, c]:
+        assert other.intern(new(path)) is not interner.intern(path)
+
+    # concurrent calls all get the same path
+    interner = PathInterner()
+    results = []
+
+    def intern_all():
+        # type: () -> None
+        results.append([interner.intern(new(u"/%d" % i)) for i in range(500)])
+
+    threads = [threading.Thread(target=intern_all) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for result in results[1:]:
+        assert all(x is y for x, y in zip(result, results[0]))
+    assert interner.info().currsize == 500
+    assert interner.info().hits == 1500
+
+
+def test_path_trie():
+    # type: () -> None
+
+    def p(text):
+        return fsnative(text.replace(u"/", sep))
+
+    trie = PathTrie()
+    assert len(trie) == 0
+    assert list(trie) == []
+    assert p(u"/a") not in trie
+
+    paths = [p(u"/a/b/c"), p(u"/a/b"), p(u"/a/d"), p(u"/"), p(u"x"),
+             p(u"/a/b/\xe4"), p(u"/a/b/\ud83d"), p(u""), p(u"/a/b/")]
+    if is_unix and PY3:
+        paths.append(bytes2fsn(b"/a/\xff"))
+    trie = PathTrie(paths)
+    assert len(trie) == len(paths)
+    assert sorted(trie) == sorted(paths)
+    for path in paths:
+        assert path in trie
+    for path in [p(u"/a"), p(u"/a/b/c/d"), p(u"/x"), p(u"a")]:
+        assert path not in trie
+    assert all(isinstance(path, fsnative) for path in trie)
+    assert all(fsn2norm(path) == path for path in trie)
+
+    trie.add(p(u"/a/b"))
+    assert len(trie) == len(paths)
+
+    assert sorted(trie.iter_subtree(p(u"/a/b"))) == sorted(
+        [p(u"/a/b/c"), p(u"/a/b"), p(u"/a/b/\xe4"), p(u"/a/b/\ud83d"),
+         p(u"/a/b/")])
+    # with a trailing separator, without the directory and the path itself
+    assert sorted(trie.iter_subtree(p(u"/a/b/"))) == sorted(
+        set(trie.iter_subtree(p(u"/a/b"))) - set([p(u"/a/b"), p(u"/a/b/")]))
+    assert list(trie.iter_subtree(p(u"/a/d/"))) == []
+    assert list(trie.iter_subtree(p(u"/a/d"))) == [p(u"/a/d")]
+    assert list(trie.iter_subtree(p(u"/nope"))) == []
+    assert list(trie.iter_subtree(p(u"/a/d/e"))) == []
+    assert sorted(trie.iter_subtree(p(u"/"))) == sorted(
+        path for path in paths if path.startswith(sep) and path != sep)
+
+    # the directory itself isn't present
+    other = PathTrie([p(u"/a/b"), p(u"/a/b/c")])
+    assert sorted(other.iter_subtree(p(u"/a/"))) == [p(u"/a/b"), p(u"/a/b/c")]
+    assert sorted(other.iter_subtree(p(u"/a"))) == [p(u"/a/b"), p(u"/a/b/c")]
+    assert list(other.iter_subtree(p(u"/a/b/"))) == [p(u"/a/b/c")]
+    assert other.remove_subtree(p(u"/a/")) == 2
+    assert len(other) == 0
+
+    copy = PathTrie(trie)
+    assert copy.remove_subtree(p(u"/a/b/")) == 3
+    assert p(u"/a/b") in copy
+    assert p(u"/a/b/") in copy
+    assert copy.remove_subtree(p(u"/a/d/")) == 0
+    assert p(u"/a/d") in copy
+    absolute = [path for path in copy if path.startswith(sep)]
+    assert copy.remove_subtree(p(u"/")) == len(absolute) - 1
+    assert sorted(copy) == sorted(
+        [path for path in paths if not path.startswith(sep) or path == sep])
+
+    assert trie.remove_subtree(p(u"/a/b")) == 5
+    assert trie.remove_subtree(p(u"/a/b")) == 0
+    assert trie.remove_subtree(p(u"/nope/nope")) == 0
+    assert p(u"/a/b/c") not in trie
+    assert p(u"/a/d") in trie
+    assert len(trie) == len(paths) - 5
+
+    trie.remove(p(u"/a/d"))
+    with pytest.raises(KeyError):
+        trie.remove(p(u"/a/d"))
+    trie.discard(p(u"/a/d"))
+    assert len(trie) == len(list(trie))
+
+    for notfsn in iternotfsn():
+        with pytest.raises(TypeError):
+            trie.add(notfsn)
+        with pytest.raises(TypeError):
+            notfsn in trie
+
+    trie.clear()
+    assert len(trie) == 0
+    assert list(trie) == []
+
+    # compare with a set
+    r = random.Random(0)
+    names = [p(u"a"), p(u"b"), p(u"\xe4"), p(u"")]
+    trie = PathTrie()
+    expected = set()
+    for i in range(2000):
+        path = sep.join(r.choice(names) for j in range(r.randint(1, 4)))
+        action = r.randint(0, 3)
+        if action == 0:
+            trie.discard(path)
+            expected.discard(path)
+        elif action == 1:
+            if r.randint(0, 1):
+                path += sep
+            if path.endswith(sep):
+                removed = set(
+                    e for e in expected if e.startswith(path) and e != path)
+            else:
+                removed = set(
+                    e for e in expected
+                    if e == path or e.startswith(path + sep))
+            assert sorted(trie.iter_subtree(path)) == sorted(removed)
+            assert trie.remove_subtree(path) == len(removed)
+            expected -= removed
+        else:
+            trie.add(path)
+            expected.add(path)
+        assert len(trie) == len(expected)
+        assert (path in trie) == (path in expected)
+    assert sorted(trie) == sorted(expected)
+    assert trie._root == PathTrie(expected)._root
+
+
+def test_fsn2sortkey():
+    # type: () -> None
+
+    def p(text):
+        return fsnative(text.replace(u"/", sep))
+
+    def names(*texts):
+        return [p(t) for t in texts]
+
+    assert sort_paths([]) == []
+    assert sort_paths(names(u"t10", u"t9", u"T1")) == names(
+        u"T1", u"t9", u"t10")
+    assert sort_paths(names(u"t10", u"t9"), natural=False) == names(
+        u"t10", u"t9")
+    assert sort_paths(names(u"b", u"A", u"a", u"B")) == names(
+        u"A", u"a", u"B", u"b")
+    assert sort_paths(names(u"b", u"A"), casefold=False) == names(
+        u"A", u"b")
+    assert sort_paths(names(u"b", u"A"), reverse=True) == names(
+        u"b", u"A")
+    assert sort_paths(names(u"x02", u"x2", u"x1", u"x002")) == names(
+        u"x1", u"x002", u"x02", u"x2")
+    assert sort_paths(names(u"a1b2", u"a1b", u"a01", u"ab", u"1")) == \
+        names(u"1", u"a01", u"a1b", u"a1b2", u"ab")
+    # directories before siblings sharing a prefix
+    assert sort_paths(names(u"/a b/c", u"/a/b", u"/a-b")) == names(
+        u"/a/b", u"/a b/c", u"/a-b")
+    assert sort_paths(names(u"/a/10/x", u"/a/9/y")) == names(
+        u"/a/9/y", u"/a/10/x")
+
+    assert fsn2sortkey(p(u"a")) == fsn2sortkey(p(u"a"))
+    assert fsn2sortkey(p(u"a")) < fsn2sortkey(p(u"B"))
+    assert fsn2sortkey(p(u"\xe4")) != fsn2sortkey(p(u"a"))
+    hash(fsn2sortkey(p(u"\xe4/1")))
+
+    # undecodable and surrogates don't raise and sort the same in any order
+    paths = names(u"a", u"\ud83d", u"b", u"\ufffd")
+    if is_unix and PY3:
+        paths += [bytes2fsn(b"\xff"), bytes2fsn(b"\xfe"), bytes2fsn(b"a\xff")]
+    expected = sort_paths(paths)
+    for i in range(10):
+        random.Random(i).shuffle(paths)
+        assert sort_paths(paths) == expected
+    assert sorted(expected) == sorted(paths)
+
+    for notfsn in iternotfsn():
+        with pytest.raises(TypeError):
+            fsn2sortkey(notfsn)
+        with pytest.raises(TypeError):
+            sort_paths([p(u"a"), notfsn])
+
+
+def test_sort_key_cache():
+    # type: () -> None
+
+    with pytest.raises(ValueError):
+        SortKeyCache(maxsize=0)
+
+    paths = [fsnative(u"t%d" % i) for i in range(20)]
+    random.Random(0).shuffle(paths)
+    for maxsize in [None, 5]:
+        cache = SortKeyCache(maxsize=maxsize)
+        assert len(cache) == 0
+        assert cache.sort(paths) == sort_paths(paths)
+        assert cache.sort(paths, reverse=True) == sort_paths(
+            paths, reverse=True)
+        assert len(cache) == min(len(paths), maxsize or len(paths))
+        for path in paths:
+            assert cache.key(path) == fsn2sortkey(path)
+        cache.clear()
+        assert len(cache) == 0
+
+        for notfsn in iternotfsn():
+            with pytest.raises(TypeError):
+                cache.key(notfsn)
+
+    cache = SortKeyCache(natural=False, casefold=False)
+    assert cache.sort(paths) == sorted(paths)
+    assert cache.key(paths[0]) is cache.key(paths[0])
+
+
+def test_fsn2key():
+    # type: () -> None
+
+    ascii_path = fsnative(u"/foo/Bar")
+    assert fsn2key(ascii_path) == ascii_path
+    assert fsn2key(ascii_path, casefold=True) == fsnative(u"/foo/bar")
+    assert fsn2key(ascii_path, form="NFKD") == ascii_path
+
+    with pytest.raises(ValueError):
+        fsn2key(ascii_path, form="nfc")
+    for notfsn in iternotfsn():
+        with pytest.raises(TypeError):
+            fsn2key(notfsn)
+
+    # undecodable parts are kept
+    if is_unix and PY3:
+        a = bytes2fsn(b"/a\xff")
+        b = bytes2fsn(b"/a\xfe")
+        assert fsn2key(a) != fsn2key(b)
+        assert fsn2key(a) == a
+    elif is_win:
+        assert fsn2key(fsnative(u"\ud83d")) != fsn2key(fsnative(u"\ud83e"))
+        assert fsn2key(fsnative(u"\ud83d") + fsnative(u"\ude00")) == \
+            fsn2key(fsnative(u"\U0001f600"))
+
+    if not isunicodeencoding():
+        return
+
+    nfc = fsnative(u"/music/Bj\xf6rk/\xc5")
+    nfd = fsnative(u"/music/Bjo\u0308rk/A\u030a")
+    assert nfc != nfd
+    assert fsn2key(nfc) == fsn2key(nfd)
+    assert fsn2key(nfc, form="NFD") == fsn2key(nfd, form="NFD")
+    assert fsn2key(nfc) != fsn2key(nfc, form="NFD")
+    assert fsn2key(fsnative(u"\ufb01")) != fsn2key(fsnative(u"fi"))
+    assert fsn2key(fsnative(u"\ufb01"), form="NFKC") == \
+        fsn2key(fsnative(u"fi"))
+    hash(fsn2key(nfd))
+
+    assert fsn2key(fsnative(u"\xc4"), casefold=True) == \
+        fsn2key(fsnative(u"a\u0308"), casefold=True)
+    assert fsn2key(fsnative(u"\xc4")) != fsn2key(fsnative(u"\xe4"))
+    assert fsn2key(fsnative(u"Stra\xdfe"), casefold=True) == \
+        fsn2key(fsnative(u"STRASSE"), casefold=True)
+
+    if is_unix and PY3:
+        assert fsn2key(a + nfd) == fsn2key(a + nfc)
+
+    # more than fit in the cache
+    for i in range(3000):
+        assert fsn2key(nfd + fsnative(u"%d" % i)) == nfc + fsnative(u"%d" % i)
+
+
+def test_dedupe_paths():
+    # type: () -> None
+
+    assert dedupe_paths([]) == []
+    with pytest.raises(ValueError):
+        dedupe_paths([], form="foo")
+    paths = [fsnative(u"b"), fsnative(u"a"), fsnative(u"B"), fsnative(u"a")]
+    assert dedupe_paths(paths) == paths[:3]
+    assert dedupe_paths(paths, casefold=True) == paths[:2]
+    for notfsn in iternotfsn():
+        with pytest.raises(TypeError):
+            dedupe_paths([paths[0], notfsn])
+
+    if not isunicodeencoding():
+        return
+
+    nfc = fsnative(u"\xe4")
+    nfd = fsnative(u"a\u0308")
+    upper = fsnative(u"\xc4")
+    assert dedupe_paths([nfd, upper, nfc, nfd]) == [nfd, upper]
+    assert dedupe_paths([upper, nfc, nfd], casefold=True) == [upper]
+    assert dedupe_paths(iter([nfc, nfd]), form="NFD") == [nfc]
+
+
+def test_fsn_join_split():
+    # type: () -> None
+
+    a = fsnative(u"a")
+    b = fsnative(u"\xe4")
+    assert fsn_join(a) == a
+    assert fsn_join(a, b) == os.path.join(a, b)
+    assert fsn_join(a, b, a) == os.path.join(a, b, a)
+    assert fsn_join(a, fsnative(u"")) == os.path.join(a, fsnative(u""))
+    assert isinstance(fsn_join(a, b), fsnative)
+    assert fsn_split(fsn_join(a, b)) == (a, b)
+    assert fsn_split(a) == (fsnative(u""), a)
+    assert all(isinstance(p, fsnative) for p in fsn_split(fsn_join(a, b)))
+
+    parts = []
+    if is_unix and PY3:
+        # the same bytes split at different places
+        parts = [bytes2fsn(b"\xc3"), bytes2fsn(b"\xa4\xff"),
+                 bytes2fsn(b"\xe2\x82")]
+    elif is_win:
+        parts = [fsnative(u"\ud83d"), fsnative(u"\ude00\ud83d")]
+    parts += [a, b]
+    for i in range(len(parts)):
+        for j in range(len(parts)):
+            joined = fsn_join(parts[i], parts[j])
+            assert joined == fsn2norm(os.path.join(parts[i], parts[j]))
+            assert fsn2norm(joined) == joined
+            head, tail = fsn_split(joined)
+            assert fsn2norm(head) == head
+            assert fsn2norm(tail) == tail
+
+    with pytest.raises(TypeError):
+        fsn_join()
+    notfsns = list(iternotfsn()) + [object(), fsn_join(a, b) + u"\x00"]
+    if PY3 and is_unix:
+        # can't be encoded with surrogateescape
+        notfsns.append(u"/foo/\ud800")
+    for notfsn in notfsns:
+        with pytest.raises(TypeError):
+            fsn_join(a, notfsn)
+        with pytest.raises(TypeError):
+            fsn_join(notfsn, a)
+        with pytest.raises(TypeError):
+            fsn_split(notfsn)
+
+
+def test_lru_cache():
+    # type: () -> None
+
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+    cache = LRUCache(2)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.info() == (2, 2, 1, 2, 2)
+
+
+def test_cache():
+    # type: () -> None
+
+    assert cache_info() == {}
+    try:
+        enable_cache(2)
+        assert sorted(cache_info()) == ["fsn2norm", "fsn2text", "fsn2uri"]
+
+        path = bytes2fsn(b"/foo\xff") if is_unix else fsnative(u"C:\\foo")
+        for i in range(3):
+            assert fsn2text(path) == fsn2text(path, strict=False)
+            assert fsn2uri(path) == fsn2uri(path)
+            assert fsn2norm(path) == path
+
+        info = cache_info()
+        assert info["fsn2text"].hits == 5
+        assert info["fsn2text"].misses == 1
+        assert info["fsn2uri"].hits == 5
+        assert info["fsn2uri"].currsize == 1
+
+        for notfsn in iternotfsn():
+            for i in range(2):
+                with pytest.raises(TypeError):
+                    fsn2text(notfsn)
+                with pytest.raises(TypeError):
+                    fsn2norm(notfsn)
+                with pytest.raises(TypeError):
+                    fsn2uri(notfsn)
+        assert cache_info()["fsn2text"].currsize == 1
+
+        for i in range(3):
+            fsn2uri(path + fsnative(u"%d" % i))
+        assert cache_info()["fsn2uri"].evictions == 2
+
+        enable_cache(10)
+        assert cache_info()["fsn2uri"] == (0, 0, 0, 10, 0)
+    finally:
+        disable_cache()
+
+    assert cache_info() == {}
+
+
+def test_stats():
+    # type: () -> None
+
+    assert stats() == {}
+    try:
+        enable_stats()
+        assert stats() == {}
+
+        path = fsnative(u"foo")
+        assert fsn2bytes(path) == b"foo"
+        assert path2fsn(b"foo") == path
+        assert stats()["fsn2bytes"] == (1, 0, 0, 3)
+        # nested calls count towards the outer one
+        assert "fsn2norm" not in stats()
+        assert stats()["path2fsn"].calls == 1
+
+        with pytest.raises(TypeError):
+            fsn2bytes(object())
+        assert stats()["fsn2bytes"] == (2, 1, 0, 3)
+
+        reset_stats()
+        fsnative(u"a\x00b")
+        assert stats()["fsnative"].calls == 1
+        assert stats()["fsnative"].fallbacks >= 1
+
+        assert fsns2bytes([path, path]) == [b"foo", b"foo"]
+        assert stats()["fsns2bytes"] == (1, 0, 0, 6)
+
+        f = StringIO()
+        print_(path, file=f)
+        assert stats()["print_"].fallbacks == 1
+
+        threads = [
+            threading.Thread(target=lambda: [fsn2text(path)
+                                             for i in range(100)])
+            for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert stats()["fsn2text"] == (400, 0, 0, 1200)
+
+        reset_stats()
+        assert stats() == {}
+        enable_stats()
+        fsn2uri(path)
+        assert list(stats()) == ["fsn2uri"]
+    finally:
+        disable_stats()
+
+    assert stats() == {}
+    fsn2bytes(fsnative(u"foo"))
+    assert stats() == {}
+
+
+def test_instrumented():
+    # type: () -> None
+
+    def func(a, b=1, *args, **kwargs):
+        """doc"""
+
+        fsn2text(fsnative(u"foo"))
+        return a, b, args, kwargs
+
+    wrapped = instrumented(func, "name")
+    assert wrapped.__name__ == "func"
+    assert wrapped.__doc__ == "doc"
+    assert wrapped(0) == (0, 1, (), {})
+    assert wrapped(0, 2, 3, c=4) == (0, 2, (3,), {"c": 4})
+
+    enable_stats()
+    try:
+        assert wrapped(0, b=2) == (0, 2, (), {})
+        assert set(stats()) == {"name"}
+        assert stats()["name"].calls == 1
+    finally:
+        disable_stats()
+
+
+def test_trace_hook():
+    # type: () -> None
+
+    with pytest.raises(ValueError):
+        set_trace_hook(lambda e: None, sample_rate=0)
+    with pytest.raises(ValueError):
+        set_trace_hook(lambda e: None, sample_rate=1.5)
+    with pytest.raises(ValueError):
+        set_trace_hook(lambda e: None, threshold=-1)
+
+    events = []
+
+    def hook(event):
+        events.append(event)
+        # senf functions used by the hook don't get traced
+        fsn2text(path)
+
+    path = fsnative(u"foo")
+    try:
+        set_trace_hook(hook)
+
+        fsn2bytes(path)
+        event = events.pop()
+        assert event.function == "fsn2bytes"
+        assert event.length == 3
+        assert event.duration >= 0
+        assert event.error is None
+        assert not event.fallback
+        assert not events
+
+        with pytest.raises(TypeError):
+            fsn2bytes(object())
+        event = events.pop()
+        assert isinstance(event.error, TypeError)
+        assert event.length is None
+
+        print_(path, file=StringIO())
+        assert events.pop().fallback
+
+        expanduser(path)
+        getenv(path)
+        assert [e.function for e in events] == ["expanduser", "getenv"]
+        del events[:]
+
+        # works together with the stats
+        enable_stats()
+        disable_stats()
+        fsn2uri(path)
+        assert events.pop().function == "fsn2uri"
+
+        set_trace_hook(hook, threshold=3600)
+        fsn2uri(path)
+        assert not events
+
+        set_trace_hook(hook, sample_rate=0.5)
+        for i in range(200):
+            fsn2uri(path)
+        assert 0 < len(events) < 200
+    finally:
+        set_trace_hook(None)
+
+    del events[:]
+    fsn2uri(path)
+    assert not events
+
+
+def test_recording():
+    # type: () -> None
+
+    if is_unix:
+        path = bytes2fsn(b"/foo\xff")
+    else:
+        path = fsnative(u"C:\\foo\ud800")
+
+    f = BytesIO()
+    try:
+        start_recording(f)
+        fsn2text(path)
+        path2fsn(b"foo")
+        getcwd()
+        fsn2uri(path)
+        uri2fsn(u"file:///foo")
+        print_(object(), file=BytesIO())
+        text2fsn(u"\ud83d")
+        try:
+            fsn2text(path, strict=True)
+        except ValueError:
+            pass
+        fsn2bytes(path, "utf-16-le")
+        print_(u"a", path, end=u"", file=BytesIO())
+    finally:
+        stop_recording()
+    fsn2text(path)
+
+    f.seek(0)
+    recorded = list(read_recording(f))
+    assert recorded == [
+        ("fsn2text", (path, False), {}),
+        ("path2fsn", (b"foo",), {}),
+        ("getcwd", (), {}),
+        ("fsn2uri", (path,), {}),
+        ("uri2fsn", (u"file:///foo",), {}),
+        ("text2fsn", (u"\ud83d",), {}),
+        ("fsn2text", (path, True), {}),
+        ("fsn2bytes", (path, "utf-16-le"), {}),
+        ("print_", (u"a", path), {"end": u""}),
+    ]
+    assert isinstance(recorded[0][1][0], fsnative)
+
+    with pytest.raises(ValueError):
+        list(read_recording(BytesIO(b"foo")))
+
+    with pytest.raises(ValueError):
+        list(read_recording(BytesIO(f.getvalue()[:-1])))
+
+    assert list(read_recording(BytesIO(f.getvalue()[:9]))) == []
+
+
+def test_recording_write_error():
+    # type: () -> None
+
+    class BrokenFile(object):
+
+        def __init__(self):
+            # type: () -> None
+            self.writes = 0
+
+        def write(self, data):
+            # type: (bytes) -> None
+            self.writes += 1
+            if self.writes > 1:
+                raise ValueError("closed file")
+
+    f = BrokenFile()
+    try:
+        start_recording(f)
+        assert fsn2text(fsnative(u"foo")) == u"foo"
+        assert fsn2text(fsnative(u"bar")) == u"bar"
+    finally:
+        stop_recording()
+    assert f.writes == 2
+
+
 def test_constants():
     # type: () -> None
 
@@ -1012,6 +2155,18 @@ def test_uri2fsn():
         assert uri2fsn("file:///bla:foo@NOPE.com") == \
             fsnative(u"/bla:foo@NOPE.com")
         assert uri2fsn("file:///bla?x#b") == fsnative(u"/bla?x#b")
+        assert uri2fsn("file:///bla?#") == fsnative(u"/bla")
+        assert uri2fsn("file:///bla#?") == fsnative(u"/bla#?")
+        assert uri2fsn("FiLe:///foo") == fsnative(u"/foo")
+        assert uri2fsn(" \x01file:///f\to\r\no") == fsnative(u"/foo")
+        assert uri2fsn("file:////foo") == fsnative(u"//foo")
+        assert uri2fsn("file://///foo") == fsnative(u"/foo")
+        assert uri2fsn("file://host/foo") == fsnative(u"//host/foo")
+        assert uri2fsn("file:///%C3%A4%") == fsnative(u"/\xe4%")
+        with pytest.raises(ValueError):
+            uri2fsn("file://?foo")
+        with pytest.raises(ValueError):
+            uri2fsn("file://[host/foo")
     else:
         assert uri2fsn("file:///C:/%ED%A0%80") == fsnative(u"C:\\\ud800")
         assert uri2fsn("file:///C:/%20") == "C:\\ "
@@ -1050,6 +2205,117 @@ def test_uri2fsn():
             uri2fsn(b"file:///foo")  # type: ignore
 
 
+def test_parse_uri_list():
+    # type: () -> None
+
+    if sys.platform != "win32":
+        paths = [fsnative(u"/foo bar"), fsnative(u"/\u1234")]
+    else:
+        paths = [fsnative(u"C:\\foo bar"), fsnative(u"C:\\\u1234")]
+    uris = [fsn2uri(p) for p in paths]
+
+    text = u"# comment\r\n" + uris[0] + u"\r\nhttp://foo\r\n\r\n" + \
+        uris[1] + u"\n"
+    data = text.encode("ascii")
+    assert list(parse_uri_list(text)) == paths
+    assert list(parse_uri_list(data)) == paths
+    assert list(parse_uri_list(BytesIO(data))) == paths
+    assert list(parse_uri_list(StringIO(text))) == paths
+    assert list(parse_uri_list(uris[0])) == paths[:1]
+    assert list(parse_uri_list(b"")) == []
+    assert all(isinstance(p, fsnative) for p in parse_uri_list(data))
+
+    with pytest.raises(ValueError) as excinfo:
+        list(parse_uri_list(data, strict=True))
+    assert "line 3" in str(excinfo.value)
+
+    with pytest.raises(TypeError):
+        parse_uri_list(object())  # type: ignore
+
+
+def test_format_uri_list():
+    # type: () -> None
+
+    if sys.platform != "win32":
+        paths = [fsnative(u"/foo bar"), fsnative(u"/\u1234")]
+    else:
+        paths = [fsnative(u"C:\\foo bar"), fsnative(u"C:\\\u1234")]
+    text = u"".join(fsn2uri(p) + u"\r\n" for p in paths)
+
+    assert format_uri_list(paths) == text
+    assert isinstance(format_uri_list(paths), text_type)
+    assert format_uri_list([]) == u""
+    assert list(parse_uri_list(format_uri_list(paths))) == paths
+
+    f = BytesIO()
+    assert format_uri_list(paths, f) is None
+    assert f.getvalue() == text.encode("ascii")
+
+    t = TextIO()
+    format_uri_list(paths * 10000, t)
+    assert t.getvalue() == text * 10000
+
+    for notfsn in iternotfsn():
+        with pytest.raises(TypeError):
+            format_uri_list([notfsn])
+
+
+def test_uri_encoder():
+    # type: () -> None
+
+    if sys.platform != "win32":
+        paths = [fsnative(u"/foo/b ar"), fsnative(u"/foo/\u1234"),
+                 fsnative(u"/foo/"), fsnative(u"rel"),
+                 bytes2fsn(b"/\xff/\xfe", None), fsnative(u"/x/a b~")]
+        # every byte in the file name
+        paths.extend(
+            bytes2fsn(b"/foo/" + bytes(bytearray([i])), None)
+            for i in range(1, 256))
+    else:
+        paths = [fsnative(u"C:\\foo\\b ar"), fsnative(u"C:\\\u1234")]
+
+    encoder = UriEncoder(2)
+    for path in paths * 2:
+        assert encoder.encode(path) == fsn2uri(path)
+    assert encoder.cache_info().maxsize == 2
+
+    for notfsn in iternotfsn():
+        with pytest.raises(TypeError):
+            encoder.encode(notfsn)
+
+    with pytest.raises(ValueError):
+        UriEncoder(0)
+
+
+def test_uri_decoder():
+    # type: () -> None
+
+    if sys.platform != "win32":
+        uris = [u"file:///foo/b%20ar", u"file:///foo/%E1%88%B4",
+                u"file:///foo/", u"file:///%FF/%FE", u"file:NOPE",
+                u"file:///foo/bar?x", u"file:///foo/bar#", u"file://host/f",
+                u"FILE:///foo/bar", u"file:///fo\to/bar", u"file:////foo/x"]
+    else:
+        uris = [u"file:///C:/foo/b%20ar", u"file:///C:/%E1%88%B4",
+                u"file://UNC/foo/bar"]
+
+    decoder = UriDecoder(2)
+    for uri in uris * 2:
+        assert decoder.decode(uri) == uri2fsn(uri)
+    assert decoder.cache_info().maxsize == 2
+
+    for invalid in [u"file:///foo/%00", u"file:///foo%00/bar",
+                    u"file:///foo/\x00", u"http://foo/bar", u"file://"]:
+        with pytest.raises(ValueError):
+            decoder.decode(invalid)
+
+    with pytest.raises(TypeError):
+        decoder.decode(object())  # type: ignore
+
+    with pytest.raises(ValueError):
+        UriDecoder(0)
+
+
 def test_fsn2uri():
     # type: () -> None
 
@@ -1135,6 +2401,200 @@ def test_test_mkstemp():
     os.remove(fsn)
 
 
+def _create_tree(root):
+    names = [fsnative(u"a"), fsnative(u"b\xe4"), fsnative(u"\ud83d")]
+    if is_unix and PY3:
+        names.append(bytes2fsn(b"\xff"))
+    for name in names:
+        os.mkdir(os.path.join(root, name))
+        os.mkdir(os.path.join(root, name, name))
+        with open(os.path.join(root, name, fsnative(u"f")), "wb"):
+            pass
+    with open(os.path.join(root, fsnative(u"g")), "wb"):
+        pass
+    if hasattr(os, "symlink") and is_unix:
+        os.symlink(names[0], os.path.join(root, fsnative(u"link")))
+
+
+def test_scandir():
+    # type: () -> None
+
+    d = mkdtemp()
+    try:
+        _create_tree(d)
+        entries = list(scandir(d))
+        assert sorted(e.name for e in entries) == sorted(os.listdir(d))
+        for entry in entries:
+            assert isinstance(entry, DirEntry)
+            assert isinstance(entry.name, fsnative)
+            assert isinstance(entry.path, fsnative)
+            assert fsn2norm(entry.path) == entry.path
+            assert entry.path == os.path.join(d, entry.name)
+            assert entry.text == fsn2text(entry.path)
+            assert entry.text is entry.text
+            assert entry.uri == fsn2uri(entry.path)
+            assert entry.stat() == os.stat(entry.path)
+            assert entry.stat(follow_symlinks=False) == os.lstat(entry.path)
+            assert entry.inode() == os.lstat(entry.path).st_ino
+            assert entry.is_dir() == os.path.isdir(entry.path)
+            assert entry.is_file() == os.path.isfile(entry.path)
+            assert entry.is_symlink() == os.path.islink(entry.path)
+            assert repr(entry)
+            if PY3:
+                assert os.fspath(entry) == entry.path
+            with pytest.raises(AttributeError):
+                entry.foo = 42
+
+            old = _ListdirEntry(d, entry.name)
+            assert old.path == entry.path
+            assert old.stat() == entry.stat()
+            assert old.stat(False) == entry.stat(False)
+            assert old.inode() == entry.inode()
+            assert old.is_dir() == entry.is_dir()
+            assert old.is_dir(False) == entry.is_dir(False)
+            assert old.is_file() == entry.is_file()
+            assert old.is_symlink() == entry.is_symlink()
+
+        old_cwd = os.getcwd()
+        os.chdir(d)
+        try:
+            assert sorted(e.name for e in scandir()) == \
+                sorted(os.listdir(os.curdir))
+        finally:
+            os.chdir(old_cwd)
+
+        with pytest.raises(OSError):
+            list(scandir(os.path.join(d, fsnative(u"nope"))))
+        with pytest.raises(TypeError):
+            list(scandir(object()))
+    finally:
+        shutil.rmtree(d)
+
+
+def test_walk():
+    # type: () -> None
+
+    def to_names(result):
+        return [(path, sorted(e.name for e in dirs),
+                 sorted(e.name for e in files))
+                for path, dirs, files in result]
+
+    def sort_os(result):
+        return [(path, sorted(dirs), sorted(files))
+                for path, dirs, files in result]
+
+    d = mkdtemp()
+    try:
+        _create_tree(d)
+        for topdown in [True, False]:
+            for followlinks in [True, False]:
+                result = to_names(walk(
+                    d, topdown=topdown, followlinks=followlinks))
+                expected = sort_os(os.walk(
+                    d, topdown=topdown, followlinks=followlinks))
+                assert result == expected
+                for path, dirs, files in result:
+                    assert isinstance(path, fsnative)
+
+        # pruning
+        result = []
+        for path, dirs, files in walk(d):
+            result.append(path)
+            dirs[:] = []
+        assert result == [d]
+
+        errors = []
+        assert list(walk(os.path.join(d, "nope"), onerror=errors.append)) \
+            == []
+        assert len(errors) == 1
+        assert isinstance(errors[0], OSError)
+
+        with pytest.raises(ValueError):
+            walk(d, workers=-1)
+        with pytest.raises(ValueError):
+            walk(d, workers=2, max_pending=0)
+    finally:
+        shutil.rmtree(d)
+
+
+def test_walk_workers():
+    # type: () -> None
+
+    def to_names(result):
+        return [(path, [e.name for e in dirs], [e.name for e in files])
+                for path, dirs, files in result]
+
+    d = mkdtemp()
+    try:
+        _create_tree(d)
+        sub = os.path.join(d, fsnative(u"sub"))
+        os.mkdir(sub)
+        _create_tree(sub)
+        for topdown in [True, False]:
+            expected = to_names(walk(d, topdown=topdown))
+            for max_pending in [None, 1, 100]:
+                result = to_names(walk(
+                    d, topdown=topdown, workers=3, max_pending=max_pending))
+                assert result == expected
+
+                result = to_names(walk(
+                    d, topdown=topdown, workers=3, ordered=False,
+                    max_pending=max_pending))
+                assert sorted(result) == sorted(expected)
+                paths = [r[0] for r in result]
+                for path in paths:
+                    parent = os.path.dirname(path)
+                    if parent in paths:
+                        if topdown:
+                            assert paths.index(parent) < paths.index(path)
+                        else:
+                            assert paths.index(parent) > paths.index(path)
+
+        # pruning
+        for workers, ordered in [(0, True), (2, True), (2, False)]:
+            result = []
+            for path, dirs, files in walk(d, workers=workers,
+                                          ordered=ordered):
+                result.append(path)
+                dirs[:] = [e for e in dirs if e.name != fsnative(u"sub")]
+            assert sub not in result
+            assert len(result) == len(set(result))
+            if not workers:
+                expected_paths = sorted(result)
+            assert sorted(result) == expected_paths
+
+        # stopping early
+        for ordered in [True, False]:
+            for path, dirs, files in walk(d, workers=2, ordered=ordered,
+                                          max_pending=1):
+                break
+
+        for ordered in [True, False]:
+            errors = []
+            assert list(walk(os.path.join(d, "nope"), workers=2,
+                             ordered=ordered, onerror=errors.append)) == []
+            assert len(errors) == 1
+
+        # other errors in the workers get raised in the caller
+        main = threading.current_thread()
+
+        def hook(event):
+            if threading.current_thread() is not main:
+                raise RuntimeError("hook")
+
+        set_trace_hook(hook)
+        try:
+            for topdown in [True, False]:
+                for ordered in [True, False]:
+                    with pytest.raises(RuntimeError):
+                        list(walk(d, topdown=topdown, workers=2,
+                                  ordered=ordered))
+        finally:
+            set_trace_hook(None)
+    finally:
+        shutil.rmtree(d)
+
+
 def test_expandvars():
     # type: () -> None
 
@@ -1234,6 +2694,92 @@ def test_fsn2norm():
             fsn2norm(path)
 
 
+@pytest.mark.skipif(not (PY3 and is_unix), reason="py3+unix only")
+def test_fsn2norm_fast_path():
+    # type: () -> None
+
+    def is_norm(path):
+        return path.encode(_encoding, "surrogateescape").decode(
+            _encoding, "surrogateescape") == path
+
+    for path in [u"", u"foo", u"/foo/bar", u"\u1234", u"\udcc2\udc80",
+                 u"\udcff", u"\U0001f600", u"\x00", u"\ud83d", u"\t\xe4",
+                 u"\t\udcff"]:
+        if _is_normalized(path):
+            assert is_norm(path)
+            assert fsn2norm(path) is path
+            assert path2fsn(path) is path
+            assert fsn2text(path) is path
+            assert fsns2text([path]) == [path]
+
+    assert _is_normalized(u"/foo/bar")
+    assert not _is_normalized(u"\x00")
+    assert not _is_normalized(u"\udcc2\udc80")
+    assert not _is_normalized(u"\t\udcff")
+    if _encoding == "utf-8":
+        assert _is_normalized(u"\u1234\U0001f600")
+
+
+@pytest.mark.skipif(not (PY3 and is_unix), reason="py3+unix only")
+def test_fsn2text_fast_path():
+    # type: () -> None
+
+    paths = [u"/foo", u"\xe4\t", u"\xe4\udcff", u"\udcff", u"\x00",
+             u"\xe4\x00", u"\xe4\x00\udcff", u"\ud800", u"\xe4\ud800"]
+    for cached in [False, True]:
+        if cached:
+            enable_cache()
+        try:
+            for path in paths:
+                for strict in [False, True]:
+                    try:
+                        native = path.encode(_encoding, "surrogateescape")
+                        if b"\x00" in native:
+                            raise TypeError
+                    except (UnicodeEncodeError, TypeError):
+                        with pytest.raises(TypeError):
+                            fsn2text(path, strict)
+                        continue
+                    try:
+                        expected = native.decode(
+                            _encoding, "strict" if strict else "replace")
+                    except UnicodeDecodeError:
+                        with pytest.raises(ValueError):
+                            fsn2text(path, strict)
+                    else:
+                        assert fsn2text(path, strict) == expected
+        finally:
+            disable_cache()
+
+
+def test_surrogate_scan():
+    # type: () -> None
+
+    def roundtrip(text, errors):
+        return text.encode("utf-16-le", _surrogatepass).decode(
+            "utf-16-le", errors)
+
+    texts = [u"", u"foo", u"\xe4\u1234", u"\ud83d", u"\ude00",
+             u"a\ud83d\ude00b", u"\ude00\ud83d", u"\udcff\t"]
+    if not (PY2 and is_win):
+        texts.append(u"\U0001f600")
+    for text in texts:
+        assert _merge_surrogates(text) == roundtrip(text, _surrogatepass)
+        assert _wide2text(text, "replace") == roundtrip(text, "replace")
+        try:
+            expected = roundtrip(text, "strict")
+        except UnicodeDecodeError:
+            with pytest.raises(UnicodeDecodeError):
+                _wide2text(text, "strict")
+        else:
+            assert _wide2text(text, "strict") == expected
+
+    # returned unchanged without surrogates
+    text = u"/foo/\xe4\u1234"
+    assert _merge_surrogates(text) is text
+    assert _wide2text(text, "strict") is text
+
+
 def test_supports_ansi_escape_codes():
     # type: () -> None
     supports_ansi_escape_codes(sys.stdout.fileno())
@@ -28,9 +28,10 @@ import pytest
 from hypothesis import given, strategies, settings, HealthCheck
 
 from senf import fsnative, text2fsn, fsn2text, bytes2fsn, fsn2bytes, print_, \
-    path2fsn, fsn2uri, uri2fsn
-from senf._fsnative import fsn2norm
-from senf._compat import text_type, StringIO, PY3
+    path2fsn, fsn2uri, uri2fsn, paths2fsn, fsns2bytes, bytes2fsns, fsns2text, \
+    UriEncoder, UriDecoder, fsn_join, fsn_split
+from senf._fsnative import fsn2norm, _split_file_uri
+from senf._compat import text_type, StringIO, PY3, urlparse, urlunparse
 
 from tests.hypothesis_fspaths import fspaths
 
@@ -66,6 +67,17 @@ def test_any_normalize(path):
         assert text2fsn(path) == fsn2norm(text2fsn(path))
 
 
+@given(strategies.lists(fspaths(allow_pathlike=False), min_size=1))
+def test_join_split(paths):
+    # type: (List[fsnative]) -> None
+
+    fsns = [path2fsn(p) for p in paths]
+    joined = fsn_join(*fsns)
+    assert joined == fsn2norm(os.path.join(*fsns))
+    assert fsn_split(joined) == tuple(
+        fsn2norm(p) for p in os.path.split(joined))
+
+
 @given(fspaths())
 def test_any_filenames(path):
     # type: (fsnative) -> None
@@ -98,6 +110,96 @@ def test_any_filenames(path):
     assert fsn2bytes(bytes2fsn(data, "utf-8"), "utf-8") == data
 
 
+@given(strategies.lists(fspaths()))
+def test_batch(paths):
+    # type: (List[fsnative]) -> None
+
+    fsns = paths2fsn(paths)
+    assert fsns == [path2fsn(p) for p in paths]
+
+    datas = fsns2bytes(fsns, "utf-8")
+    assert datas == [fsn2bytes(p, "utf-8") for p in fsns]
+    assert bytes2fsns(datas, "utf-8") == [bytes2fsn(d, "utf-8") for d in datas]
+    assert fsns2text(fsns) == [fsn2text(p) for p in fsns]
+
+
+def _split_file_uri_reference(uri):
+    # what uri2fsn() did before it got its own parser
+    parsed = urlparse(uri)
+    if parsed.scheme != "file" or not parsed.path:
+        raise ValueError
+    uri = urlunparse(parsed)[5:]
+    if not parsed.path.startswith("/") and uri.startswith("/"):
+        uri = uri.lstrip("/")
+    if not parsed.netloc and uri.startswith("///"):
+        uri = uri[2:]
+    return uri
+
+
+@pytest.mark.skipif(not PY3, reason="py3 only")
+@given(strategies.sampled_from(["file:", "FILE:", " file:", "fi\tle:", ""]),
+       strategies.lists(strategies.sampled_from(
+           ["/", "//", ":", "?", "#", "%", "%41", "@", "[", "]", " ", "\t",
+            "\n", "\x00", "a", "\xe4"])).map(u"".join))
+def test_split_file_uri(scheme, rest):
+    # type: (str, str) -> None
+
+    uri = scheme + rest
+    try:
+        expected = _split_file_uri_reference(uri)
+    except ValueError:
+        with pytest.raises(ValueError):
+            _split_file_uri(uri)
+    else:
+        assert _split_file_uri(uri) == expected
+
+
+@pytest.mark.skipif(not PY3, reason="py3 only")
+@given(strategies.lists(strategies.one_of(
+    strategies.characters(min_codepoint=0xD800, max_codepoint=0xDFFF),
+    strategies.characters())).map(u"".join))
+def test_wtf(text):
+    # type: (Text) -> None
+
+    from senf._wtf import merge_surrogates
+    from senf._fsnative import _merge_surrogates, _wide2text
+
+    merged = text.encode("utf-16-le", "surrogatepass").decode(
+        "utf-16-le", "surrogatepass")
+    assert merge_surrogates(text) == merged
+    assert _merge_surrogates(text) == merged
+    assert _wide2text(text, "replace") == text.encode(
+        "utf-16-le", "surrogatepass").decode("utf-16-le", "replace")
+    data = text.encode("wtf-8")
+    assert data == merged.encode("utf-8", "surrogatepass")
+    assert data.decode("wtf-8") == merged
+    assert text.encode("wtf-16-le").decode("wtf-16-le") == merged
+
+
+@given(strategies.lists(fspaths(allow_pathlike=False)))
+def test_uri_encoder(paths):
+    # type: (List[fsnative]) -> None
+
+    encoder = UriEncoder(4)
+    decoder = UriDecoder(4)
+    for path in paths:
+        fsn = path2fsn(path)
+        try:
+            uri = fsn2uri(fsn)
+        except ValueError:
+            with pytest.raises(ValueError):
+                encoder.encode(fsn)
+            continue
+        assert encoder.encode(fsn) == uri
+        try:
+            expected = uri2fsn(uri)
+        except ValueError:
+            with pytest.raises(ValueError):
+                decoder.decode(uri)
+        else:
+            assert decoder.decode(uri) == expected
+
+
 @given(strategies.lists(strategies.text()), strategies.text(),
        strategies.text(), strategies.booleans())
 def test_print(objects, sep, end, flush):